@@ -0,0 +1,504 @@
+import csv
+import json
+import math
+import os
+import sqlite3
+from concurrent.futures import ProcessPoolExecutor
+
+from results_store import deleted_rows, difficulty_from_puzzle_id, ensure_schema
+
+METRICS = [
+    "avg_time",
+    "avg_calls",
+    "avg_checks",
+    "max_depth",
+    "peak_memory_kb",
+    "avg_backtracks",
+    "avg_conflicts",
+    "avg_learned_clauses",
+    "avg_propagation_time",
+    "avg_naked_singles",
+    "avg_hidden_singles",
+    "avg_unit_propagations",
+]
+
+QUANTILES = [0.5, 0.9, 0.99]
+
+
+class RunningStats:
+    """Mergeable count/sum/sum-of-squares/min/max over one metric."""
+
+    __slots__ = ("count", "total", "total_sq", "min", "max")
+
+    def __init__(self, count=0, total=0.0, total_sq=0.0, min=None, max=None):
+        self.count = count
+        self.total = total
+        self.total_sq = total_sq
+        self.min = min
+        self.max = max
+
+    def add(self, value):
+        if value is None:
+            return
+        self.count += 1
+        self.total += value
+        self.total_sq += value * value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def merge(self, other):
+        self.count += other.count
+        self.total += other.total
+        self.total_sq += other.total_sq
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+        return self
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else None
+
+    @property
+    def std(self):
+        """Sample standard deviation, matching pandas' ``std``."""
+        if self.count < 2:
+            return None
+        variance = (self.total_sq - self.total * self.total / self.count) / (
+            self.count - 1
+        )
+        return math.sqrt(max(variance, 0.0))
+
+    def to_list(self):
+        return [self.count, self.total, self.total_sq, self.min, self.max]
+
+    @classmethod
+    def from_list(cls, values):
+        return cls(*values)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error.
+
+    Positive values are counted in logarithmic buckets of ratio ``gamma``
+    (the DDSketch scheme), so any quantile is reported within
+    ``relative_accuracy`` of a true sample value. Once ``max_buckets`` is
+    exceeded the lowest buckets are collapsed, bounding memory regardless of
+    how many values are added.
+    """
+
+    __slots__ = ("relative_accuracy", "gamma", "log_gamma", "zeros", "buckets")
+
+    max_buckets = 2048
+
+    def __init__(self, relative_accuracy=0.01, zeros=0, buckets=None):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.zeros = zeros
+        self.buckets = buckets or {}
+
+    @property
+    def count(self):
+        return self.zeros + sum(self.buckets.values())
+
+    def add(self, value):
+        if value is None:
+            return
+        if value <= 0:
+            self.zeros += 1
+            return
+        index = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        indices = sorted(self.buckets)
+        excess = len(indices) - self.max_buckets
+        floor = indices[excess]
+        for index in indices[:excess]:
+            self.buckets[floor] += self.buckets.pop(index)
+
+    def merge(self, other):
+        self.zeros += other.zeros
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        return self
+
+    def _value_at(self, rank):
+        seen = self.zeros
+        if seen > rank:
+            return 0.0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                return 2 * self.gamma**index / (self.gamma + 1)
+        return None
+
+    def quantile(self, q):
+        """Linearly interpolated quantile, the same convention as pandas."""
+        count = self.count
+        if not count:
+            return None
+        rank = q * (count - 1)
+        lower = self._value_at(math.floor(rank))
+        upper = self._value_at(math.ceil(rank))
+        return lower + (rank - math.floor(rank)) * (upper - lower)
+
+    def to_list(self):
+        return [self.relative_accuracy, self.zeros, sorted(self.buckets.items())]
+
+    @classmethod
+    def from_list(cls, values):
+        relative_accuracy, zeros, buckets = values
+        return cls(relative_accuracy, zeros, {index: n for index, n in buckets})
+
+
+def _new_stats():
+    return {metric: RunningStats() for metric in METRICS}
+
+
+def _new_sketches():
+    return {metric: QuantileSketch() for metric in METRICS}
+
+
+class Aggregate:
+    """Mergeable statistics over any number of result rows.
+
+    ``groups`` and ``sketches`` are keyed by ``(solver, difficulty)`` and stay
+    bounded however many rows are folded in. ``puzzles`` keeps running stats
+    per ``(solver, difficulty, puzzle_id)`` for the per-puzzle comparisons;
+    it grows only with the number of distinct puzzle ids. ``profiles`` sums
+    the rows' mean nodes per search depth as ``solver: [rows, totals]``.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.groups = {}
+        self.sketches = {}
+        self.puzzles = {}
+        self.profiles = {}
+
+    def add_row(self, solver, difficulty, puzzle_id, values, depth_profile=None):
+        key = (solver, difficulty)
+        stats = self.groups.get(key)
+        if stats is None:
+            stats = self.groups[key] = _new_stats()
+            self.sketches[key] = _new_sketches()
+        sketches = self.sketches[key]
+        puzzle = self.puzzles.get((solver, difficulty, puzzle_id))
+        if puzzle is None:
+            puzzle = self.puzzles[(solver, difficulty, puzzle_id)] = _new_stats()
+        for metric, value in zip(METRICS, values):
+            stats[metric].add(value)
+            sketches[metric].add(value)
+            puzzle[metric].add(value)
+        if depth_profile:
+            self._add_profile(solver, 1, [float(n) for n in depth_profile.split()])
+        self.rows += 1
+
+    def _add_profile(self, solver, rows, nodes):
+        profile = self.profiles.get(solver)
+        if profile is None:
+            profile = self.profiles[solver] = [0, []]
+        profile[0] += rows
+        totals = profile[1]
+        if len(nodes) > len(totals):
+            totals += [0] * (len(nodes) - len(totals))
+        for depth, count in enumerate(nodes):
+            totals[depth] += count
+
+    def depth_profile(self, solver):
+        """Mean nodes per depth (from the root) over ``solver``'s profiled rows."""
+        rows, totals = self.profiles.get(solver, (0, []))
+        return [total / rows for total in totals] if rows else []
+
+    def merge(self, other):
+        self.rows += other.rows
+        for key, stats in other.groups.items():
+            if key not in self.groups:
+                self.groups[key] = _new_stats()
+                self.sketches[key] = _new_sketches()
+            for metric in METRICS:
+                self.groups[key][metric].merge(stats[metric])
+                self.sketches[key][metric].merge(other.sketches[key][metric])
+        for key, stats in other.puzzles.items():
+            target = self.puzzles.setdefault(key, _new_stats())
+            for metric in METRICS:
+                target[metric].merge(stats[metric])
+        for solver, (rows, totals) in other.profiles.items():
+            self._add_profile(solver, rows, totals)
+        return self
+
+    def grouped(self, by):
+        """Merge ``(solver, difficulty)`` groups down to ``by``.
+
+        Returns ``{key: (stats, sketches)}`` where ``by`` is ``("solver",)``,
+        ``("difficulty",)`` or ``("solver", "difficulty")``.
+        """
+        fields = ("solver", "difficulty")
+        indices = [fields.index(name) for name in by]
+        merged = {}
+        for key, stats in self.groups.items():
+            group = tuple(key[i] for i in indices)
+            if group not in merged:
+                merged[group] = (_new_stats(), _new_sketches())
+            target_stats, target_sketches = merged[group]
+            for metric in METRICS:
+                target_stats[metric].merge(stats[metric])
+                target_sketches[metric].merge(self.sketches[key][metric])
+        return merged
+
+    def to_json(self):
+        return {
+            "rows": self.rows,
+            "groups": [
+                [
+                    *key,
+                    {metric: stats.to_list() for metric, stats in metrics.items()},
+                    {
+                        metric: sketch.to_list()
+                        for metric, sketch in self.sketches[key].items()
+                    },
+                ]
+                for key, metrics in self.groups.items()
+            ],
+            "puzzles": [
+                [*key, {metric: stats.to_list() for metric, stats in metrics.items()}]
+                for key, metrics in self.puzzles.items()
+            ],
+            "profiles": self.profiles,
+        }
+
+    @classmethod
+    def from_json(cls, data):
+        aggregate = cls()
+        aggregate.rows = data["rows"]
+        for solver, difficulty, stats, sketches in data["groups"]:
+            key = (solver, difficulty)
+            aggregate.groups[key] = {
+                metric: RunningStats.from_list(values) for metric, values in stats.items()
+            }
+            aggregate.sketches[key] = {
+                metric: QuantileSketch.from_list(values)
+                for metric, values in sketches.items()
+            }
+        for solver, difficulty, puzzle_id, stats in data["puzzles"]:
+            aggregate.puzzles[(solver, difficulty, puzzle_id)] = {
+                metric: RunningStats.from_list(values) for metric, values in stats.items()
+            }
+        aggregate.profiles = data["profiles"]
+        return aggregate
+
+
+def _number(value):
+    if value in (None, ""):
+        return None
+    return float(value)
+
+
+def _csv_columns(header):
+    """Column indices; None for the profile columns an older CSV lacks."""
+    return (
+        header.index("solver"),
+        header.index("puzzle_id"),
+        [header.index(metric) if metric in header else None for metric in METRICS],
+        header.index("depth_profile") if "depth_profile" in header else None,
+    )
+
+
+def aggregate_csv_range(path, start, end, header, max_rows=None):
+    """Aggregate the complete CSV lines in ``[start, end)``, up to ``max_rows``.
+
+    Returns ``(aggregate, position, tail)``: the offset just past the last
+    complete line read, and that line. Safe to run in a worker process.
+    """
+    solver_col, puzzle_col, metric_cols, profile_col = _csv_columns(header)
+    aggregate = Aggregate()
+    position = start
+    lines = []
+    with open(path, "rb") as f:
+        f.seek(start)
+        while position < end and len(lines) != max_rows:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break  # Row still being written
+            lines.append(line.decode())
+            position += len(line)
+
+    for row in csv.reader(lines):
+        puzzle_id = row[puzzle_col]
+        aggregate.add_row(
+            row[solver_col],
+            difficulty_from_puzzle_id(puzzle_id),
+            puzzle_id,
+            [None if i is None else _number(row[i]) for i in metric_cols],
+            None if profile_col is None else row[profile_col],
+        )
+    return aggregate, position, lines[-1] if lines else ""
+
+
+def _split_ranges(path, start, end, parts):
+    """Split ``[start, end)`` into ``parts`` ranges that begin on line boundaries."""
+    bounds = [start]
+    with open(path, "rb") as f:
+        for i in range(1, parts):
+            f.seek(start + (end - start) * i // parts)
+            f.readline()
+            bounds.append(min(max(f.tell(), bounds[-1]), end))
+    bounds.append(end)
+    return [(lo, hi) for lo, hi in zip(bounds, bounds[1:]) if hi > lo]
+
+
+class ReportCache:
+    """An ``Aggregate`` persisted with the read position in its source.
+
+    Only rows appended since the last update are read: a byte offset for the
+    CSV, the last rowid for the SQLite store, which is re-read in full once
+    rows have been deleted from it since their rowids get reused. Rows are
+    folded in chunks of ``chunk_rows`` and merged, so memory stays bounded by
+    the chunk size plus the aggregate, never by the history size. CSV
+    backlogs larger than ``parallel_bytes`` are split by byte range across
+    ``jobs`` processes.
+    """
+
+    VERSION = 5
+
+    parallel_bytes = 8 * 1024 * 1024
+
+    def __init__(self, chunk_rows=50000, jobs=None):
+        self.chunk_rows = chunk_rows
+        self.jobs = jobs
+        self.reset(None)
+
+    @classmethod
+    def load(cls, path, **kwargs):
+        cache = cls(**kwargs)
+        if not os.path.exists(path):
+            return cache
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != cls.VERSION:
+            return cache
+        cache.source = data["source"]
+        cache.position = data["position"]
+        cache.deleted = data.get("deleted", 0)
+        cache.tail = data["tail"]
+        cache.rendered_rows = data.get("rendered_rows")
+        cache.aggregate = Aggregate.from_json(data["aggregate"])
+        return cache
+
+    def save(self, path):
+        data = {
+            "version": self.VERSION,
+            "source": self.source,
+            "position": self.position,
+            "deleted": self.deleted,
+            "tail": self.tail,
+            "rendered_rows": self.rendered_rows,
+            "aggregate": self.aggregate.to_json(),
+        }
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+
+    def reset(self, source):
+        self.source = source
+        self.position = 0
+        self.deleted = 0
+        self.tail = ""
+        self.rendered_rows = None
+        self.aggregate = Aggregate()
+
+    @property
+    def rows(self):
+        return self.aggregate.rows
+
+    def update(self, path):
+        """Fold new rows from a ``.db`` store or a results CSV; returns the count."""
+        before = self.rows
+        if path.endswith(".db"):
+            self._update_from_store(path)
+        else:
+            self._update_from_csv(path)
+        return self.rows - before
+
+    def _update_from_store(self, path):
+        source = os.path.abspath(path)
+        with sqlite3.connect(path) as conn:
+            ensure_schema(conn)
+            last_rowid = conn.execute("SELECT MAX(rowid) FROM results").fetchone()[0]
+            deleted = deleted_rows(conn)
+            if (
+                self.source != source
+                or (last_rowid or 0) < self.position
+                or deleted != self.deleted
+            ):
+                self.reset(source)
+                self.deleted = deleted
+            cursor = conn.execute(
+                f"SELECT rowid, solver, difficulty, puzzle_id, depth_profile, "
+                f"{', '.join(METRICS)} FROM results WHERE rowid > ? ORDER BY rowid",
+                (self.position,),
+            )
+            while True:
+                rows = cursor.fetchmany(self.chunk_rows)
+                if not rows:
+                    break
+                chunk = Aggregate()
+                for rowid, solver, difficulty, puzzle_id, profile, *values in rows:
+                    chunk.add_row(solver, difficulty, puzzle_id, values, profile)
+                self.aggregate.merge(chunk)
+                self.position = rows[-1][0]
+
+    def _update_from_csv(self, path):
+        source = os.path.abspath(path)
+        with open(path, "rb") as f:
+            header = next(csv.reader([f.readline().decode()]))
+            header_end = f.tell()
+            if self.source != source or not self._tail_matches(f):
+                self.reset(source)
+            f.seek(0, os.SEEK_END)
+            end = f.tell()
+        start = self.position or header_end
+
+        if self.jobs and self.jobs > 1 and end - start > self.parallel_bytes:
+            parts = self.jobs * 4
+            with ProcessPoolExecutor(max_workers=self.jobs) as pool:
+                futures = [
+                    pool.submit(aggregate_csv_range, path, lo, hi, header)
+                    for lo, hi in _split_ranges(path, start, end, parts)
+                ]
+                for future in futures:
+                    self._fold(*future.result())
+            return
+
+        while start < end:
+            chunk, position, tail = aggregate_csv_range(
+                path, start, end, header, max_rows=self.chunk_rows
+            )
+            if not chunk.rows:
+                break  # Only a partially written row is left
+            self._fold(chunk, position, tail)
+            start = position
+
+    def _fold(self, chunk, position, tail):
+        if chunk.rows:
+            self.aggregate.merge(chunk)
+            self.position = position
+            self.tail = tail
+
+    def _tail_matches(self, f):
+        """Check the last consumed line is unchanged, i.e. the file was appended to."""
+        if not self.tail:
+            return self.position == 0
+        tail = self.tail.encode()
+        f.seek(0, os.SEEK_END)
+        if f.tell() < self.position:
+            return False
+        f.seek(self.position - len(tail))
+        return f.read(len(tail)) == tail
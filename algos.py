@@ -1,16 +1,44 @@
-import random
+from time import perf_counter
 
-solvers = {}
+from registry import solvers
+from solver_stats import HIDDEN_SINGLE, NAKED_SINGLE
+from tables import cached_table
 
 
 def register_solver(name):
     def wrapper(func):
-        solvers[name] = func
+        solvers.register(name, func)
         return func
 
     return wrapper
 
 
+class SolverObserver:
+    """Receives search events from a solver; override the ones you need.
+
+    Pass an instance as ``observer=`` to any registered solver. Without one
+    the solvers skip every hook behind the same ``if observer:`` guard used
+    for ``stats``, so an unobserved solve pays nothing beyond that check.
+    Every ``on_try`` is closed by a matching ``on_backtrack`` unless the
+    value leads to the solution.
+    """
+
+    def on_select(self, row, col):
+        """The search picked a cell to branch on."""
+
+    def on_try(self, row, col, value):
+        """The search is about to try ``value`` in a cell."""
+
+    def on_assign(self, row, col, value):
+        """A cell's value became fixed (written, or its domain became one)."""
+
+    def on_eliminate(self, row, col, value):
+        """``value`` was removed from a cell's candidates."""
+
+    def on_backtrack(self, row, col, value):
+        """The try of ``value`` failed; the search state before it is restored."""
+
+
 def find_empty_cell(grid):
     for row in range(9):
         for col in range(9):
@@ -22,13 +50,13 @@ def find_empty_cell(grid):
 def is_valid(grid, row, col, num, stats=None):
     if stats:
         for i in range(9):
-            stats.check_constraint()
+            stats.constraint_checks += 1
             if grid[row][i] == num or grid[i][col] == num:
                 return False
         start_row, start_col = 3 * (row // 3), 3 * (col // 3)
         for r in range(start_row, start_row + 3):
             for c in range(start_col, start_col + 3):
-                stats.check_constraint()
+                stats.constraint_checks += 1
                 if grid[r][c] == num:
                     return False
     else:
@@ -44,7 +72,7 @@ def is_valid(grid, row, col, num, stats=None):
 
 
 @register_solver("Backtracking Solver")
-def solve_backtracking(grid, stats=None):
+def solve_backtracking(grid, stats=None, observer=None):
     if stats:
         stats.enter_call()
     empty = find_empty_cell(grid)
@@ -53,14 +81,24 @@ def solve_backtracking(grid, stats=None):
             stats.exit_call()
         return True  # Puzzle solved
     row, col = empty
+    if observer:
+        observer.on_select(row, col)
     for num in range(1, 10):
+        if observer:
+            observer.on_try(row, col, num)
         if is_valid(grid, row, col, num, stats):
             grid[row][col] = num
-            if solve_backtracking(grid, stats):
+            if observer:
+                observer.on_assign(row, col, num)
+            if solve_backtracking(grid, stats, observer):
                 if stats:
                     stats.exit_call()
                 return True
             grid[row][col] = 0  # Backtrack
+        if stats:
+            stats.backtracks += 1
+        if observer:
+            observer.on_backtrack(row, col, num)
     if stats:
         stats.exit_call()
     return False
@@ -87,104 +125,296 @@ def build_peers():
     return peers
 
 
-PEERS = build_peers()
+PEERS = cached_table("peers", build_peers)
 
 
-def solve_constraint_propagation(grid, stats=None, use_mrv=False):
-    def initialize_domains(grid):
-        domains = {cell: set(digits) for cell in cells}
-        for r in rows:
-            for c in cols:
-                val = grid[r][c]
-                if val != 0:
-                    if not assign(domains, (r, c), val):
-                        return None
-        return domains
+def initialize_domains(grid, stats=None, observer=None):
+    """Candidate sets for every cell with the givens propagated, or None."""
+    domains = {cell: set(digits) for cell in cells}
+    for r in rows:
+        for c in cols:
+            val = grid[r][c]
+            if val != 0:
+                if not timed_assign(domains, (r, c), val, stats, observer):
+                    return None
+    return domains
 
-    def assign(domains, cell, value):
-        """Assign a value and propagate constraints. Return False if contradiction."""
-        other_vals = domains[cell] - {value}
-        for val in other_vals:
-            if not eliminate(domains, cell, val):
-                return False
-        return True
 
-    def eliminate(domains, cell, value):
-        """Eliminate value from cell's domain, propagate if needed."""
-        if value not in domains[cell]:
-            return True  # Already gone
+def assign(domains, cell, value, stats=None, observer=None, buckets=None):
+    """Assign a value and propagate constraints. Return False if contradiction."""
+    other_vals = domains[cell] - {value}
+    for val in other_vals:
+        if not eliminate(domains, cell, val, stats, observer, buckets):
+            return False
+    return True
+
 
-        domains[cell].remove(value)
+def timed_assign(domains, cell, value, stats=None, observer=None, buckets=None):
+    """``assign`` with its time added to ``stats.propagation_time``."""
+    if not stats:
+        return assign(domains, cell, value, stats, observer, buckets)
+    start = perf_counter()
+    consistent = assign(domains, cell, value, stats, observer, buckets)
+    stats.propagation_time += perf_counter() - start
+    return consistent
+
+
+def eliminate(domains, cell, value, stats=None, observer=None, buckets=None):
+    """Eliminate value from cell's domain, propagate if needed."""
+    if value not in domains[cell]:
+        return True  # Already gone
+
+    domains[cell].remove(value)
+    if buckets is not None:
+        buckets.remove(cell, value, len(domains[cell]))
+    if stats:
+        stats.constraint_checks += 1
+    if observer:
+        observer.on_eliminate(*cell, value)
+
+    # If no possible values → contradiction
+    if len(domains[cell]) == 0:
+        return False
+
+    # If only one value remains → eliminate from peers
+    elif len(domains[cell]) == 1:
+        v = next(iter(domains[cell]))
         if stats:
-            stats.check_constraint()
+            stats.propagations[NAKED_SINGLE] += 1
+        if observer:
+            observer.on_assign(*cell, v)
+        for peer in PEERS[cell]:
+            if not eliminate(domains, peer, v, stats, observer, buckets):
+                return False
 
-        # If no possible values → contradiction
-        if len(domains[cell]) == 0:
+    # If a value can only go in one place in a unit → assign it
+    for unit in get_units(cell):
+        places = [c for c in unit if value in domains[c]]
+        if len(places) == 0:
             return False
+        elif len(places) == 1:
+            if stats:
+                stats.propagations[HIDDEN_SINGLE] += 1
+            if not assign(domains, places[0], value, stats, observer, buckets):
+                return False
+    return True
+
+
+def get_units(cell):
+    r, c = cell
+    row_unit = [(r, j) for j in cols]
+    col_unit = [(i, c) for i in rows]
+    block_unit = [
+        (i, j)
+        for i in range(r // 3 * 3, r // 3 * 3 + 3)
+        for j in range(c // 3 * 3, c // 3 * 3 + 3)
+    ]
+    return [row_unit, col_unit, block_unit]
 
-        # If only one value remains → eliminate from peers
-        elif len(domains[cell]) == 1:
-            v = next(iter(domains[cell]))
+
+def select_cell(domains, use_mrv=False, rng=None):
+    """Pick the next cell to branch on, or None when every cell is decided.
+
+    Without MRV the cell is drawn with ``rng`` (a ``random.Random``), or the
+    global generator when none is given.
+    """
+    unassigned = [c for c in cells if len(domains[c]) > 1]
+    if not unassigned:
+        return None
+    if use_mrv:
+        return min(unassigned, key=lambda c: len(domains[c]))
+    if rng is None:
+        import random  # Only the random mode needs it; keeps worker start-up lean
+
+        rng = random
+    return rng.choice(unassigned)
+
+
+RESTART_POLICIES = (None, "luby", "geometric")
+RESTART_UNIT = 32  # Node cap of the first attempt, and of one Luby unit
+RESTART_GROWTH = 1.5  # Geometric policy: cap growth per attempt
+_RESTART = object()  # Returned up the search when an attempt hits its cap
+
+
+def restart_limits(policy, unit=RESTART_UNIT, growth=RESTART_GROWTH):
+    """Node caps for successive search attempts; ``None`` means uncapped.
+
+    ``policy`` is None (one uncapped attempt), ``"luby"`` (``unit`` times
+    1, 1, 2, 1, 1, 2, 4, ...) or ``"geometric"`` (``unit``, then ``growth``
+    times the previous cap). Both schedules grow without bound, so a search
+    that restarts on them still finishes.
+    """
+    if policy is None:
+        yield None
+    elif policy == "luby":
+        from sat import luby
+
+        i = 1
+        while True:
+            yield luby(i) * unit
+            i += 1
+    elif policy == "geometric":
+        limit = unit
+        while True:
+            yield int(limit)
+            limit *= growth
+    else:
+        raise ValueError(f"unknown restart policy {policy!r}")
+
+
+class DomainBuckets:
+    """Cells grouped by domain size, kept current by ``eliminate``, with undo.
+
+    ``by_size[n]`` holds the cells with ``n`` candidates, so the MRV cell
+    comes from the first non-empty bucket above one and the grid is solved
+    once all 81 cells sit in ``by_size[1]``. ``degree`` counts each cell's
+    undecided peers and is updated whenever a cell becomes or stops being
+    decided. Every elimination goes on ``trail``, so a failed try is undone
+    in place with ``undo`` rather than searched on copies of the domains.
+    """
+
+    __slots__ = ("by_size", "degree", "trail")
+
+    def __init__(self, domains):
+        self.by_size = [set() for _ in range(10)]
+        for cell in cells:
+            self.by_size[len(domains[cell])].add(cell)
+        self.degree = {
+            cell: sum(len(domains[p]) > 1 for p in PEERS[cell]) for cell in cells
+        }
+        self.trail = []  # (cell, value) in elimination order
+
+    def remove(self, cell, value, size):
+        """``cell`` just lost ``value`` and now has ``size`` candidates."""
+        by_size = self.by_size
+        by_size[size + 1].discard(cell)
+        by_size[size].add(cell)
+        if size == 1:
+            degree = self.degree
             for peer in PEERS[cell]:
-                if not eliminate(domains, peer, v):
-                    return False
+                degree[peer] -= 1
+        self.trail.append((cell, value))
+
+    def undo(self, domains, mark):
+        """Put back every candidate eliminated since ``len(trail)`` was ``mark``."""
+        trail = self.trail
+        by_size = self.by_size
+        degree = self.degree
+        while len(trail) > mark:
+            cell, value = trail.pop()
+            domain = domains[cell]
+            size = len(domain)
+            domain.add(value)
+            by_size[size].discard(cell)
+            by_size[size + 1].add(cell)
+            if size == 1:
+                for peer in PEERS[cell]:
+                    degree[peer] += 1
+
+    def solved(self):
+        return len(self.by_size[1]) == 81
+
+    def select(self):
+        """MRV cell, most undecided peers first; None when every cell is decided.
+
+        Only the smallest non-empty bucket is scanned for the degree tie-break.
+        """
+        for bucket in self.by_size[2:]:
+            if bucket:
+                if len(bucket) == 1:
+                    return next(iter(bucket))
+                degree = self.degree
+                return max(bucket, key=lambda cell: (degree[cell], cell))
+        return None
 
-        # If a value can only go in one place in a unit → assign it
-        for unit in get_units(cell):
-            places = [c for c in unit if value in domains[c]]
-            if len(places) == 0:
-                return False
-            elif len(places) == 1:
-                if not assign(domains, places[0], value):
-                    return False
-        return True
 
-    def get_units(cell):
-        r, c = cell
-        row_unit = [(r, j) for j in cols]
-        col_unit = [(i, c) for i in rows]
-        block_unit = [
-            (i, j)
-            for i in range(r // 3 * 3, r // 3 * 3 + 3)
-            for j in range(c // 3 * 3, c // 3 * 3 + 3)
-        ]
-        return [row_unit, col_unit, block_unit]
+def lcv_order(domains, cell):
+    """Values of ``cell`` ordered by how few undecided peers still allow them.
+
+    Ties go to the smaller value, so the order does not depend on how the
+    domain set was built up.
+    """
+    undecided = [domains[p] for p in PEERS[cell] if len(domains[p]) > 1]
+    return sorted(
+        domains[cell], key=lambda v: (sum(v in domain for domain in undecided), v)
+    )
+
+
+def solve_constraint_propagation(
+    grid,
+    stats=None,
+    use_mrv=False,
+    observer=None,
+    rng=None,
+    restarts=None,
+    restart_unit=RESTART_UNIT,
+):
+    """Propagate the givens, then search with MRV or random branching.
+
+    With a ``restarts`` policy (see ``restart_limits``) an attempt that
+    visits more nodes than its cap is abandoned and the search starts again
+    from the propagated givens; ``rng`` keeps drawing, so each attempt takes
+    a different path while a seeded run stays reproducible.
+    """
+    nodes = 0
+    limit = None
 
     def backtrack(domains, use_mrv=False):
+        nonlocal nodes
         if stats:
             stats.enter_call()
+        if limit is not None:
+            nodes += 1
+            if nodes > limit:
+                if stats:
+                    stats.exit_call()
+                return _RESTART
 
-        # Finished
-        if all(len(domains[cell]) == 1 for cell in cells):
+        # --- Variable selection ---
+        cell = select_cell(domains, use_mrv, rng)
+        if cell is None:
+            # Finished
             if stats:
                 stats.exit_call()
             return domains
-
-        # --- Variable selection ---
-        unassigned = [c for c in cells if len(domains[c]) > 1]
-        if use_mrv:
-            cell = min(unassigned, key=lambda c: len(domains[c]))
-        else:
-            cell = random.choice(unassigned)
+        if observer:
+            observer.on_select(*cell)
 
         for val in sorted(domains[cell]):
+            if observer:
+                observer.on_try(*cell, val)
             new_domains = {c: set(domains[c]) for c in cells}
-            if assign(new_domains, cell, val):
+            if timed_assign(new_domains, cell, val, stats, observer):
                 result = backtrack(new_domains, use_mrv)
                 if result:
+                    if result is _RESTART:
+                        if stats:
+                            stats.backtracks += 1
+                        if observer:
+                            observer.on_backtrack(*cell, val)
                     if stats:
                         stats.exit_call()
                     return result
+            if stats:
+                stats.backtracks += 1
+            if observer:
+                observer.on_backtrack(*cell, val)
 
         if stats:
             stats.exit_call()
         return None
 
-    domains = initialize_domains(grid)
+    domains = initialize_domains(grid, stats, observer)
     if not domains:
         return False
 
-    result = backtrack(domains, use_mrv)
+    for limit in restart_limits(restarts, restart_unit):
+        nodes = 0
+        result = backtrack(domains, use_mrv)
+        if result is not _RESTART:
+            break
+        if stats:
+            stats.restarts += 1
     if not result:
         return False
 
@@ -195,10 +425,194 @@ def solve_constraint_propagation(grid, stats=None, use_mrv=False):
 
 
 @register_solver("Constraint Propagation + MRV")
-def solver_mrv(grid, stats=None):
-    return solve_constraint_propagation(grid, stats=stats, use_mrv=True)
+def solver_mrv(grid, stats=None, observer=None):
+    return solve_constraint_propagation(
+        grid, stats=stats, use_mrv=True, observer=observer
+    )
 
 
 @register_solver("Constraint Propagation + Random")
-def solver_random(grid, stats=None):
-    return solve_constraint_propagation(grid, stats=stats, use_mrv=False)
+def solver_random(
+    grid, stats=None, observer=None, seed=None, restarts="luby", unit=RESTART_UNIT
+):
+    """Random branching, restarted on a node-capped schedule.
+
+    Pass ``seed`` for a reproducible run and ``restarts=None`` for a single
+    uncapped attempt; ``unit`` scales the schedule.
+    """
+    import random
+
+    return solve_constraint_propagation(
+        grid,
+        stats=stats,
+        use_mrv=False,
+        observer=observer,
+        rng=random.Random(seed),
+        restarts=restarts,
+        restart_unit=unit,
+    )
+
+
+@register_solver("Constraint Propagation + MRV/LCV")
+def solver_mrv_lcv(grid, stats=None, observer=None):
+    """Constraint propagation with incremental MRV buckets.
+
+    Branches on the cell with the fewest candidates (most undecided peers on
+    ties) and tries its least constraining values first. The search works
+    on one set of domains, undoing each failed try through the buckets'
+    trail instead of copying all 81 domains per try.
+    """
+
+    def backtrack():
+        if stats:
+            stats.enter_call()
+
+        if buckets.solved():
+            if stats:
+                stats.exit_call()
+            return True
+        cell = buckets.select()
+        if observer:
+            observer.on_select(*cell)
+
+        for val in lcv_order(domains, cell):
+            if observer:
+                observer.on_try(*cell, val)
+            mark = len(buckets.trail)
+            if timed_assign(domains, cell, val, stats, observer, buckets):
+                if backtrack():
+                    if stats:
+                        stats.exit_call()
+                    return True
+            buckets.undo(domains, mark)
+            if stats:
+                stats.backtracks += 1
+            if observer:
+                observer.on_backtrack(*cell, val)
+
+        if stats:
+            stats.exit_call()
+        return False
+
+    domains = initialize_domains(grid, stats, observer)
+    if not domains:
+        return False
+
+    buckets = DomainBuckets(domains)
+    if not backtrack():
+        return False
+
+    for (r, c), valset in domains.items():
+        grid[r][c] = next(iter(valset))
+    return True
+
+
+def sat_var(row, col, digit):
+    """CNF variable meaning "cell (row, col) holds digit"."""
+    return row * 81 + col * 9 + digit
+
+
+def build_sudoku_clauses():
+    """Each cell holds exactly one digit; each unit holds each digit exactly once."""
+    groups = [[(r, c, d) for d in digits] for r, c in cells]
+    units = (
+        [[(r, c) for c in cols] for r in rows]
+        + [[(r, c) for r in rows] for c in cols]
+        + [
+            [(r, c) for r in range(br, br + 3) for c in range(bc, bc + 3)]
+            for br in (0, 3, 6)
+            for bc in (0, 3, 6)
+        ]
+    )
+    groups += [[(r, c, d) for r, c in unit] for unit in units for d in digits]
+
+    clauses = []
+    for group in groups:
+        lits = [sat_var(*key) for key in group]
+        clauses.append(tuple(lits))
+        clauses += [(-a, -b) for i, a in enumerate(lits) for b in lits[i + 1 :]]
+    return clauses
+
+
+_sudoku_clauses = None
+
+
+def sudoku_clauses():
+    """The puzzle-independent CNF, built or loaded from cache on first use."""
+    global _sudoku_clauses
+    if _sudoku_clauses is None:
+        _sudoku_clauses = cached_table("sudoku_clauses", build_sudoku_clauses)
+    return _sudoku_clauses
+
+
+class _SatObserverBridge:
+    """Translate CDCL decisions and assignments into SolverObserver events."""
+
+    def __init__(self, observer):
+        self.observer = observer
+
+    def decided(self, var):
+        row, col, digit = divmod((var - 1) // 9, 9) + ((var - 1) % 9 + 1,)
+        self.observer.on_select(row, col)
+        self.observer.on_try(row, col, digit)
+
+    def assigned(self, lit):
+        var = abs(lit)
+        row, col, digit = divmod((var - 1) // 9, 9) + ((var - 1) % 9 + 1,)
+        if lit > 0:
+            self.observer.on_assign(row, col, digit)
+        else:
+            self.observer.on_eliminate(row, col, digit)
+
+    def undone(self, var):
+        row, col, digit = divmod((var - 1) // 9, 9) + ((var - 1) % 9 + 1,)
+        self.observer.on_backtrack(row, col, digit)
+
+
+def build_sat_solver(grid, stats=None, observer=None):
+    """CDCL engine loaded with the puzzle's CNF, simplified by the givens.
+
+    Clauses satisfied by a given are dropped and literals a given falsifies
+    are removed; the givens' own variables are fixed by unit clauses.
+    """
+    from sat import CDCLSolver
+
+    truth = {}
+    for r, c in cells:
+        if grid[r][c]:
+            for d in digits:
+                truth[sat_var(r, c, d)] = d == grid[r][c]
+
+    engine = CDCLSolver(729, stats)
+    if observer:
+        engine.listener = _SatObserverBridge(observer)
+    for var, value in truth.items():
+        engine.add_clause([var if value else -var])
+    for clause in sudoku_clauses():
+        lits = []
+        for lit in clause:
+            value = truth.get(abs(lit))
+            if value is None:
+                lits.append(lit)
+            elif value == (lit > 0):
+                break  # Satisfied by a given
+        else:
+            if not engine.add_clause(lits):
+                break
+    return engine
+
+
+def read_sat_solution(engine, grid):
+    for r, c in cells:
+        for d in digits:
+            if engine.value(sat_var(r, c, d)) == 1:
+                grid[r][c] = d
+
+
+@register_solver("SAT (CDCL)")
+def solve_sat(grid, stats=None, observer=None):
+    engine = build_sat_solver(grid, stats, observer)
+    if not engine.solve():
+        return False
+    read_sat_solution(engine, grid)
+    return True
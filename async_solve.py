@@ -0,0 +1,129 @@
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from registry import steppers
+
+DEFAULT_SOLVER = "Constraint Propagation + MRV"
+CANCEL_CHECK_STEPS = 32  # Search steps between looks at the clock
+CANCEL_POLL_INTERVAL = 0.01  # Seconds between reads of the cancellation flag
+
+
+def solve_cancellable(name, puzzle, cancelled=None):
+    """Solve in an executor, stopping soon after ``cancelled`` is set.
+
+    Returns ``(status, grid)`` with status ``solved``, ``unsolvable`` or
+    ``cancelled``. The flag is read at most every ``CANCEL_POLL_INTERVAL``
+    seconds, since for a process pool each read is a round trip to the
+    manager.
+    """
+    grid = [list(row) for row in puzzle]
+    search = steppers[name](grid, every=CANCEL_CHECK_STEPS)
+    last_poll = time.perf_counter()
+    try:
+        while True:
+            next(search)
+            if cancelled is not None:
+                now = time.perf_counter()
+                if now - last_poll >= CANCEL_POLL_INTERVAL:
+                    last_poll = now
+                    if cancelled.is_set():
+                        return "cancelled", grid
+    except StopIteration as done:
+        return ("solved" if done.value else "unsolvable"), grid
+    finally:
+        search.close()
+
+
+class AsyncSolver:
+    """Solve puzzles from asyncio code without blocking the event loop.
+
+    Solves run on a shared thread or process pool, at most
+    ``max_concurrency`` at a time. A timeout or a cancelled caller sets the
+    search's cancellation flag, and the concurrency slot is only released
+    once the search has actually stopped.
+    """
+
+    def __init__(self, executor="process", workers=None, max_concurrency=None):
+        if executor == "process":
+            self.executor = ProcessPoolExecutor(max_workers=workers)
+        elif executor == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=workers)
+        else:
+            raise ValueError(f"unknown executor {executor!r}")
+        self.uses_processes = executor == "process"
+        self.max_concurrency = max_concurrency or workers or os.cpu_count() or 1
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._manager = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await asyncio.to_thread(self.close)
+
+    def close(self):
+        self.executor.shutdown()
+        if self._manager is not None:
+            self._manager.shutdown()
+
+    def _new_flag(self):
+        if not self.uses_processes:
+            return threading.Event()
+        if self._manager is None:
+            self._manager = multiprocessing.Manager()
+        return self._manager.Event()
+
+    async def solve(self, puzzle, solver=DEFAULT_SOLVER, timeout=None):
+        """Return the solved grid, or None if the puzzle has no solution.
+
+        Raises ``TimeoutError`` once ``timeout`` seconds pass, after the
+        underlying search has been stopped.
+        """
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            cancelled = self._new_flag()
+            search = loop.run_in_executor(
+                self.executor, solve_cancellable, solver, puzzle, cancelled
+            )
+            try:
+                status, grid = await asyncio.wait_for(asyncio.shield(search), timeout)
+            except BaseException:
+                # Timed out or the caller was cancelled: stop the search too
+                cancelled.set()
+                await asyncio.wait([search])
+                raise
+        return grid if status == "solved" else None
+
+    async def as_completed(
+        self, puzzles, solver=DEFAULT_SOLVER, timeout=None, return_exceptions=False
+    ):
+        """Yield ``(index, solution)`` for each puzzle as it finishes.
+
+        ``timeout`` applies to each puzzle. A failure is raised unless
+        ``return_exceptions`` is set, in which case the exception is yielded
+        as the solution. Leaving the loop early cancels the remaining solves.
+        """
+
+        async def indexed(index, puzzle):
+            try:
+                return index, await self.solve(puzzle, solver, timeout)
+            except Exception as exc:
+                if not return_exceptions:
+                    raise
+                return index, exc
+
+        tasks = [
+            asyncio.ensure_future(indexed(index, puzzle))
+            for index, puzzle in enumerate(puzzles)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,159 @@
+from algos import PEERS
+
+ALL_CANDIDATES = 0b1111111110  # Bits 1-9
+
+UNITS = (
+    [("row", [(r, c) for c in range(9)]) for r in range(9)]
+    + [("column", [(r, c) for r in range(9)]) for c in range(9)]
+    + [
+        ("box", [(r, c) for r in range(br, br + 3) for c in range(bc, bc + 3)])
+        for br in (0, 3, 6)
+        for bc in (0, 3, 6)
+    ]
+)
+
+
+class Hint:
+    """The next logical step: ``value`` goes in ``(row, col)`` by ``rule``.
+
+    Dead ends are hints too: ``"no candidates"`` for an empty cell with
+    nothing left, or ``"no place in <unit>"`` for a digit the unit holding
+    ``(row, col)`` can no longer take.
+    """
+
+    __slots__ = ("row", "col", "value", "rule")
+
+    def __init__(self, row, col, value, rule):
+        self.row = row
+        self.col = col
+        self.value = value
+        self.rule = rule
+
+    @property
+    def is_dead_end(self):
+        return self.rule.startswith("no ")
+
+    def __repr__(self):
+        return f"Hint({self.row}, {self.col}, {self.value}, {self.rule!r})"
+
+
+class CandidateStore:
+    """Live pencil-mark candidates for a grid edited by hand, with undo.
+
+    ``candidates[row][col]`` is a bitmask (bit ``v`` set for each candidate
+    ``v``) of the digits no peer holds, kept current in O(peers) per edit
+    through per-cell counts of how many peers hold each digit. Hints apply
+    the two rules ``eliminate`` uses in the constraint propagation solvers:
+    a cell with one candidate left, and a digit with one place left in a
+    unit.
+    """
+
+    def __init__(self, grid):
+        self.grid = [[0] * 9 for _ in range(9)]
+        self.candidates = [[ALL_CANDIDATES] * 9 for _ in range(9)]
+        self.blocked = [[[0] * 10 for _ in range(9)] for _ in range(9)]
+        self.givens = {(r, c) for r in range(9) for c in range(9) if grid[r][c]}
+        self.filled = 0
+        self.clashes = 0  # Pairs of peers holding the same digit
+        self.history = []
+        for r, c in self.givens:
+            self._place(r, c, grid[r][c])
+
+    def _place(self, row, col, value):
+        """Write ``value`` (0 clears) and update the peers' candidates."""
+        old = self.grid[row][col]
+        if old == value:
+            return
+        candidates = self.candidates
+        blocked = self.blocked
+        peers = PEERS[(row, col)]
+        if old:
+            self.filled -= 1
+            self.clashes -= blocked[row][col][old]
+            bit = 1 << old
+            for r, c in peers:
+                counts = blocked[r][c]
+                counts[old] -= 1
+                if not counts[old] and not self.grid[r][c]:
+                    candidates[r][c] |= bit
+        if value:
+            self.filled += 1
+            self.clashes += blocked[row][col][value]
+            mask = ~(1 << value)
+            for r, c in peers:
+                blocked[r][c][value] += 1
+                candidates[r][c] &= mask
+            candidates[row][col] = 0
+        else:
+            counts = blocked[row][col]
+            candidates[row][col] = sum(1 << v for v in range(1, 10) if not counts[v])
+        self.grid[row][col] = value
+
+    def set(self, row, col, value):
+        """Enter ``value`` (0 clears) unless the cell is a given; returns success."""
+        if (row, col) in self.givens or not 0 <= value <= 9:
+            return False
+        old = self.grid[row][col]
+        if old != value:
+            self.history.append((row, col, old))
+            self._place(row, col, value)
+        return True
+
+    def clear(self, row, col):
+        return self.set(row, col, 0)
+
+    def undo(self):
+        """Revert the last edit; returns its cell, or None with nothing to undo."""
+        if not self.history:
+            return None
+        row, col, value = self.history.pop()
+        self._place(row, col, value)
+        return row, col
+
+    def is_conflict(self, row, col):
+        value = self.grid[row][col]
+        return bool(value) and self.blocked[row][col][value] > 0
+
+    def conflicts(self):
+        if not self.clashes:
+            return []
+        return [(r, c) for r in range(9) for c in range(9) if self.is_conflict(r, c)]
+
+    def is_solved(self):
+        return self.filled == 81 and not self.clashes
+
+    def hint(self):
+        """The first forced placement or dead end, or None if neither exists."""
+        grid = self.grid
+        candidates = self.candidates
+        for r in range(9):
+            for c in range(9):
+                if not grid[r][c]:
+                    mask = candidates[r][c]
+                    if not mask:
+                        return Hint(r, c, 0, "no candidates")
+                    if not mask & (mask - 1):
+                        return Hint(r, c, mask.bit_length() - 1, "naked single")
+
+        for kind, unit in UNITS:
+            once = twice = placed = 0
+            for r, c in unit:
+                if grid[r][c]:
+                    placed |= 1 << grid[r][c]
+                else:
+                    mask = candidates[r][c]
+                    twice |= once & mask
+                    once |= mask
+            missing = ALL_CANDIDATES & ~placed & ~once
+            if missing:
+                r, c = unit[0]
+                value = (missing & -missing).bit_length() - 1
+                return Hint(r, c, value, f"no place in {kind}")
+            single = once & ~twice & ~placed
+            if single:
+                bit = single & -single
+                value = bit.bit_length() - 1
+                for r, c in unit:
+                    if not grid[r][c] and candidates[r][c] & bit:
+                        return Hint(r, c, value, f"hidden single in {kind}")
+        return None
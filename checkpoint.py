@@ -0,0 +1,98 @@
+import json
+import os
+
+
+class BenchmarkCheckpoint:
+    """Append-only JSON-lines record of a long benchmark run.
+
+    Every generated puzzle and every finished (solver, puzzle) job is written
+    and flushed immediately, so a restarted run replays the same puzzles and
+    skips the jobs that already completed.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.run_id = None
+        self.puzzles = {}
+        self.jobs = {}
+        self.flushed = set()
+        if os.path.exists(path):
+            self._load()
+        self._file = open(path, "a")
+
+    def _load(self):
+        """Read the records, then cut off a torn final write from a crash.
+
+        Appending after a partial line would glue the next record onto it
+        and lose both, so the file is truncated to the end of the last
+        complete record before it is reopened for appending.
+        """
+        end = 0
+        with open(self.path, "rb") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    break
+                if not line.endswith(b"\n"):
+                    break  # Complete JSON, but its newline was never written
+                end += len(line)
+                kind = record["type"]
+                if kind == "run":
+                    self.run_id = record["run_id"]
+                elif kind == "puzzle":
+                    self.puzzles[record["puzzle_id"]] = record["puzzle"]
+                elif kind == "job":
+                    self.jobs[(record["solver"], record["puzzle_id"])] = record[
+                        "result"
+                    ]
+                elif kind == "flushed":
+                    self.flushed.add(record["puzzle_id"])
+        if end < os.path.getsize(self.path):
+            os.truncate(self.path, end)
+
+    def _write(self, record):
+        self._file.write(json.dumps(record) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self):
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start_run(self, run_id):
+        """Return the run id to use, keeping the original one on resume."""
+        if self.run_id is None:
+            self.run_id = run_id
+            self._write({"type": "run", "run_id": run_id})
+        return self.run_id
+
+    def puzzle(self, puzzle_id, generate):
+        """Return the checkpointed puzzle, generating and recording it if new."""
+        if puzzle_id not in self.puzzles:
+            self.puzzles[puzzle_id] = generate()
+            record = {"type": "puzzle", "puzzle_id": puzzle_id}
+            self._write({**record, "puzzle": self.puzzles[puzzle_id]})
+        return self.puzzles[puzzle_id]
+
+    def job_result(self, solver, puzzle_id):
+        return self.jobs.get((solver, puzzle_id))
+
+    def record_job(self, solver, puzzle_id, result):
+        self.jobs[(solver, puzzle_id)] = result
+        self._write(
+            {"type": "job", "solver": solver, "puzzle_id": puzzle_id, "result": result}
+        )
+
+    def is_flushed(self, puzzle_id):
+        return puzzle_id in self.flushed
+
+    def record_flushed(self, puzzle_id):
+        """Mark a puzzle's results as persisted to the results store or CSV."""
+        self.flushed.add(puzzle_id)
+        self._write({"type": "flushed", "puzzle_id": puzzle_id})
@@ -0,0 +1,429 @@
+import argparse
+import ipaddress
+import os
+import queue
+import secrets
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing import Process
+from multiprocessing.connection import Client, Listener
+
+LEASE_S = 30.0  # A chunk goes back on the queue this long after its last heartbeat
+MAX_ATTEMPTS = 3  # Leases a chunk gets before it is given up as failed
+WAIT_S = 0.2  # Worker back-off while every remaining chunk is leased out
+AUTHKEY_ENV = "SUDOKU_AUTHKEY"
+COMMANDS = ("lease", "heartbeat", "complete")  # What a worker may call
+
+
+def default_authkey():
+    """The shared key from ``SUDOKU_AUTHKEY``, or None when it is unset."""
+    key = os.environ.get(AUTHKEY_ENV)
+    return key.encode() if key else None
+
+
+def is_loopback(host):
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def parse_address(text):
+    host, _, port = text.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+class Coordinator:
+    """Hands out chunks to workers under leases and collects their results.
+
+    Workers connect over ``multiprocessing.connection`` (a TCP socket with
+    an HMAC handshake on ``authkey``, no broker) and ask for a lease on the
+    next chunk, heartbeat while they work on it and send back its results.
+    A chunk is queued again when its lease runs out without a heartbeat or
+    its worker's connection drops, so a killed worker or host only costs
+    the chunks it held; one that still fails after ``max_attempts`` leases
+    is given up with a ``None`` result. A late result for a chunk that was
+    already completed elsewhere is ignored.
+
+    Messages are pickles, so the key is all that stands between a peer and
+    code execution on the coordinator. Without one (``authkey`` or
+    ``SUDOKU_AUTHKEY``) a random key is generated, which only loopback
+    addresses may use; it is in ``self.authkey`` for local workers.
+    """
+
+    def __init__(
+        self,
+        chunks,
+        address=("127.0.0.1", 0),
+        authkey=None,
+        lease_s=LEASE_S,
+        max_attempts=MAX_ATTEMPTS,
+    ):
+        self.chunks = list(chunks)
+        self.lease_s = lease_s
+        self.max_attempts = max_attempts
+        self.pending = deque(range(len(self.chunks)))
+        self.leases = {}  # chunk id: (worker id, deadline)
+        self.attempts = [0] * len(self.chunks)
+        self.results = [None] * len(self.chunks)
+        self.finished = set()
+        self.remaining = len(self.chunks)
+        self.requeued = 0
+        self.completed = queue.Queue()  # (chunk id, results) for as_completed()
+        self.lock = threading.Lock()
+        self.authkey = authkey or default_authkey()
+        if self.authkey is None:
+            if not is_loopback(address[0]):
+                raise ValueError(
+                    f"Listening on {address[0]} needs a shared key: set {AUTHKEY_ENV}"
+                )
+            self.authkey = secrets.token_hex(32).encode()
+        self.listener = Listener(address, authkey=self.authkey)
+        self.address = self.listener.address
+        self._closed = False
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self):
+        while not self._closed:
+            try:
+                conn = self.listener.accept()
+            except Exception:
+                # A failed handshake, or the listener closed under us
+                continue
+            threading.Thread(target=self._serve, args=(conn,), daemon=True).start()
+
+    def _serve(self, conn):
+        worker_id = None
+        try:
+            while True:
+                command, worker_id, *args = conn.recv()
+                if command not in COMMANDS:
+                    raise ValueError(f"Unknown command: {command!r}")
+                conn.send(getattr(self, command)(worker_id, *args))
+        except (EOFError, OSError, ValueError):
+            pass
+        finally:
+            conn.close()
+            if worker_id is not None:
+                self._release(worker_id)
+
+    def lease(self, worker_id):
+        """``(chunk id, chunk, lease_s)``, ``"wait"``, or None once all are done."""
+        with self.lock:
+            self._reap(time.monotonic())
+            while self.pending:
+                chunk_id = self.pending.popleft()
+                if chunk_id in self.finished:
+                    continue  # Completed by an earlier lease after all
+                self.attempts[chunk_id] += 1
+                self.leases[chunk_id] = (worker_id, time.monotonic() + self.lease_s)
+                return chunk_id, self.chunks[chunk_id], self.lease_s
+            return "wait" if self.remaining else None
+
+    def heartbeat(self, worker_id, chunk_id):
+        """Extend a lease; False if the worker no longer holds it."""
+        with self.lock:
+            if self.leases.get(chunk_id, (None,))[0] != worker_id:
+                return False
+            self.leases[chunk_id] = (worker_id, time.monotonic() + self.lease_s)
+            return True
+
+    def complete(self, worker_id, chunk_id, results):
+        """Record a chunk's results; False if it was already finished.
+
+        The first result wins, even from a lease that had expired: any
+        worker still holding the chunk loses its lease at its next heartbeat.
+        """
+        with self.lock:
+            if chunk_id in self.finished:
+                return False
+            self.leases.pop(chunk_id, None)
+            self._finish(chunk_id, results)
+            return True
+
+    def _finish(self, chunk_id, results):
+        self.finished.add(chunk_id)
+        self.results[chunk_id] = results
+        self.remaining -= 1
+        self.completed.put((chunk_id, results))
+
+    def _requeue(self, chunk_id):
+        del self.leases[chunk_id]
+        self.requeued += 1
+        if self.attempts[chunk_id] < self.max_attempts:
+            self.pending.append(chunk_id)
+        else:
+            print(f"Chunk {chunk_id} failed {self.attempts[chunk_id]} leases; skipped")
+            self._finish(chunk_id, None)
+
+    def _reap(self, now):
+        for chunk_id, (_, deadline) in list(self.leases.items()):
+            if deadline < now:
+                self._requeue(chunk_id)
+
+    def _release(self, worker_id):
+        """Requeue every chunk leased to a worker whose connection dropped."""
+        with self.lock:
+            for chunk_id, (holder, _) in list(self.leases.items()):
+                if holder == worker_id:
+                    self._requeue(chunk_id)
+
+    def as_completed(self, poll_s=1.0):
+        """Yield ``(chunk id, results)`` in the calling thread as chunks finish.
+
+        Failed chunks come out with ``None`` results. Expired leases are
+        reaped here too, so a stalled worker is noticed even when no other
+        worker is asking for work.
+        """
+        done = 0
+        while done < len(self.chunks):
+            try:
+                item = self.completed.get(timeout=poll_s)
+            except queue.Empty:
+                with self.lock:
+                    self._reap(time.monotonic())
+                continue
+            done += 1
+            yield item
+
+    def close(self):
+        self._closed = True
+        self.listener.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _run_chunk(chunk):
+    """Run one chunk in a worker: a benchmark sweep or a block of puzzle lines."""
+    if chunk["kind"] == "benchmark":
+        from main import benchmark_solver
+        from registry import solvers
+
+        return [
+            benchmark_solver(name, solver, puzzle, puzzle_id, chunk["runs"])
+            for puzzle_id, puzzle in chunk["puzzles"]
+            for name, solver in solvers.items()
+        ]
+    from solve import solve_lines
+
+    return solve_lines(chunk["solver"], chunk["lines"])
+
+
+def run_worker(address, authkey=None, worker_id=None):
+    """Lease and run chunks from the coordinator at ``address`` until none are left.
+
+    A heartbeat thread keeps the current lease alive while the chunk runs;
+    if the coordinator reports the lease lost, the result is still sent and
+    simply ignored when the chunk was finished elsewhere. The key is
+    ``authkey`` or ``SUDOKU_AUTHKEY``; there is no default.
+    """
+    authkey = authkey or default_authkey()
+    if authkey is None:
+        raise ValueError(f"Set {AUTHKEY_ENV} to the coordinator's key")
+    conn = Client(address, authkey=authkey)
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    lock = threading.Lock()
+
+    def call(*message):
+        with lock:
+            conn.send(message)
+            return conn.recv()
+
+    done = 0
+    try:
+        while True:
+            reply = call("lease", worker_id)
+            if reply is None:
+                return done
+            if reply == "wait":
+                time.sleep(WAIT_S)
+                continue
+            chunk_id, chunk, lease_s = reply
+            finished = threading.Event()
+
+            def beat():
+                while not finished.wait(lease_s / 3):
+                    if not call("heartbeat", worker_id, chunk_id):
+                        return
+
+            heartbeat = threading.Thread(target=beat, daemon=True)
+            heartbeat.start()
+            try:
+                results = _run_chunk(chunk)
+            finally:
+                finished.set()
+                heartbeat.join()
+            call("complete", worker_id, chunk_id, results)
+            done += 1
+    except (EOFError, ConnectionError):
+        return done  # Coordinator went away
+    finally:
+        conn.close()
+
+
+def start_local_workers(address, count, authkey=None):
+    """Spawn ``count`` worker processes on this host, e.g. for testing."""
+    workers = [
+        Process(target=run_worker, args=(address, authkey), daemon=True)
+        for _ in range(count)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def benchmark_chunks(difficulty_levels, puzzles_per_level, runs, chunk_size):
+    """Benchmark-sweep chunks with the ids ``benchmark_multiple_puzzles`` uses."""
+    from utils import generate_partial_sudoku
+
+    puzzles = [
+        (f"puzzle_d{difficulty}_{i}", generate_partial_sudoku(empty_cells=difficulty))
+        for difficulty in difficulty_levels
+        for i in range(puzzles_per_level)
+    ]
+    return [
+        {"kind": "benchmark", "puzzles": puzzles[i : i + chunk_size], "runs": runs}
+        for i in range(0, len(puzzles), chunk_size)
+    ]
+
+
+def run_benchmark(coordinator, store):
+    """Insert each finished benchmark chunk into ``store`` as it arrives."""
+    rows = 0
+    for _, results in coordinator.as_completed():
+        if results:
+            rows += store.insert_results(results)
+    return rows
+
+
+def run_solve(coordinator, sink):
+    """Write solved chunks to ``sink`` in input order; returns the totals."""
+    totals = {"puzzles": 0, "solved": 0, "unsolved": 0, "invalid": 0, "failed": 0}
+    ready = {}
+    next_id = 0
+    for chunk_id, result in coordinator.as_completed():
+        ready[chunk_id] = result
+        while next_id in ready:
+            result = ready.pop(next_id)
+            if result is None:
+                totals["failed"] += len(coordinator.chunks[next_id]["lines"])
+            else:
+                block, solved, unsolved, invalid = result
+                sink.write(block)
+                totals["solved"] += solved
+                totals["unsolved"] += unsolved
+                totals["invalid"] += invalid
+                totals["puzzles"] += solved + unsolved + invalid
+            next_id += 1
+    return totals
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Spread solves and benchmark sweeps over worker processes/hosts."
+    )
+    sub = parser.add_subparsers(dest="role", required=True)
+
+    coordinator = sub.add_parser("coordinator", help="hand out chunks and collect")
+    coordinator.add_argument(
+        "--bind", default="127.0.0.1:7070", help="HOST:PORT to listen on"
+    )
+    coordinator.add_argument(
+        "--input", help="puzzle file to solve (81 characters per line)"
+    )
+    coordinator.add_argument("-o", "--output", help="solution file for --input")
+    coordinator.add_argument("--solver", default="Constraint Propagation + MRV")
+    coordinator.add_argument(
+        "--difficulty-levels", type=int, nargs="+", default=[22, 30, 40, 50, 60]
+    )
+    coordinator.add_argument("--puzzles-per-level", type=int, default=3)
+    coordinator.add_argument("--runs", type=int, default=50)
+    coordinator.add_argument(
+        "--chunk-size", type=int, help="puzzles per chunk (default: 256 lines or 1)"
+    )
+    coordinator.add_argument("--lease-s", type=float, default=LEASE_S)
+    coordinator.add_argument(
+        "--db", default="benchmark_results.db", help="SQLite results store"
+    )
+    coordinator.add_argument(
+        "--local-workers", type=int, default=0, help="also start N workers here"
+    )
+
+    worker = sub.add_parser("worker", help="lease and run chunks")
+    worker.add_argument("--connect", default="127.0.0.1:7070", help="HOST:PORT")
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    if args.role == "worker":
+        try:
+            done = run_worker(parse_address(args.connect))
+        except ValueError as e:
+            sys.exit(str(e))
+        print(f"Worker finished {done} chunks", file=sys.stderr)
+        return
+
+    if args.input:
+        with open(args.input, "rb") as f:
+            lines = f.readlines()
+        size = args.chunk_size or 256
+        chunks = [
+            {"kind": "solve", "solver": args.solver, "lines": lines[i : i + size]}
+            for i in range(0, len(lines), size)
+        ]
+    else:
+        chunks = benchmark_chunks(
+            args.difficulty_levels,
+            args.puzzles_per_level,
+            args.runs,
+            args.chunk_size or 1,
+        )
+
+    start = time.perf_counter()
+    address = parse_address(args.bind)
+    try:
+        coordinator = Coordinator(chunks, address, lease_s=args.lease_s)
+    except ValueError as e:
+        sys.exit(str(e))
+    with coordinator:
+        host, port = coordinator.address
+        print(f"Coordinator on {host}:{port}: {len(chunks)} chunks", file=sys.stderr)
+        if default_authkey() is None:
+            print(
+                f"Generated key: {AUTHKEY_ENV}={coordinator.authkey.decode()}",
+                file=sys.stderr,
+            )
+        workers = start_local_workers(
+            coordinator.address, args.local_workers, coordinator.authkey
+        )
+        if args.input:
+            sink = open(args.output, "wb") if args.output else sys.stdout.buffer
+            totals = run_solve(coordinator, sink)
+            if args.output:
+                sink.close()
+            summary = ", ".join(f"{key} {value}" for key, value in totals.items())
+        else:
+            from results_store import ResultsStore
+
+            with ResultsStore(args.db) as store:
+                rows = run_benchmark(coordinator, store)
+            summary = f"{rows} result rows stored in {args.db} (run {store.run_id})"
+        for worker in workers:
+            worker.join()
+    print(
+        f"{summary} | {time.perf_counter() - start:.2f}s, "
+        f"{coordinator.requeued} chunks requeued",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,17 @@
 import pygame
+import os
 import sys
-import time
-import random
+import threading
 import copy
-from algos import solvers
+from candidates import CandidateStore
+from registry import solvers
+from solver_trace import SolverTrace, TraceObserver, TracePlayer
 from utils import generate_partial_sudoku
 
 # Initialize pygame
 pygame.init()
 
-WIDTH, HEIGHT = 540, 800
+WIDTH, HEIGHT = 540, 900
 GRID_SIZE = 9
 CELL_SIZE = 54
 MARGIN = 20
@@ -21,6 +23,16 @@ SLIDER_HEIGHT = 20
 ANIMATION_DELAY_MIN = 0.001  # Fastest
 ANIMATION_DELAY_MAX = 0.5  # Slowest
 ANIMATION_DELAY_DEFAULT = 0.05
+FRAME_RATE = 60
+MAX_STEPS_PER_FRAME = 20000  # Coalescing cap at full speed
+TIMELINE_HEIGHT = 16
+TRACE_PATH = "solver_trace.sdt"
+ARROW_KEYS = {
+    pygame.K_UP: (-1, 0),
+    pygame.K_DOWN: (1, 0),
+    pygame.K_LEFT: (0, -1),
+    pygame.K_RIGHT: (0, 1),
+}
 
 # Colors
 WHITE = (255, 255, 255)
@@ -35,6 +47,9 @@ LIGHT_BLUE = (173, 216, 230)
 DARK_BLUE = (0, 0, 139)
 SLIDER_BG = (200, 200, 200)
 SLIDER_FG = (100, 100, 200)
+CONSTRAINT_RED = (255, 200, 200)
+CANDIDATE_GRAY = (120, 120, 120)
+HINT_GREEN = (200, 240, 200)
 
 # Set up display
 screen = pygame.display.set_mode((WIDTH, HEIGHT))
@@ -44,6 +59,65 @@ pygame.display.set_caption("Sudoku Solver Visualizer")
 font = pygame.font.SysFont("comicsans", 30)
 small_font = pygame.font.SysFont("comicsans", 20)
 title_font = pygame.font.SysFont("comicsans", 40)
+candidate_font = pygame.font.SysFont("comicsans", 14)
+
+GRID_WIDTH = GRID_SIZE * CELL_SIZE
+GRID_LEFT = (WIDTH - GRID_WIDTH) // 2
+GRID_BOTTOM = GRID_TOP_MARGIN + GRID_WIDTH
+# Everything below the grid's bottom border is redrawn as one region
+CONTROLS_RECT = pygame.Rect(0, GRID_BOTTOM + 2, WIDTH, HEIGHT - GRID_BOTTOM - 2)
+
+
+class GlyphCache:
+    """Text surfaces rendered once, so drawing a digit or label is one blit."""
+
+    def __init__(self):
+        self.digits = {
+            color: [None] + [font.render(str(d), True, color) for d in range(1, 10)]
+            for color in (BLACK, BLUE)
+        }
+        self.candidates = [None] + [
+            candidate_font.render(str(d), True, CANDIDATE_GRAY) for d in range(1, 10)
+        ]
+        self.text = {}
+
+    def render(self, text_font, text, color):
+        key = (text_font, text, color)
+        surface = self.text.get(key)
+        if surface is None:
+            surface = self.text[key] = text_font.render(text, True, color)
+        return surface
+
+
+def cell_rect(row, col):
+    return pygame.Rect(
+        GRID_LEFT + col * CELL_SIZE, GRID_TOP_MARGIN + row * CELL_SIZE, CELL_SIZE, CELL_SIZE
+    )
+
+
+def build_background():
+    """Static layer: title, grid background and all grid lines."""
+    background = pygame.Surface((WIDTH, HEIGHT))
+    background.fill(WHITE)
+
+    title = title_font.render("Sudoku Solver Visualizer", True, DARK_BLUE)
+    background.blit(title, (WIDTH // 2 - title.get_width() // 2, 10))
+
+    for row in range(GRID_SIZE):
+        for col in range(GRID_SIZE):
+            pygame.draw.rect(background, GRAY, cell_rect(row, col), 1)
+
+    for i in range(4):
+        line_width = 3 if i % 3 == 0 else 1
+        x = GRID_LEFT + i * CELL_SIZE * 3
+        y = GRID_TOP_MARGIN + i * CELL_SIZE * 3
+        pygame.draw.line(
+            background, BLACK, (x, GRID_TOP_MARGIN), (x, GRID_BOTTOM), line_width
+        )
+        pygame.draw.line(
+            background, BLACK, (GRID_LEFT, y), (GRID_LEFT + GRID_WIDTH, y), line_width
+        )
+    return background
 
 
 class SpeedSlider:
@@ -55,7 +129,7 @@ class SpeedSlider:
         self.max_x = x + width - self.handle_radius
         self.dragging = False
 
-    def draw(self):
+    def draw(self, glyphs):
         # Draw slider background
         pygame.draw.rect(screen, SLIDER_BG, self.rect, 0, 5)
         pygame.draw.rect(screen, BLACK, self.rect, 2, 5)
@@ -69,13 +143,13 @@ class SpeedSlider:
         )
 
         # Draw labels
-        fast_label = small_font.render("Slow", True, BLACK)
-        slow_label = small_font.render("Fast", True, BLACK)
+        fast_label = glyphs.render(small_font, "Slow", BLACK)
+        slow_label = glyphs.render(small_font, "Fast", BLACK)
         screen.blit(fast_label, (self.min_x - 20, self.rect.y - 25))
         screen.blit(slow_label, (self.max_x - 20, self.rect.y - 25))
 
         # Draw current value
-        value_label = small_font.render("Animation Speed", True, BLACK)
+        value_label = glyphs.render(small_font, "Animation Speed", BLACK)
         screen.blit(
             value_label,
             (self.rect.centerx - value_label.get_width() // 2, self.rect.y - 25),
@@ -102,19 +176,104 @@ class SpeedSlider:
         return value
 
 
+class TimelineBar:
+    """Scrub bar over a trace; reports the clicked or dragged fraction."""
+
+    def __init__(self, x, y, width, height):
+        self.rect = pygame.Rect(x, y, width, height)
+        self.dragging = False
+
+    def draw(self, fraction):
+        pygame.draw.rect(screen, SLIDER_BG, self.rect, 0, 5)
+        played = self.rect.copy()
+        played.width = int(self.rect.width * fraction)
+        if played.width:
+            pygame.draw.rect(screen, SLIDER_FG, played, 0, 5)
+        pygame.draw.rect(screen, BLACK, self.rect, 2, 5)
+
+    def fraction_at(self, x):
+        return max(0.0, min((x - self.rect.x) / self.rect.width, 1.0))
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEBUTTONDOWN and self.rect.collidepoint(event.pos):
+            self.dragging = True
+            return self.fraction_at(event.pos[0])
+        if event.type == pygame.MOUSEMOTION and self.dragging:
+            return self.fraction_at(event.pos[0])
+        if event.type == pygame.MOUSEBUTTONUP:
+            self.dragging = False
+        return None
+
+
+class SolveCancelled(Exception):
+    pass
+
+
+class CancellableTraceObserver(TraceObserver):
+    def __init__(self, trace, cancelled):
+        super().__init__(trace)
+        self.cancelled = cancelled
+
+    def record(self, kind, row, col, arg=0):
+        if self.cancelled.is_set():
+            raise SolveCancelled
+        self.trace.record(kind, row, col, arg)
+
+
+class SolverWorker(threading.Thread):
+    """Run a solver off the UI thread at full speed, recording a trace.
+
+    The renderer replays ``self.trace`` independently, so the solver is never
+    throttled by the animation. The registered solver itself is observed, so
+    what is shown is exactly what the benchmarks run.
+    """
+
+    def __init__(self, solver_name, grid):
+        super().__init__(daemon=True)
+        self.solver_name = solver_name
+        self.grid = copy.deepcopy(grid)
+        self.trace = SolverTrace(grid, solver_name)
+        self.cancelled = threading.Event()
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def run(self):
+        observer = CancellableTraceObserver(self.trace, self.cancelled)
+        try:
+            solved = solvers[self.solver_name](self.grid, observer=observer)
+            self.trace.finish(solved)
+        except SolveCancelled:
+            pass
+
+
 class SolverVisualizer:
-    def __init__(self):
+    def __init__(self, trace_path=TRACE_PATH):
         self.grid = None
         self.stopped = False
         self.original_grid = None
         self.solving = False
-        self.interrupt_solving = False
+        self.worker = None
+        self.trace = None
+        self.player = None
+        self.playing = False
+        self.trace_path = trace_path
+        self.step_credit = 0.0
         self.solved = False
         self.current_solver = None
         self.highlighted_cell = None
         self.highlighted_constraints = []
+        self.candidates = [[0] * GRID_SIZE for _ in range(GRID_SIZE)]
+        self.store = None
+        self.hint = None
+        self.note = ""
         self.solver_buttons = []
         self.generate_buttons = []
+        self.glyphs = GlyphCache()
+        self.background = build_background()
+        self.drawn_cells = None
+        self.drawn_controls = None
+        self.dirty_rects = []
         self.create_buttons()
         self.generate_new_puzzle(40)
 
@@ -130,24 +289,35 @@ class SolverVisualizer:
             slider_width,
             SLIDER_HEIGHT,
         )
-        self.animation_delay = ANIMATION_DELAY_DEFAULT
 
-    def delay_with_events(self, seconds):
-        end_time = time.time() + seconds
-        while time.time() < end_time:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    reset_rect, _ = self.reset_button
-                    if reset_rect.collidepoint(event.pos) and self.solving:
-                        self.interrupt_solving = True
-                        return
-                self.speed_slider.handle_event(event)
-
-            pygame.event.pump()
-            time.sleep(0.01)  # chunked delay
+        # Replay timeline and transport controls below the speed slider
+        timeline_y_pos = slider_y_pos + SLIDER_HEIGHT + 40
+        self.timeline = TimelineBar(
+            MARGIN, timeline_y_pos, WIDTH - 2 * MARGIN, TIMELINE_HEIGHT
+        )
+        playback = [
+            ("|<", self.rewind),
+            ("<", lambda: self.step_by(-1)),
+            ("Play", self.toggle_playing),
+            (">", lambda: self.step_by(1)),
+            (">|", self.seek_end),
+            ("Save", self.save_trace),
+            ("Load", self.load_trace),
+        ]
+        button_width = (WIDTH - 2 * MARGIN) // len(playback)
+        self.playback_buttons = [
+            (
+                pygame.Rect(
+                    MARGIN + i * button_width,
+                    timeline_y_pos + TIMELINE_HEIGHT + BUTTON_MARGIN,
+                    button_width - BUTTON_MARGIN,
+                    BUTTON_HEIGHT,
+                ),
+                label,
+                action,
+            )
+            for i, (label, action) in enumerate(playback)
+        ]
 
     def create_buttons(self):
         grid_bottom = GRID_TOP_MARGIN + GRID_SIZE * CELL_SIZE
@@ -177,103 +347,185 @@ class SolverVisualizer:
             )
             self.generate_buttons.append((button_rect, diff_name, empty_cells))
 
+        # Reset shares its row with the editing controls
+        edit_y_pos = difficulty_y_pos + BUTTON_HEIGHT + BUTTON_MARGIN
+        button_width = (WIDTH - 2 * MARGIN) // 3
         reset_button_rect = pygame.Rect(
-            MARGIN,
-            difficulty_y_pos + BUTTON_HEIGHT + BUTTON_MARGIN,
-            WIDTH - 2 * MARGIN,
-            BUTTON_HEIGHT,
+            MARGIN, edit_y_pos, button_width - BUTTON_MARGIN, BUTTON_HEIGHT
         )
         self.reset_button = (reset_button_rect, "Reset")
+        self.edit_buttons = [
+            (
+                pygame.Rect(
+                    MARGIN + i * button_width,
+                    edit_y_pos,
+                    button_width - BUTTON_MARGIN,
+                    BUTTON_HEIGHT,
+                ),
+                label,
+                action,
+            )
+            for i, (label, action) in enumerate(
+                [("Undo", self.undo_edit), ("Hint", self.show_hint)], start=1
+            )
+        ]
 
     def generate_new_puzzle(self, empty_cells):
-        self.grid = generate_partial_sudoku(empty_cells=empty_cells)
-        self.original_grid = copy.deepcopy(self.grid)
+        self.original_grid = generate_partial_sudoku(empty_cells=empty_cells)
+        self.trace = None
+        self.player = None
+        self.playing = False
         self.solving = False
-        self.solved = False
         self.stopped = False
+        self.start_editing()
+
+    def start_editing(self):
+        """Show the puzzle with live candidates, ready for digits to be entered."""
+        self.store = CandidateStore(self.original_grid)
+        self.grid = self.store.grid
+        self.candidates = self.store.candidates
+        self.solved = False
         self.highlighted_cell = None
         self.highlighted_constraints = []
+        self.hint = None
+        self.note = ""
+
+    def editing(self):
+        return self.trace is None and not self.solving
+
+    def after_edit(self, cell):
+        self.highlighted_cell = cell
+        self.highlighted_constraints = self.store.conflicts()
+        self.solved = self.store.is_solved()
+        self.hint = None
+        self.note = ""
+
+    def enter_digit(self, value):
+        if self.editing() and self.highlighted_cell is not None:
+            if self.store.set(*self.highlighted_cell, value):
+                self.after_edit(self.highlighted_cell)
+
+    def undo_edit(self):
+        if self.editing():
+            cell = self.store.undo()
+            if cell is not None:
+                self.after_edit(cell)
+
+    def show_hint(self):
+        if not self.editing():
+            return
+        hint = self.store.hint()
+        self.hint = hint
+        if hint is None:
+            self.note = "No single left: try a solver"
+        elif hint.is_dead_end:
+            self.note = f"Dead end at r{hint.row + 1}c{hint.col + 1}: {hint.rule}"
+        else:
+            self.note = f"r{hint.row + 1}c{hint.col + 1} = {hint.value}: {hint.rule}"
 
-    def draw_grid(self):
-        # Draw background
-        screen.fill(WHITE)
-
-        # Draw title
-        title = title_font.render("Sudoku Solver Visualizer", True, DARK_BLUE)
-        screen.blit(title, (WIDTH // 2 - title.get_width() // 2, 10))
-
-        # Draw grid background
-        grid_width = GRID_SIZE * CELL_SIZE
-        grid_rect = pygame.Rect(
-            (WIDTH - grid_width) // 2,  # Center the grid horizontally
-            GRID_TOP_MARGIN,
-            grid_width,
-            grid_width,
-        )
-        pygame.draw.rect(screen, LIGHT_GRAY, grid_rect)
-
-        # Draw cells
-        for row in range(GRID_SIZE):
-            for col in range(GRID_SIZE):
-                cell_rect = pygame.Rect(
-                    (WIDTH - grid_width) // 2 + col * CELL_SIZE,
-                    GRID_TOP_MARGIN + row * CELL_SIZE,
-                    CELL_SIZE,
-                    CELL_SIZE,
-                )
-
-                # Highlight current cell being processed
-                if self.highlighted_cell == (row, col):
-                    pygame.draw.rect(screen, HIGHLIGHT, cell_rect)
-                # Highlight constraint cells
-                elif (row, col) in self.highlighted_constraints:
-                    pygame.draw.rect(
-                        screen, (255, 200, 200), cell_rect
-                    )  # Light red for constraints
-                elif self.original_grid[row][col] == 0 and self.grid[row][col] != 0:
-                    # Highlight filled cells
-                    pygame.draw.rect(screen, LIGHT_BLUE, cell_rect)
-                else:
-                    pygame.draw.rect(screen, WHITE, cell_rect)
-
-                pygame.draw.rect(screen, GRAY, cell_rect, 1)
-
-                # Draw cell value
-                if self.grid[row][col] != 0:
-                    color = BLACK if self.original_grid[row][col] != 0 else BLUE
-                    value = font.render(str(self.grid[row][col]), True, color)
-                    screen.blit(
-                        value,
-                        (
-                            cell_rect.centerx - value.get_width() // 2,
-                            cell_rect.centery - value.get_height() // 2,
-                        ),
-                    )
+    def move_selection(self, d_row, d_col):
+        row, col = self.highlighted_cell or (0, 0)
+        self.highlighted_cell = ((row + d_row) % GRID_SIZE, (col + d_col) % GRID_SIZE)
 
-        for i in range(4):
-            line_width = 3 if i % 3 == 0 else 1
-            pygame.draw.line(
-                screen,
-                BLACK,
-                ((WIDTH - grid_width) // 2 + i * CELL_SIZE * 3, GRID_TOP_MARGIN),
-                (
-                    (WIDTH - grid_width) // 2 + i * CELL_SIZE * 3,
-                    GRID_TOP_MARGIN + grid_width,
-                ),
-                line_width,
-            )
-            pygame.draw.line(
-                screen,
-                BLACK,
-                ((WIDTH - grid_width) // 2, GRID_TOP_MARGIN + i * CELL_SIZE * 3),
+    def handle_key(self, event):
+        if not self.editing():
+            return
+        if event.key == pygame.K_z and event.mod & pygame.KMOD_CTRL:
+            self.undo_edit()
+        elif event.unicode and event.unicode in "123456789":
+            self.enter_digit(int(event.unicode))
+        elif event.key in (pygame.K_0, pygame.K_BACKSPACE, pygame.K_DELETE):
+            self.enter_digit(0)
+        elif event.key == pygame.K_u:
+            self.undo_edit()
+        elif event.key == pygame.K_h:
+            self.show_hint()
+        elif event.key in ARROW_KEYS:
+            self.move_selection(*ARROW_KEYS[event.key])
+
+    def cell_state(self, row, col):
+        # Highlight current cell being processed
+        if self.highlighted_cell == (row, col):
+            fill = HIGHLIGHT
+        elif self.hint is not None and (self.hint.row, self.hint.col) == (row, col):
+            fill = HINT_GREEN
+        # Highlight constraint cells
+        elif (row, col) in self.highlighted_constraints:
+            fill = CONSTRAINT_RED
+        elif self.original_grid[row][col] == 0 and self.grid[row][col] != 0:
+            # Highlight filled cells
+            fill = LIGHT_BLUE
+        else:
+            fill = WHITE
+        value = self.grid[row][col]
+        given = self.original_grid[row][col] != 0
+        candidates = self.candidates[row][col] if value == 0 else 0
+        return fill, value, given, candidates
+
+    def draw_cell(self, row, col, state):
+        fill, value, given, candidates = state
+        rect = cell_rect(row, col)
+        screen.blit(self.background, rect, rect)
+        # Inset so the grid lines from the background stay visible
+        pygame.draw.rect(screen, fill, rect.inflate(-4, -4))
+
+        if value != 0:
+            glyph = self.glyphs.digits[BLACK if given else BLUE][value]
+            screen.blit(
+                glyph,
                 (
-                    (WIDTH - grid_width) // 2 + grid_width,
-                    GRID_TOP_MARGIN + i * CELL_SIZE * 3,
+                    rect.centerx - glyph.get_width() // 2,
+                    rect.centery - glyph.get_height() // 2,
                 ),
-                line_width,
             )
+        elif candidates:
+            third = CELL_SIZE // 3
+            for digit in range(1, 10):
+                if candidates >> digit & 1:
+                    glyph = self.glyphs.candidates[digit]
+                    x = rect.x + (digit - 1) % 3 * third + third // 2
+                    y = rect.y + (digit - 1) // 3 * third + third // 2
+                    screen.blit(
+                        glyph,
+                        (x - glyph.get_width() // 2, y - glyph.get_height() // 2),
+                    )
+        return rect
+
+    def draw_grid(self):
+        """Redraw only the cells whose state changed; returns the dirty rects."""
+        dirty = []
+        for row in range(GRID_SIZE):
+            drawn_row = self.drawn_cells[row]
+            for col in range(GRID_SIZE):
+                state = self.cell_state(row, col)
+                if drawn_row[col] != state:
+                    drawn_row[col] = state
+                    dirty.append(self.draw_cell(row, col, state))
+        return dirty
+
+    def controls_state(self):
+        return (
+            self.solving,
+            self.solved,
+            self.stopped,
+            self.playing,
+            self.current_solver,
+            self.editing(),
+            self.note,
+            self.speed_slider.handle_x,
+            self.player.position if self.player else None,
+            len(self.trace) if self.trace else None,
+        )
 
     def draw_buttons(self):
+        """Redraw the controls region if anything in it changed."""
+        state = self.controls_state()
+        if state == self.drawn_controls:
+            return []
+        self.drawn_controls = state
+        screen.blit(self.background, CONTROLS_RECT, CONTROLS_RECT)
+        glyphs = self.glyphs
+
         # Draw solver buttons
         for rect, name in self.solver_buttons:
             color = (
@@ -286,7 +538,7 @@ class SolverVisualizer:
             if "Constraint Propagation" in name:
                 short_name = name.replace("Constraint Propagation", "CP")
 
-            text = small_font.render(short_name, True, BLACK)
+            text = glyphs.render(small_font, short_name, BLACK)
             screen.blit(
                 text,
                 (
@@ -300,7 +552,7 @@ class SolverVisualizer:
             pygame.draw.rect(screen, LIGHT_BLUE, rect, 0, 5)
             pygame.draw.rect(screen, BLACK, rect, 2, 5)
 
-            text = small_font.render(name, True, BLACK)
+            text = glyphs.render(small_font, name, BLACK)
             screen.blit(
                 text,
                 (
@@ -314,7 +566,7 @@ class SolverVisualizer:
         pygame.draw.rect(screen, RED if self.solving else GRAY, reset_rect, 0, 5)
         pygame.draw.rect(screen, BLACK, reset_rect, 2, 5)
 
-        text = small_font.render(label, True, WHITE)
+        text = glyphs.render(small_font, label, WHITE)
         screen.blit(
             text,
             (
@@ -323,8 +575,21 @@ class SolverVisualizer:
             ),
         )
 
+        for rect, name, _ in self.edit_buttons:
+            color = LIGHT_BLUE if self.editing() else LIGHT_GRAY
+            pygame.draw.rect(screen, color, rect, 0, 5)
+            pygame.draw.rect(screen, BLACK, rect, 2, 5)
+
+            text = glyphs.render(small_font, name, BLACK)
+            screen.blit(
+                text,
+                (
+                    rect.centerx - text.get_width() // 2,
+                    rect.centery - text.get_height() // 2,
+                ),
+            )
+
         # Draw status
-        grid_bottom = GRID_TOP_MARGIN + GRID_SIZE * CELL_SIZE
         status_text = (
             "Solved!"
             if self.solved
@@ -332,40 +597,90 @@ class SolverVisualizer:
             if self.stopped
             else "Solving..."
             if self.solving
-            else "Select a solver"
+            else "Replaying..."
+            if self.playing
+            else "Paused"
+            if self.player and not self.player.at_end()
+            else self.note
+            if self.note
+            else "Enter digits or select a solver"
         )
 
         status_color = GREEN if self.solved else RED if self.stopped else BLUE
-        status = font.render(status_text, True, status_color)
+        status_font = small_font if self.note or self.editing() else font
+        status = glyphs.render(status_font, status_text, status_color)
 
-        status_y_pos = grid_bottom + 10
+        status_y_pos = GRID_BOTTOM + 10
         screen.blit(status, (WIDTH // 2 - status.get_width() // 2, status_y_pos))
 
-        self.speed_slider.draw()
+        self.speed_slider.draw(glyphs)
+        self.draw_timeline()
+        return [CONTROLS_RECT]
+
+    def draw_timeline(self):
+        glyphs = self.glyphs
+        position = self.player.position if self.player else 0
+        total = len(self.trace) if self.trace else 0
+        self.timeline.draw(position / total if total else 0.0)
+
+        label = glyphs.render(small_font, f"Step {position:,} / {total:,}", BLACK)
+        screen.blit(
+            label,
+            (
+                self.timeline.rect.centerx - label.get_width() // 2,
+                self.timeline.rect.y - 25,
+            ),
+        )
+
+        for rect, name, _ in self.playback_buttons:
+            if name == "Play" and self.playing:
+                name = "Pause"
+            enabled = self.trace is not None or name == "Load"
+            pygame.draw.rect(screen, LIGHT_BLUE if enabled else LIGHT_GRAY, rect, 0, 5)
+            pygame.draw.rect(screen, BLACK, rect, 2, 5)
+
+            text = glyphs.render(small_font, name, BLACK)
+            screen.blit(
+                text,
+                (
+                    rect.centerx - text.get_width() // 2,
+                    rect.centery - text.get_height() // 2,
+                ),
+            )
 
     def handle_click(self, pos):
         reset_rect, _ = self.reset_button
         if reset_rect.collidepoint(pos):
             if self.solving:
-                self.interrupt_solving = True
+                self.stop_solving()
                 self.stopped = True
             else:
-                self.grid = copy.deepcopy(self.original_grid)
+                self.trace = None
+                self.player = None
                 self.stopped = False
+                self.start_editing()
 
+            self.playing = False
             self.solving = False
             self.solved = False
             return
 
+        for rect, _, action in self.edit_buttons:
+            if rect.collidepoint(pos):
+                action()
+                return
+
+        for rect, _, action in self.playback_buttons:
+            if rect.collidepoint(pos):
+                action()
+                return
+
         if self.solving:
             return
 
         for rect, name in self.solver_buttons:
             if rect.collidepoint(pos):
-                self.current_solver = name
-                self.solving = True
-                self.solved = False
-                self.grid = copy.deepcopy(self.original_grid)
+                self.start_solving(name)
                 return
 
         for rect, _, empty_cells in self.generate_buttons:
@@ -373,316 +688,184 @@ class SolverVisualizer:
                 self.generate_new_puzzle(empty_cells)
                 return
 
-    class VisualizationStats:
-        def __init__(self, visualizer):
-            self.visualizer = visualizer
-            self.recursive_calls = 0
-            self.constraint_checks = 0
-            self.current_depth = 0
-            self.animation_delay = ANIMATION_DELAY_DEFAULT
-            self.max_depth = 0
-
-        def enter_call(self):
-            self.recursive_calls += 1
-            self.current_depth += 1
-            self.max_depth = max(self.max_depth, self.current_depth)
+        if self.editing():
+            for row in range(GRID_SIZE):
+                for col in range(GRID_SIZE):
+                    if cell_rect(row, col).collidepoint(pos):
+                        self.highlighted_cell = (row, col)
+                        return
 
-            self.visualizer.draw()
-            pygame.display.update()
-            self.delay_with_events(self.animation_delay)
+    def start_solving(self, name):
+        """Solve the board as edited, digits entered by hand included."""
+        if self.store.clashes:
+            # Back to the edited board, with the clashing entries in red
+            self.trace = None
+            self.player = None
+            self.playing = False
+            self.grid = self.store.grid
+            self.candidates = self.store.candidates
+            self.highlighted_cell = None
+            self.highlighted_constraints = self.store.conflicts()
+            self.note = "Entered digits clash (red): fix them before solving"
+            return
+        self.current_solver = name
+        self.solving = True
+        self.solved = False
+        self.stopped = False
+        self.note = ""
+        self.step_credit = 0.0
+        self.worker = SolverWorker(name, self.store.grid)
+        self.play(self.worker.trace)
+        self.worker.start()
+
+    def stop_solving(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.solving = False
+        self.playing = False
+        self.highlighted_cell = None
+        self.highlighted_constraints = []
 
-        def exit_call(self):
-            self.current_depth -= 1
+    def play(self, trace):
+        self.trace = trace
+        self.player = TracePlayer(trace)
+        self.playing = True
+        self.show_state()
+
+    def show_state(self):
+        """Point the renderer at the player's state."""
+        state = self.player.state
+        self.grid = state.grid
+        self.candidates = state.candidates
+        caught_up = self.player.position >= len(self.trace)
+        if self.player.at_end() or (caught_up and not self.solving):
+            self.playing = False
+            self.solved = self.trace.solved
+            self.highlighted_cell = None
+            self.highlighted_constraints = []
+            if self.trace.finished and not self.solved:
+                self.note = (
+                    "No solution: the entered digits rule it out"
+                    if self.store.filled > len(self.store.givens)
+                    else "No solution"
+                )
+        else:
+            self.solved = False
+            self.highlighted_cell = state.selected
+            self.highlighted_constraints = state.conflicts
 
-        def check_constraint(self):
-            self.constraint_checks += 1
+    def seek(self, position):
+        if self.player is not None:
+            self.player.seek(position)
+            self.show_state()
 
-        def delay_with_events(self, seconds):
-            return self.visualizer.delay_with_events(seconds)
+    def step_by(self, delta):
+        if self.player is not None:
+            self.playing = False
+            self.seek(self.player.position + delta)
 
-    def solve_with_animation(self):
-        self.interrupt_solving = False
-        self.stopped = False
-        self.animation_delay = self.speed_slider.get_value()
-        solver_func = solvers[self.current_solver]
-        grid_copy = copy.deepcopy(self.grid)
+    def rewind(self):
+        self.seek(0)
 
-        import algos
+    def seek_end(self):
+        if self.trace is not None:
+            self.seek(len(self.trace))
 
-        original_find_empty = algos.find_empty_cell
-        original_is_valid = algos.is_valid
+    def toggle_playing(self):
+        if self.player is None:
+            return
+        if self.player.at_end():
+            self.seek(0)
+        self.playing = not self.playing
+        self.step_credit = 0.0
 
-        def find_empty_with_visual(grid):
-            if self.interrupt_solving:
-                return None
-            for row in range(9):
-                for col in range(9):
-                    if grid[row][col] == 0:
-                        self.highlighted_cell = (row, col)
-                        self.grid = copy.deepcopy(grid)
-                        self.draw()
-                        pygame.display.update()
-                        self.delay_with_events(self.animation_delay)
-                        # Check if we should interrupt after delay
-                        if self.interrupt_solving:
-                            return None
-                        return row, col
-            return None
-
-        # Patch for constraint checking visualization
-        def is_valid_with_visual(grid, row, col, num, stats=None):
-            self.highlighted_cell = (row, col)
-            self.highlighted_constraints = []
+    def save_trace(self):
+        if self.trace is None:
+            return
+        self.trace.save(self.trace_path)
+        print(f"Trace of {len(self.trace):,} steps saved to {self.trace_path}")
 
-            for i in range(9):
-                if grid[row][i] == num:
-                    self.highlighted_constraints.append((row, i))
-                    self.draw()
-                    pygame.display.update()
-                    self.delay_with_events(self.animation_delay)
-                    return False
-                if grid[i][col] == num:
-                    self.highlighted_constraints.append((i, col))
-                    self.draw()
-                    pygame.display.update()
-                    self.delay_with_events(self.animation_delay)
-                    return False
-
-            # Check 3x3 box
-            start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-            for r in range(start_row, start_row + 3):
-                for c in range(start_col, start_col + 3):
-                    if grid[r][c] == num:
-                        self.highlighted_constraints.append((r, c))
-                        self.draw()
-                        pygame.display.update()
-                        self.delay_with_events(self.animation_delay)
-                        return False
-
-            # Valid placement
-            self.draw()
-            pygame.display.update()
-            self.delay_with_events(
-                self.animation_delay * 0.5
-            )  # Shorter delay for valid
-            self.highlighted_constraints = []
-            return True
-
-        # Apply common patches
-        algos.find_empty_cell = find_empty_with_visual
-        algos.is_valid = is_valid_with_visual
-
-        stats = self.VisualizationStats(self)
-
-        if "Constraint Propagation" in self.current_solver:
-            # Create a custom version of solve_constraint_propagation with visualization hooks
-            def solve_cp_with_visualization(grid, stats, use_mrv=False):
-                def initialize_domains(grid):
-                    domains = {
-                        (r, c): set(range(1, 10)) for r in range(9) for c in range(9)
-                    }
-                    for r in range(9):
-                        for c in range(9):
-                            val = grid[r][c]
-                            if val != 0:
-                                if not assign(domains, (r, c), val):
-                                    return None
-                    return domains
-
-                def assign(domains, cell, value):
-                    """Assign a value and propagate constraints. Return False if contradiction."""
-                    self.highlighted_cell = cell
-                    self.draw()
-                    pygame.display.update()
-                    self.delay_with_events(self.animation_delay)
-                    if self.interrupt_solving:
-                        return False
-
-                    other_vals = domains[cell] - {value}
-                    for val in other_vals:
-                        if not eliminate(domains, cell, val):
-                            return False
-
-                    update_grid_from_domains(domains)
-                    return True
-
-                def eliminate(domains, cell, value):
-                    """Eliminate value from cell's domain, propagate if needed."""
-                    self.highlighted_cell = cell
-                    self.highlighted_constraints = []
-
-                    if value not in domains[cell]:
-                        return True  # Already gone
-
-                    domains[cell].remove(value)
-                    if stats:
-                        stats.check_constraint()
-
-                    # Show peers when eliminating values
-                    for peer in algos.PEERS[cell]:
-                        if value in domains[peer]:
-                            self.highlighted_constraints.append(peer)
-
-                    self.draw()
-                    pygame.display.update()
-                    self.delay_with_events(
-                        self.animation_delay
-                    )  # Shorter delay for eliminate
-
-                    if self.interrupt_solving:
-                        return False
-
-                    if len(domains[cell]) == 0:
-                        return False
-
-                    elif len(domains[cell]) == 1:
-                        v = next(iter(domains[cell]))
-                        for peer in algos.PEERS[cell]:
-                            if not eliminate(domains, peer, v):
-                                return False
-
-                    for unit in get_units(cell):
-                        places = [c for c in unit if value in domains[c]]
-                        if len(places) == 0:
-                            return False
-                        elif len(places) == 1:
-                            if not assign(domains, places[0], value):
-                                return False
-
-                    # Update the visual grid based on domains
-                    update_grid_from_domains(domains)
-                    return True
-
-                def get_units(cell):
-                    r, c = cell
-                    row_unit = [(r, j) for j in range(9)]
-                    col_unit = [(i, c) for i in range(9)]
-                    block_unit = [
-                        (i, j)
-                        for i in range(r // 3 * 3, r // 3 * 3 + 3)
-                        for j in range(c // 3 * 3, c // 3 * 3 + 3)
-                    ]
-                    return [row_unit, col_unit, block_unit]
-
-                def update_grid_from_domains(domains):
-                    grid_view = [[0 for _ in range(9)] for _ in range(9)]
-                    for r in range(9):
-                        for c in range(9):
-                            # If cell has only one possible value, show it
-                            if len(domains[(r, c)]) == 1:
-                                grid_view[r][c] = next(iter(domains[(r, c)]))
-                            elif self.original_grid[r][c] != 0:
-                                grid_view[r][c] = self.original_grid[r][c]
-
-                    self.grid = grid_view
-
-                def backtrack(domains, use_mrv=False):
-                    if stats:
-                        stats.enter_call()
-
-                    # Visualization for backtrack
-                    self.draw()
-                    pygame.display.update()
-                    self.delay_with_events(self.animation_delay)
-
-                    if self.interrupt_solving:
-                        if stats:
-                            stats.exit_call()
-                        return None
-
-                    # Finished
-                    if all(len(domains[cell]) == 1 for cell in domains):
-                        if stats:
-                            stats.exit_call()
-                        return domains
-
-                    unassigned = [c for c in domains if len(domains[c]) > 1]
-                    if use_mrv:
-                        cell = min(unassigned, key=lambda c: len(domains[c]))
-                    else:
-                        cell = random.choice(unassigned)
-
-                    # Highlight the cell being explored
-                    self.highlighted_cell = cell
-                    self.draw()
-                    pygame.display.update()
-                    self.delay_with_events(self.animation_delay)
-
-                    for val in sorted(domains[cell]):
-                        new_domains = {c: set(domains[c]) for c in domains}
-                        if assign(new_domains, cell, val):
-                            result = backtrack(new_domains, use_mrv)
-                            if result:
-                                if stats:
-                                    stats.exit_call()
-                                return result
-
-                    if stats:
-                        stats.exit_call()
-                    return None
-
-                # Start the CP solver with visualization
-                domains = initialize_domains(grid)
-                if not domains:
-                    return False
-
-                result = backtrack(domains, use_mrv)
-                if not result:
-                    return False
-
-                # Fill grid with solution
-                for (r, c), valset in result.items():
-                    grid[r][c] = next(iter(valset))
-
-                return True
-
-            use_mrv = "MRV" in self.current_solver
-            solved = solve_cp_with_visualization(grid_copy, stats, use_mrv)
+    def load_trace(self):
+        if self.solving or not os.path.exists(self.trace_path):
+            return
+        trace = SolverTrace.load(self.trace_path)
+        self.original_grid = copy.deepcopy(trace.puzzle)
+        self.store = CandidateStore(self.original_grid)
+        self.current_solver = trace.solver_name
+        self.stopped = False
+        self.play(trace)
+        self.playing = False
+        print(f"Loaded trace of {len(trace):,} steps from {self.trace_path}")
+
+    def advance_animation(self, elapsed):
+        """Replay the recorded steps due this frame.
+
+        Each step is shown for the slider's delay; at full speed up to
+        ``MAX_STEPS_PER_FRAME`` steps are coalesced into the current frame.
+        """
+        delay = self.speed_slider.get_value()
+        if delay <= ANIMATION_DELAY_MIN:
+            budget = MAX_STEPS_PER_FRAME
         else:
-            solved = solver_func(grid_copy, stats)
-
-        algos.find_empty_cell = original_find_empty
-        algos.is_valid = original_is_valid
+            self.step_credit += elapsed / delay
+            budget = int(self.step_credit)
+            self.step_credit -= budget
 
-        if solved:
-            self.grid = grid_copy
-            self.solved = True
-        self.solving = False
-        self.highlighted_cell = None
-        self.highlighted_constraints = []
-        if self.interrupt_solving:
-            self.solving = False
-            self.highlighted_cell = None
-            self.highlighted_constraints = []
-            self.interrupt_solving = False
-            return
+        if self.player.advance(budget) < budget:
+            # Caught up with the recorder
+            self.step_credit = 0.0
+        self.show_state()
 
     def draw(self):
-        self.draw_grid()
-        self.draw_buttons()
+        if self.drawn_cells is None:
+            # First frame: lay down the static background everywhere
+            screen.blit(self.background, (0, 0))
+            self.drawn_cells = [[None] * GRID_SIZE for _ in range(GRID_SIZE)]
+            self.drawn_controls = None
+            self.draw_grid()
+            self.draw_buttons()
+            self.dirty_rects = [screen.get_rect()]
+        else:
+            self.dirty_rects = self.draw_grid() + self.draw_buttons()
 
     def run(self):
         clock = pygame.time.Clock()
+        elapsed = 0
 
         while True:
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
+                    self.stop_solving()
                     pygame.quit()
                     sys.exit()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
                     self.handle_click(event.pos)
+                elif event.type == pygame.KEYDOWN:
+                    self.handle_key(event)
 
                 # Handle slider events
                 self.speed_slider.handle_event(event)
+                fraction = self.timeline.handle_event(event)
+                if fraction is not None and self.trace is not None:
+                    self.playing = False
+                    self.seek(round(fraction * len(self.trace)))
+
+            if self.worker is not None and not self.worker.is_alive():
+                self.worker = None
+                self.solving = False
 
-            if self.solving and not self.solved:
-                self.solve_with_animation()
+            if self.playing:
+                self.advance_animation(elapsed / 1000)
 
             self.draw()
-            pygame.display.update()
-            clock.tick(30)
+            if self.dirty_rects:
+                pygame.display.update(self.dirty_rects)
+            elapsed = clock.tick(FRAME_RATE)
 
 
 if __name__ == "__main__":
-    visualizer = SolverVisualizer()
+    visualizer = SolverVisualizer(sys.argv[1] if len(sys.argv) > 1 else TRACE_PATH)
+    if len(sys.argv) > 1:
+        visualizer.load_trace()
     visualizer.run()
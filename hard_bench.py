@@ -0,0 +1,290 @@
+import csv
+import inspect
+import time
+from multiprocessing import Pipe, Process
+
+from aggregates import QUANTILES
+from registry import solvers
+from solve import parse_line
+
+HARD_BUDGET_S = 5.0  # Per puzzle and run; a solve still going is cut off here
+
+# Minimal puzzles from Gordon Royle's collection of 17-clue sudokus
+SEVENTEEN_CLUE = [
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "000000010400000000020000000000050604008000300001090000300400200050100000000807000",
+    "000000012000035000000600070700000300000400800100000000000120000080000040050000600",
+    "000000012003600000000007000410020000000500300700000600280000040000300500000000000",
+    "000000012008030000000000040120500000000004700060000000507000300000620000000100000",
+    "000000012040050000000009000070600400000100000000000050000087500601000300200000000",
+    "000000012050400000000000030700600400001000000000080000920000800000510700000003000",
+    "000000013000030080070000000000206000030000900000010000600500204000400700100000000",
+]
+
+# Published puzzles that rate at the top of the human and solver difficulty scales
+TOP_DIFFICULTY = {
+    "ai_escargot": (
+        "100007090030020008009600500005300900010080002600004000300000010040000007007000300"
+    ),
+    "everest": (
+        "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+    ),
+    "platinum_blonde": (
+        "000000012000000003002300400001800005060070800000009000008500000900040500470006000"
+    ),
+    "golden_nugget": (
+        "000000039000001005003050800008090006070002000100400000009080050020000600400700000"
+    ),
+    "easter_monster": (
+        "100000002090400050006000700050903000000070000000850040700000600030009080002000001"
+    ),
+}
+
+# Empty first row whose solution is 987654321, published against brute force
+BRUTE_FORCE_KILLER = (
+    "000000000000003085001020000000507000004000100090000000500000073002010000000040009"
+)
+
+HARD_FIELDS = [
+    "solver",
+    "corpus",
+    "puzzles",
+    "solved",
+    "timeouts",
+    "p50_ms",
+    "p90_ms",
+    "p99_ms",
+    "max_ms",
+    "worst_puzzle",
+]
+
+
+def _grid(line):
+    return parse_line(line.encode())
+
+
+def anti_row_major(puzzle):
+    """An equivalent puzzle built to make the Backtracking Solver's order worst.
+
+    Bands, and the rows within each band, are reordered emptiest first, so
+    ``find_empty_cell`` meets the least constrained cells first. Digits are
+    then relabelled so the solution values met first become 9, 8, 7, ...;
+    ascending value order has to exhaust every smaller digit in those cells.
+    """
+    from algos import solver_mrv
+
+    def clues(rows):
+        return sum(v != 0 for row in rows for v in row)
+
+    bands = sorted(
+        (sorted(puzzle[b : b + 3], key=lambda row: clues([row])) for b in (0, 3, 6)),
+        key=clues,
+    )
+    grid = [list(row) for band in bands for row in band]
+    solution = [list(row) for row in grid]
+    if not solver_mrv(solution):
+        raise ValueError("puzzle has no solution")
+
+    relabel = {}
+    for r in range(9):
+        for c in range(9):
+            digit = solution[r][c]
+            if not grid[r][c] and digit not in relabel:
+                relabel[digit] = 9 - len(relabel)
+    for digit in range(1, 10):
+        if digit not in relabel:
+            relabel[digit] = 9 - len(relabel)
+    return [[relabel[v] if v else 0 for v in row] for row in grid]
+
+
+def hard_corpus():
+    """The curated suite as ``(corpus, puzzle_id, grid)`` triples."""
+    corpus = [
+        ("17-clue", f"royle17_{i}", _grid(line))
+        for i, line in enumerate(SEVENTEEN_CLUE)
+    ]
+    corpus += [("top", name, _grid(line)) for name, line in TOP_DIFFICULTY.items()]
+    corpus.append(
+        ("anti-row-major", "brute_force_killer", _grid(BRUTE_FORCE_KILLER))
+    )
+    corpus += [
+        ("anti-row-major", f"royle17_{i}_anti", anti_row_major(_grid(line)))
+        for i, line in enumerate(SEVENTEEN_CLUE)
+    ]
+    return corpus
+
+
+def _solve_loop(conn):
+    """Worker process: time registered solvers on jobs from ``conn``."""
+    while True:
+        job = conn.recv()
+        if job is None:
+            return
+        name, puzzle, seed = job
+        solver = solvers[name]
+        seeded = "seed" in inspect.signature(solver).parameters
+        kwargs = {"seed": seed} if seeded else {}
+        grid = [list(row) for row in puzzle]
+        start = time.perf_counter()
+        solved = solver(grid, **kwargs)
+        elapsed_ms = 1000 * (time.perf_counter() - start)
+        conn.send(("solved" if solved else "unsolvable", elapsed_ms))
+
+
+class DeadlineWorker:
+    """Runs registered solvers in a child process that is killed at a deadline.
+
+    The solver itself is timed, not a stepping form of it, so any registry
+    entry can be measured; a solve still going after ``budget_s`` is cut
+    off by terminating the child, and a fresh one is started for the next
+    puzzle.
+    """
+
+    def __init__(self):
+        self.process = None
+
+    def _start(self):
+        self.conn, child = Pipe()
+        self.process = Process(target=_solve_loop, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    def solve(self, name, puzzle, budget_s, seed=None):
+        """Return ``(status, elapsed_ms)``; status ``budget_exceeded`` on a timeout."""
+        if self.process is None:
+            self._start()
+        self.conn.send((name, puzzle, seed))
+        if self.conn.poll(budget_s):
+            status, elapsed_ms = self.conn.recv()
+            if elapsed_ms <= 1000 * budget_s:
+                return status, elapsed_ms
+        else:
+            self.process.terminate()
+            self.process.join()
+            self.conn.close()
+            self.process = None
+        return "budget_exceeded", 1000 * budget_s
+
+    def close(self):
+        if self.process is not None:
+            self.conn.send(None)
+            self.process.join()
+            self.conn.close()
+            self.process = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def warm_up_grid(puzzle):
+    """``puzzle`` solved except for its first row: trivial for every solver."""
+    from algos import solver_mrv
+
+    grid = [list(row) for row in puzzle]
+    solver_mrv(grid)
+    grid[0] = [0] * 9
+    return grid
+
+
+def _quantile(values, q):
+    """Linearly interpolated quantile of sorted ``values``, as pandas computes it."""
+    rank = q * (len(values) - 1)
+    lower = values[int(rank)]
+    upper = values[min(int(rank) + 1, len(values) - 1)]
+    return lower + (rank - int(rank)) * (upper - lower)
+
+
+def _summary(solver, corpus, puzzles, solved, timeouts, latencies, worst):
+    latencies = sorted(latencies)
+    result = {
+        "solver": solver,
+        "corpus": corpus,
+        "puzzles": puzzles,
+        "solved": solved,
+        "timeouts": timeouts,
+        "max_ms": worst[0],
+        "worst_puzzle": worst[1],
+    }
+    for q in QUANTILES:
+        result[f"p{round(q * 100)}_ms"] = _quantile(latencies, q)
+    return result
+
+
+def benchmark_hard(corpus, names=None, budget_s=HARD_BUDGET_S, runs=1, seed=0):
+    """Run every solver on every puzzle of ``corpus`` under a time budget.
+
+    Each registered solver runs in a ``DeadlineWorker``. A run that hits
+    ``budget_s`` counts as a timeout and enters the latency figures at the
+    budget, so p99 and max are lower bounds once any puzzle times out.
+    Solvers that take a ``seed`` get ``seed + run``, so randomized results
+    can be reproduced. Quantiles are exact: the suite is small, and its
+    tail is the point. Returns one row per solver and corpus, plus an
+    ``all`` row per solver.
+    """
+    groups = list(dict.fromkeys(group for group, _, _ in corpus))
+    warm_up = warm_up_grid(corpus[0][2])
+    results = []
+    with DeadlineWorker() as worker:
+        for name in names or list(solvers):
+            worker.solve(name, warm_up, budget_s, seed)  # Load tables and caches
+            all_latencies = []
+            for group in groups:
+                puzzles = solved = timeouts = 0
+                latencies = []
+                worst = (0.0, None)
+                items = [item for item in corpus if item[0] == group]
+                for _, puzzle_id, puzzle in items:
+                    puzzles += 1
+                    for run in range(runs):
+                        status, elapsed_ms = worker.solve(
+                            name, puzzle, budget_s, seed + run
+                        )
+                        if status == "solved":
+                            solved += 1
+                        elif status == "budget_exceeded":
+                            timeouts += 1
+                        latencies.append(elapsed_ms)
+                        if elapsed_ms > worst[0]:
+                            worst = (elapsed_ms, puzzle_id)  # First of any tie
+                results.append(
+                    _summary(name, group, puzzles, solved, timeouts, latencies, worst)
+                )
+                all_latencies += latencies
+
+            rows = results[-len(groups) :]
+            results.append(
+                _summary(
+                    name,
+                    "all",
+                    sum(row["puzzles"] for row in rows),
+                    sum(row["solved"] for row in rows),
+                    sum(row["timeouts"] for row in rows),
+                    all_latencies,
+                    max(
+                        ((row["max_ms"], row["worst_puzzle"]) for row in rows),
+                        key=lambda worst: worst[0],
+                    ),
+                )
+            )
+
+            for result in results[-len(groups) - 1 :]:
+                print(
+                    f"{name} [{result['corpus']}]: "
+                    f"{result['solved']}/{result['puzzles'] * runs} solved, "
+                    f"{result['timeouts']} over budget | "
+                    f"p50 {result['p50_ms']:.1f}ms | p99 {result['p99_ms']:.1f}ms | "
+                    f"max {result['max_ms']:.1f}ms ({result['worst_puzzle']})"
+                )
+    return results
+
+
+def write_hard_csv(results, filename="hard_results.csv"):
+    with open(filename, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=HARD_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print(f"Hard suite results written to {filename}")
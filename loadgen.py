@@ -0,0 +1,117 @@
+import argparse
+import json
+import threading
+import time
+import urllib.request
+
+from aggregates import QUANTILES, QuantileSketch
+from utils import generate_corpus
+
+
+def post_json(url, body):
+    request = urllib.request.Request(
+        url, data=json.dumps(body).encode(), headers={"Content-Type": "application/json"}
+    )
+    return urllib.request.urlopen(request)
+
+
+def run_load(url, corpus, requests, concurrency, batch, options):
+    """Send ``requests`` solve requests from ``concurrency`` client threads.
+
+    Returns ``(wall_time, latency_sketch, statuses)``; each request carries
+    ``batch`` puzzles (a batched, streamed request when ``batch > 1``).
+    """
+    latencies = QuantileSketch()
+    statuses = {}
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        while True:
+            with lock:
+                index = next(counter, None)
+            if index is None:
+                return
+            start = index * batch
+            puzzles = [corpus[(start + i) % len(corpus)] for i in range(batch)]
+            body = dict(options)
+            if batch == 1:
+                body["puzzle"] = puzzles[0]
+            else:
+                body["puzzles"] = puzzles
+
+            sent = time.perf_counter()
+            try:
+                with post_json(f"{url}/solve", body) as response:
+                    if batch == 1:
+                        results = [json.load(response)]
+                    else:
+                        results = [json.loads(line) for line in response]
+            except OSError as exc:
+                results = [{"status": f"error: {exc}"}]
+            latency_ms = 1000 * (time.perf_counter() - sent)
+
+            with lock:
+                latencies.add(latency_ms)
+                for result in results:
+                    statuses[result["status"]] = statuses.get(result["status"], 0) + 1
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, latencies, statuses
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the solve service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8080")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch", type=int, default=1, help="puzzles per request")
+    parser.add_argument("--solver", help="solver name (server default if unset)")
+    parser.add_argument("--budget-ms", type=float)
+    parser.add_argument("--corpus-size", type=int, default=200)
+    parser.add_argument("--empty-cells", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    args = parser.parse_args()
+
+    corpus = generate_corpus(args.corpus_size, empty_cells=args.empty_cells, seed=args.seed)
+    options = {}
+    if args.solver:
+        options["solver"] = args.solver
+    if args.budget_ms:
+        options["budget_ms"] = args.budget_ms
+
+    wall_time, latencies, statuses = run_load(
+        args.url, corpus, args.requests, args.concurrency, args.batch, options
+    )
+    puzzles = sum(statuses.values())
+    print(
+        f"{args.requests} requests x {args.batch} puzzles | "
+        f"concurrency {args.concurrency} | {wall_time:.2f}s"
+    )
+    print(
+        f"{args.requests / wall_time:.1f} requests/s | "
+        f"{puzzles / wall_time:.1f} puzzles/s | statuses {statuses}"
+    )
+    print(
+        "Request latency: "
+        + " | ".join(
+            f"p{round(q * 100)} {latencies.quantile(q):.1f}ms" for q in QUANTILES
+        )
+    )
+
+    with urllib.request.urlopen(f"{args.url}/metrics") as response:
+        metrics = json.load(response)
+    print(
+        f"Server: {metrics['batches_total']} batches | "
+        f"mean batch {metrics['mean_batch_size']} | "
+        f"queue depth {metrics['queue_depth']} | in flight {metrics['in_flight']}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,114 +1,218 @@
-from utils import generate_partial_sudoku, print_board, isValidSudoku
+from utils import generate_corpus, generate_partial_sudoku, print_board, isValidSudoku
+import argparse
 import os
 import csv
-from algos import solvers
+from registry import solvers
+from solver_stats import RULES, SolverStats
 import copy
 import time
 import tracemalloc
 
+CLAUSE_LEARNING_SOLVERS = {"SAT (CDCL)"}  # Always print conflicts/learned clauses
 
-class SolverStats:
-    def __init__(self):
-        self.recursive_calls = 0
-        self.constraint_checks = 0
-        self.max_depth = 0
-        self.current_depth = 0
 
-    def enter_call(self):
-        self.recursive_calls += 1
-        self.current_depth += 1
-        self.max_depth = max(self.max_depth, self.current_depth)
+def benchmark_solver(name, solver, puzzle, puzzle_id, runs=50):
+    """Benchmark one solver on a single puzzle."""
+    print(f"Testing solver: {name}")
+    total_time = 0.0
+    success = True
+    stats_accum = SolverStats()
+    peak_memory = 0
 
-    def exit_call(self):
-        self.current_depth -= 1
+    for _ in range(runs):
+        grid_copy = copy.deepcopy(puzzle)
+        start = time.perf_counter()
+        tracemalloc.start()
+        stats = SolverStats()
+        solved = solver(grid_copy, stats)
+        end = time.perf_counter()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
 
-    def check_constraint(self):
-        self.constraint_checks += 1
+        if not solved:
+            success = False
+            break
+
+        total_time += end - start
+        stats_accum.merge(stats)
+        peak_memory = max(peak_memory, peak)
+
+    result = {
+        "solver": name,
+        "puzzle_id": puzzle_id,
+        "solved": success,
+        "avg_time": total_time / runs if success else None,
+        "avg_calls": stats_accum.recursive_calls // runs if success else None,
+        "avg_checks": stats_accum.constraint_checks // runs if success else None,
+        "max_depth": stats_accum.max_depth if success else None,
+        "peak_memory_kb": peak_memory // 1024 if success else None,
+        "runs": runs,
+        "avg_backtracks": stats_accum.backtracks // runs if success else None,
+        "avg_conflicts": stats_accum.conflicts // runs if success else None,
+        "avg_learned_clauses": (
+            stats_accum.learned_clauses // runs if success else None
+        ),
+        "avg_propagation_time": (
+            stats_accum.propagation_time / runs if success else None
+        ),
+        "depth_profile": (
+            " ".join(f"{n / runs:g}" for n in stats_accum.nodes_by_depth[1:])
+            if success
+            else None
+        ),
+    }
+    for rule, count in zip(RULES, stats_accum.propagations):
+        result[f"avg_{rule}s"] = count // runs if success else None
+
+    if success:
+        avg_time = result["avg_time"]
+        share = result["avg_propagation_time"] / avg_time if avg_time else 0.0
+        print(
+            f"{name}: ✔ | Avg Time: {result['avg_time']:.5f}s | "
+            f"Avg Calls: {result['avg_calls']} | "
+            f"Avg Checks: {result['avg_checks']} | "
+            f"Peak Memory: {result['peak_memory_kb']}KB | "
+            f"Max Depth: {result['max_depth']} | "
+            f"Backtracks: {result['avg_backtracks']} | "
+            f"Propagation: {share:.0%}"
+        )
+        if name in CLAUSE_LEARNING_SOLVERS or stats_accum.conflicts:
+            print(
+                f"{name}: Conflicts: {result['avg_conflicts']} | "
+                f"Learned Clauses: {result['avg_learned_clauses']}"
+            )
+    else:
+        print(f"{name}: ✘ Failed")
+
+    return result
 
 
 def benchmark_single_puzzle(puzzle, puzzle_id, runs=50):
     """Benchmark all solvers on a single puzzle."""
-    results = []
     print(f"------ Starting Benchmark for {puzzle_id} with {runs} runs ------")
     print_board(puzzle)
 
-    for name, solver in solvers.items():
-        print(f"Testing solver: {name}")
-        total_time = 0.0
-        success = True
-        stats_accum = SolverStats()
-        peak_memory = 0
-
-        for _ in range(runs):
-            grid_copy = copy.deepcopy(puzzle)
-            start = time.perf_counter()
-            tracemalloc.start()
-            stats = SolverStats()
-            solved = solver(grid_copy, stats)
-            end = time.perf_counter()
-            current, peak = tracemalloc.get_traced_memory()
-            tracemalloc.stop()
-
-            if not solved:
-                success = False
-                break
-
-            total_time += end - start
-            # Accumulate stats
-            stats_accum.recursive_calls += stats.recursive_calls
-            stats_accum.constraint_checks += stats.constraint_checks
-            stats_accum.max_depth = max(stats_accum.max_depth, stats.max_depth)
-            peak_memory = max(peak_memory, peak)
-
-        result = {
-            "solver": name,
-            "puzzle_id": puzzle_id,
-            "solved": success,
-            "avg_time": total_time / runs if success else None,
-            "avg_calls": stats_accum.recursive_calls // runs if success else None,
-            "avg_checks": stats_accum.constraint_checks // runs if success else None,
-            "max_depth": stats_accum.max_depth if success else None,
-            "peak_memory_kb": peak_memory // 1024 if success else None,
-            "runs": runs,
-        }
-
-        results.append(result)
-
-        if success:
-            print(
-                f"{name}: ✔ | Avg Time: {result['avg_time']:.5f}s | "
-                f"Avg Calls: {result['avg_calls']} | "
-                f"Avg Checks: {result['avg_checks']} | "
-                f"Peak Memory: {result['peak_memory_kb']}KB | "
-                f"Max Depth: {result['max_depth']}"
-            )
-        else:
-            print(f"{name}: ✘ Failed")
+    return [
+        benchmark_solver(name, solver, puzzle, puzzle_id, runs)
+        for name, solver in solvers.items()
+    ]
 
-    return results
 
+def benchmark_multiple_puzzles(
+    difficulty_levels=None,
+    runs_per_puzzle=50,
+    store=None,
+    checkpoint=None,
+    telemetry=None,
+    puzzles_per_level=3,
+):
+    """Run benchmarks on multiple puzzles with varying difficulty levels.
 
-def benchmark_multiple_puzzles(difficulty_levels=None, runs_per_puzzle=50):
-    """Run benchmarks on multiple puzzles with varying difficulty levels."""
+    Each puzzle's results are bulk-inserted into ``store`` when one is given,
+    otherwise appended to the legacy CSV. With a ``checkpoint``, puzzles and
+    finished (solver, puzzle) jobs are recorded as they complete so a
+    restarted run replays the same puzzles and skips finished work.
+    """
     if difficulty_levels is None:
         # Default difficulty levels
         difficulty_levels = [22, 30, 40, 50, 60]
 
     all_results = []
+    if telemetry is not None:
+        telemetry.total_jobs = len(difficulty_levels) * puzzles_per_level * len(solvers)
+        telemetry.emit("run_start", **telemetry.progress())
 
     for difficulty in difficulty_levels:
         print(f"\n==== Testing puzzles with {difficulty} empty cells ====")
-        for i in range(3):  # 3 puzzles per difficulty level
+        for i in range(puzzles_per_level):
             puzzle_id = f"puzzle_d{difficulty}_{i}"
-            puzzle = generate_partial_sudoku(empty_cells=difficulty)
-            results = benchmark_single_puzzle(puzzle, puzzle_id, runs=runs_per_puzzle)
+            if checkpoint is not None and checkpoint.is_flushed(puzzle_id):
+                for name in solvers:
+                    all_results.append(checkpoint.job_result(name, puzzle_id))
+                    if telemetry is not None:
+                        telemetry.job_skipped(name, puzzle_id)
+                continue
+
+            if checkpoint is not None:
+                puzzle = checkpoint.puzzle(
+                    puzzle_id, lambda: generate_partial_sudoku(empty_cells=difficulty)
+                )
+            else:
+                puzzle = generate_partial_sudoku(empty_cells=difficulty)
+
+            print(
+                f"------ Starting Benchmark for {puzzle_id} "
+                f"with {runs_per_puzzle} runs ------"
+            )
+            print_board(puzzle)
+
+            results = []
+            for name, solver in solvers.items():
+                result = None
+                if checkpoint is not None:
+                    result = checkpoint.job_result(name, puzzle_id)
+                if result is not None:
+                    if telemetry is not None:
+                        telemetry.job_skipped(name, puzzle_id)
+                else:
+                    start = time.perf_counter()
+                    result = benchmark_solver(
+                        name, solver, puzzle, puzzle_id, runs_per_puzzle
+                    )
+                    latency = time.perf_counter() - start
+                    if checkpoint is not None:
+                        checkpoint.record_job(name, puzzle_id, result)
+                    if telemetry is not None:
+                        telemetry.job_done(name, puzzle_id, latency, result)
+                results.append(result)
             all_results.extend(results)
 
-            write_results_to_csv(results)
+            if store is not None:
+                # Replace, not append: a crash before record_flushed reflushes
+                store.insert_results(results, difficulty=difficulty, replace=True)
+            else:
+                write_results_to_csv(results)
+            if checkpoint is not None:
+                checkpoint.record_flushed(puzzle_id)
+
+    if telemetry is not None:
+        telemetry.emit("run_end", **telemetry.progress())
 
     return all_results
 
 
+def print_run_summary(store):
+    """Print per-solver figures for the store's current run, aggregated in SQL.
+
+    Reads the stored rows rather than this process's results, so a resumed
+    run is summarized in full.
+    """
+    rows = store.aggregate(
+        group_by=("solver",),
+        metrics={
+            "solved": ["sum", "count"],
+            "avg_time": ["mean", "max"],
+            "avg_calls": ["mean"],
+            "avg_backtracks": ["mean"],
+            "peak_memory_kb": ["max"],
+        },
+        run_id=store.run_id,
+    )
+    print(f"\n==== Summary of run {store.run_id} ====")
+    for row in rows:
+        if not row["solved_sum"]:
+            print(f"{row['solver']}: ✘ 0/{row['solved_count']} solved")
+            continue
+        print(
+            f"{row['solver']}: {row['solved_sum']}/{row['solved_count']} solved | "
+            f"Mean Time: {row['avg_time_mean']:.5f}s | "
+            f"Worst Time: {row['avg_time_max']:.5f}s | "
+            f"Mean Calls: {row['avg_calls_mean']:.0f} | "
+            f"Mean Backtracks: {row['avg_backtracks_mean']:.0f} | "
+            f"Peak Memory: {row['peak_memory_kb_max']}KB"
+        )
+
+
 def write_results_to_csv(results, filename="benchmark_results.csv"):
     """Write benchmark results to a CSV file."""
     fieldnames = [
@@ -121,12 +225,22 @@ def write_results_to_csv(results, filename="benchmark_results.csv"):
         "max_depth",
         "peak_memory_kb",
         "runs",
+        "avg_backtracks",
+        "avg_conflicts",
+        "avg_learned_clauses",
+        "avg_propagation_time",
+        *(f"avg_{rule}s" for rule in RULES),
+        "depth_profile",
     ]
 
     write_header = not os.path.exists(filename)
+    if not write_header:
+        # Keep appending in an older file's layout rather than misalign its rows
+        with open(filename, newline="") as csvfile:
+            fieldnames = next(csv.reader(csvfile), fieldnames)
 
     with open(filename, "a", newline="") as csvfile:
-        writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+        writer = csv.DictWriter(csvfile, fieldnames=fieldnames, extrasaction="ignore")
         if write_header:
             writer.writeheader()
         writer.writerows(results)
@@ -134,12 +248,247 @@ def write_results_to_csv(results, filename="benchmark_results.csv"):
     print(f"Results written to {filename}")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the registered solvers.")
+    parser.add_argument(
+        "--profile",
+        metavar="SOLVER",
+        help='profile one registered solver (or "all") instead of benchmarking',
+    )
+    parser.add_argument(
+        "--profiler",
+        choices=["cprofile", "sample"],
+        default="cprofile",
+        help="deterministic cProfile or sampling profiler with collapsed stacks",
+    )
+    parser.add_argument("--top", type=int, default=20, help="functions to report")
+    parser.add_argument("--empty-cells", type=int, default=50)
+    parser.add_argument("--puzzles", type=int, default=3)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output-dir", default="profiles")
+    parser.add_argument(
+        "--memory",
+        metavar="SOLVER",
+        help='attribute allocations by search depth and line for a solver (or "all")',
+    )
+    parser.add_argument(
+        "--snapshot-every",
+        type=int,
+        default=1,
+        help="depth transitions between tracemalloc snapshots in --memory mode",
+    )
+    parser.add_argument(
+        "--throughput",
+        action="store_true",
+        help="measure puzzles/sec across worker counts and batch sizes",
+    )
+    parser.add_argument(
+        "--restarts",
+        action="store_true",
+        help="compare latency tails of the random solver across restart policies",
+    )
+    parser.add_argument(
+        "--restart-unit", type=int, help="nodes per restart unit (default: 32)"
+    )
+    parser.add_argument(
+        "--restart-corpus",
+        choices=["hard", "generated"],
+        default="hard",
+        help="puzzles for --restarts: the --hard suite, or --corpus-size "
+        "generated ones with --empty-cells (default: hard)",
+    )
+    parser.add_argument(
+        "--seeds", type=int, default=5, help="seeded runs per puzzle in --restarts"
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="measure the cost of loading each solver in a fresh worker process",
+    )
+    parser.add_argument(
+        "--startup-budget-ms",
+        type=float,
+        help="fail --startup when a median load exceeds this",
+    )
+    parser.add_argument(
+        "--hard",
+        action="store_true",
+        help="run every solver on the 17-clue, top-difficulty and anti-row-major suite",
+    )
+    parser.add_argument(
+        "--budget-s", type=float, help="per-puzzle time budget in --hard (default: 5)"
+    )
+    parser.add_argument(
+        "--hard-runs", type=int, default=1, help="runs per puzzle in --hard"
+    )
+    parser.add_argument("--workers", type=int, nargs="+", help="worker counts")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", help="batch sizes")
+    parser.add_argument("--corpus-size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0, help="corpus seed")
+    parser.add_argument(
+        "--db", default="benchmark_results.db", help="SQLite results store"
+    )
+    parser.add_argument(
+        "--csv",
+        default="benchmark_results.csv",
+        help="CSV export of the store, kept for compatibility",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        metavar="PATH",
+        help="JSON-lines checkpoint; rerunning with the same path resumes the run",
+    )
+    parser.add_argument(
+        "--telemetry",
+        metavar="PATH",
+        help='write JSON-lines progress telemetry to PATH ("-" for stdout)',
+    )
+    parser.add_argument(
+        "--import-csv",
+        metavar="CSV",
+        help="import a legacy results CSV into the store and exit",
+    )
+    return parser.parse_args()
+
+
 def main():
+    args = parse_args()
+
+    if args.profile:
+        from profiler import profile_solver
+
+        names = list(solvers) if args.profile == "all" else [args.profile]
+        puzzles = [
+            generate_partial_sudoku(empty_cells=args.empty_cells)
+            for _ in range(args.puzzles)
+        ]
+        for name in names:
+            profile_solver(
+                name,
+                puzzles,
+                runs=args.runs,
+                profiler=args.profiler,
+                top=args.top,
+                output_dir=args.output_dir,
+            )
+        return
+
     # results = benchmark_single_puzzle(generate_partial_sudoku(empty_cells=50), "quick_test", runs=5)
     # write_results_to_csv(results)
 
-    difficulty_levels = [22, 30, 40, 50, 60]  # Easy to extremely difficult
-    benchmark_multiple_puzzles(difficulty_levels=difficulty_levels, runs_per_puzzle=50)
+    if args.memory:
+        from memory_profile import profile_memory
+
+        names = list(solvers) if args.memory == "all" else [args.memory]
+        puzzles = [
+            generate_partial_sudoku(empty_cells=args.empty_cells)
+            for _ in range(args.puzzles)
+        ]
+        for name in names:
+            profile_memory(
+                name, puzzles, snapshot_every=args.snapshot_every, top=args.top
+            )
+        return
+
+    if args.restarts:
+        from algos import RESTART_UNIT
+        from restart_bench import benchmark_restarts, write_restart_csv
+
+        if args.restart_corpus == "hard":
+            from hard_bench import hard_corpus
+
+            corpus = [grid for _, _, grid in hard_corpus()]
+        else:
+            corpus = generate_corpus(
+                args.corpus_size, empty_cells=args.empty_cells, seed=args.seed
+            )
+        results = benchmark_restarts(
+            corpus, seeds=args.seeds, unit=args.restart_unit or RESTART_UNIT
+        )
+        write_restart_csv(results)
+        return
+
+    if args.hard:
+        from hard_bench import (
+            HARD_BUDGET_S,
+            benchmark_hard,
+            hard_corpus,
+            write_hard_csv,
+        )
+
+        results = benchmark_hard(
+            hard_corpus(), budget_s=args.budget_s or HARD_BUDGET_S, runs=args.hard_runs
+        )
+        write_hard_csv(results)
+        return
+
+    if args.startup:
+        import sys
+
+        from startup import STARTUP_BUDGET_MS, check_startup
+
+        budget_ms = args.startup_budget_ms or STARTUP_BUDGET_MS
+        if not check_startup(list(solvers), args.runs, budget_ms):
+            sys.exit(1)
+        return
+
+    if args.throughput:
+        from throughput import benchmark_throughput, write_throughput_csv
+
+        corpus = generate_corpus(
+            args.corpus_size, empty_cells=args.empty_cells, seed=args.seed
+        )
+        results = benchmark_throughput(
+            corpus, worker_counts=args.workers, batch_sizes=args.batch_sizes
+        )
+        write_throughput_csv(results)
+        return
+
+    from results_store import ResultsStore, new_run_id
+
+    checkpoint = None
+    run_id = None
+    if args.checkpoint:
+        from checkpoint import BenchmarkCheckpoint
+
+        checkpoint = BenchmarkCheckpoint(args.checkpoint)
+        run_id = checkpoint.start_run(new_run_id())
+
+    telemetry = None
+    if args.telemetry:
+        from telemetry import Telemetry
+
+        telemetry = Telemetry.open(args.telemetry)
+
+    with ResultsStore(args.db, run_id=run_id) as store:
+        if not store.runs() and os.path.exists(args.csv) and not args.import_csv:
+            # First run against a new store: keep the CSV history in it
+            count = store.import_csv(args.csv)
+            print(f"Imported {count} existing rows from {args.csv} into {args.db}")
+
+        if args.import_csv:
+            count = store.import_csv(args.import_csv)
+            print(f"Imported {count} rows from {args.import_csv} into {args.db}")
+            return
+
+        difficulty_levels = [22, 30, 40, 50, 60]  # Easy to extremely difficult
+        try:
+            benchmark_multiple_puzzles(
+                difficulty_levels=difficulty_levels,
+                runs_per_puzzle=50,
+                store=store,
+                checkpoint=checkpoint,
+                telemetry=telemetry,
+            )
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            if telemetry is not None:
+                telemetry.close()
+        print_run_summary(store)
+        print(f"Run {store.run_id} stored in {args.db}")
+        store.export_csv(args.csv)
+        print(f"Results exported to {args.csv}")
 
 
 if __name__ == "__main__":
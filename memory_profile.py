@@ -0,0 +1,136 @@
+import copy
+import linecache
+import os
+import tracemalloc
+from collections import defaultdict
+
+from registry import solvers
+from solver_stats import SolverStats
+
+
+class DepthMemoryStats(SolverStats):
+    """SolverStats that attributes allocations to the active search depth.
+
+    At every depth transition the traced-memory delta since the previous
+    transition is charged to the depth the solver was at. Every
+    ``snapshot_every`` transitions a tracemalloc snapshot is diffed against the
+    previous one to attribute the growth to source lines as well.
+    """
+
+    def __init__(self, snapshot_every=1):
+        super().__init__()
+        self.snapshot_every = snapshot_every
+        self.transitions = 0
+        self.net_by_depth = defaultdict(int)
+        self.peak_by_depth = defaultdict(int)
+        self.allocated_by_depth = defaultdict(int)
+        self.site_bytes = defaultdict(lambda: defaultdict(int))
+        self._filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+        ]
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+        self._last_current = tracemalloc.get_traced_memory()[0]
+
+    def _transition(self):
+        depth = self.current_depth
+        current = tracemalloc.get_traced_memory()[0]
+        self.net_by_depth[depth] += current - self._last_current
+        self.peak_by_depth[depth] = max(self.peak_by_depth[depth], current)
+
+        self.transitions += 1
+        if self.transitions % self.snapshot_every == 0:
+            snapshot = tracemalloc.take_snapshot().filter_traces(self._filters)
+            for stat in snapshot.compare_to(self._snapshot, "lineno"):
+                if stat.size_diff > 0:
+                    frame = stat.traceback[0]
+                    self.site_bytes[(frame.filename, frame.lineno)][
+                        depth
+                    ] += stat.size_diff
+                    self.allocated_by_depth[depth] += stat.size_diff
+            self._snapshot = snapshot
+
+        # Re-read so the snapshot's own bookkeeping is not charged to the solver
+        self._last_current = tracemalloc.get_traced_memory()[0]
+
+    def enter_call(self):
+        self._transition()
+        super().enter_call()
+
+    def exit_call(self):
+        self._transition()
+        super().exit_call()
+
+    def finish(self):
+        self._transition()
+
+
+def _site_label(site):
+    filename, lineno = site
+    source = linecache.getline(filename, lineno).strip()
+    return f"{os.path.basename(filename)}:{lineno}  {source}"
+
+
+def profile_memory(name, puzzles, snapshot_every=1, top=10):
+    """Attribute a solver's allocations by search depth and by source line.
+
+    Returns ``(depth_rows, site_rows)``; byte counts are summed over puzzles.
+    """
+    solver = solvers[name]
+    net = defaultdict(int)
+    allocated = defaultdict(int)
+    peak = defaultdict(int)
+    sites = defaultdict(lambda: defaultdict(int))
+
+    tracemalloc.start()
+    try:
+        for puzzle in puzzles:
+            grid = copy.deepcopy(puzzle)
+            stats = DepthMemoryStats(snapshot_every=snapshot_every)
+            solver(grid, stats)
+            stats.finish()
+            for depth, size in stats.net_by_depth.items():
+                net[depth] += size
+                allocated[depth] += stats.allocated_by_depth[depth]
+                peak[depth] = max(peak[depth], stats.peak_by_depth[depth])
+            for site, by_depth in stats.site_bytes.items():
+                for depth, size in by_depth.items():
+                    sites[site][depth] += size
+    finally:
+        tracemalloc.stop()
+
+    depth_rows = [
+        {
+            "depth": depth,
+            "allocated_kb": allocated[depth] / 1024,
+            "net_kb": net[depth] / 1024,
+            "peak_kb": peak[depth] / 1024,
+        }
+        for depth in sorted(net)
+    ]
+    site_rows = sorted(
+        (
+            {
+                "site": _site_label(site),
+                "allocated_kb": sum(by_depth.values()) / 1024,
+                "hottest_depth": max(by_depth, key=by_depth.get),
+            }
+            for site, by_depth in sites.items()
+        ),
+        key=lambda row: row["allocated_kb"],
+        reverse=True,
+    )[:top]
+
+    print(f"------ Memory profile: {name} | {len(puzzles)} puzzles ------")
+    print(f"{'depth':>6} {'alloc KB':>10} {'net KB':>10} {'peak KB':>10}")
+    for row in depth_rows:
+        print(
+            f"{row['depth']:>6} {row['allocated_kb']:>10.1f} "
+            f"{row['net_kb']:>10.1f} {row['peak_kb']:>10.1f}"
+        )
+    print(f"\nTop {len(site_rows)} allocating sites:")
+    print(f"{'alloc KB':>10} {'depth':>6}  site")
+    for row in site_rows:
+        print(f"{row['allocated_kb']:>10.1f} {row['hottest_depth']:>6}  {row['site']}")
+
+    return depth_rows, site_rows
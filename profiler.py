@@ -0,0 +1,156 @@
+import copy
+import cProfile
+import os
+import pstats
+import re
+import sys
+import threading
+from collections import Counter
+
+from registry import solvers
+from solver_stats import SolverStats
+
+
+def _slug(name):
+    return re.sub(r"[^a-z0-9]+", "_", name.lower()).strip("_")
+
+
+def _frame_label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _run_solver(solver, puzzles, runs):
+    for puzzle in puzzles:
+        for _ in range(runs):
+            solver(copy.deepcopy(puzzle), SolverStats())
+
+
+class StackSampler:
+    """Sample the call stack of one thread at a fixed interval.
+
+    Stacks are truncated at ``_run_solver`` so only solver frames remain, and
+    are counted in the collapsed ``a;b;c count`` format used by flamegraph.pl
+    and speedscope.
+    """
+
+    def __init__(self, interval=0.0005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._switch_interval = None
+
+    def _run(self):
+        root = _run_solver.__code__
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None and frame.f_code is not root:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack and frame is not None:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def __enter__(self):
+        # A short switch interval lets the sampler thread preempt the solver
+        # often enough to hit the requested sampling rate.
+        self._switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(self._switch_interval, self.interval / 2))
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        sys.setswitchinterval(self._switch_interval)
+
+    def function_totals(self):
+        """Return ``{label: (self_samples, total_samples)}``."""
+        self_samples = Counter()
+        total_samples = Counter()
+        for stack, count in self.stacks.items():
+            frames = stack.split(";")
+            self_samples[frames[-1]] += count
+            for label in set(frames):
+                total_samples[label] += count
+        return {
+            label: (self_samples[label], total_samples[label])
+            for label in total_samples
+        }
+
+    def write_collapsed(self, filename):
+        with open(filename, "w") as f:
+            for stack, count in sorted(self.stacks.items()):
+                f.write(f"{stack} {count}\n")
+
+
+def _cprofile_summary(profiler, top):
+    """Aggregate cProfile stats by function name and format the top entries."""
+    by_function = {}
+    for (filename, line, name), (cc, nc, tt, ct, _) in pstats.Stats(
+        profiler
+    ).stats.items():
+        label = f"{name} ({os.path.basename(filename)}:{line})"
+        by_function[label] = (nc, tt, ct)
+
+    total = sum(tt for _, tt, _ in by_function.values()) or 1.0
+    lines = [f"{'calls':>10} {'tottime':>10} {'cumtime':>10} {'self%':>7}  function"]
+    ranked = sorted(by_function.items(), key=lambda item: item[1][1], reverse=True)
+    for label, (nc, tt, ct) in ranked[:top]:
+        lines.append(
+            f"{nc:>10} {tt:>10.4f} {ct:>10.4f} {100 * tt / total:>6.1f}%  {label}"
+        )
+    return "\n".join(lines)
+
+
+def _sample_summary(sampler, top):
+    totals = sampler.function_totals()
+    samples = sum(sampler.stacks.values()) or 1
+    lines = [f"{'self':>8} {'total':>8} {'self%':>7} {'total%':>7}  function"]
+    ranked = sorted(totals.items(), key=lambda item: item[1][0], reverse=True)
+    for label, (own, total) in ranked[:top]:
+        lines.append(
+            f"{own:>8} {total:>8} {100 * own / samples:>6.1f}% "
+            f"{100 * total / samples:>6.1f}%  {label}"
+        )
+    return "\n".join(lines)
+
+
+def profile_solver(
+    name, puzzles, runs=5, profiler="cprofile", top=20, output_dir="profiles"
+):
+    """Profile one registered solver over ``puzzles`` and write the reports.
+
+    ``cprofile`` writes a ``.pstats`` file; ``sample`` writes a ``.collapsed``
+    stack file for flame graphs. Both write a ``.txt`` top-N summary, which is
+    also returned.
+    """
+    solver = solvers[name]
+    os.makedirs(output_dir, exist_ok=True)
+    base = os.path.join(output_dir, _slug(name))
+
+    if profiler == "cprofile":
+        prof = cProfile.Profile()
+        prof.runcall(_run_solver, solver, puzzles, runs)
+        prof.dump_stats(base + ".pstats")
+        summary = _cprofile_summary(prof, top)
+        outputs = [base + ".pstats"]
+    elif profiler == "sample":
+        with StackSampler() as sampler:
+            _run_solver(solver, puzzles, runs)
+        sampler.write_collapsed(base + ".collapsed")
+        summary = _sample_summary(sampler, top)
+        outputs = [base + ".collapsed"]
+    else:
+        raise ValueError(f"Unknown profiler: {profiler}")
+
+    header = f"{name} | {profiler} | {len(puzzles)} puzzles x {runs} runs"
+    with open(base + ".txt", "w") as f:
+        f.write(header + "\n" + summary + "\n")
+    outputs.append(base + ".txt")
+
+    print(f"------ Profile: {header} ------")
+    print(summary)
+    print(f"Profile written to {', '.join(outputs)}")
+    return summary
@@ -0,0 +1,99 @@
+import sys
+
+SOLVER_ENTRY_POINTS = "sudoku_solver.solvers"
+STEPPER_ENTRY_POINTS = "sudoku_solver.steppers"
+
+
+class LazyRegistry:
+    """Solver name -> callable, importing each engine module on first use.
+
+    Entries start as ``"module:attribute"`` specs and are replaced by the
+    loaded object the first time they are looked up. Third-party engines
+    are listed under the ``group`` entry point; scanning installed packages
+    for them is slow, so it only happens when a name is missing or the
+    registry is enumerated, and their modules are not imported until used.
+    It reads like a dict but avoids ``collections.abc`` and ``importlib``,
+    which would cost a few milliseconds in every fresh worker.
+    """
+
+    def __init__(self, specs, group=None):
+        self._targets = dict(specs)
+        self._group = group
+        self._discovered = group is None
+
+    def register(self, name, target):
+        """Add or replace ``name``; ``target`` is a callable or a spec string."""
+        self._targets[name] = target
+
+    def _discover(self):
+        if self._discovered:
+            return
+        self._discovered = True
+        from importlib.metadata import entry_points
+
+        for entry_point in entry_points(group=self._group):
+            self._targets.setdefault(entry_point.name, entry_point.value)
+
+    def is_loaded(self, name):
+        return not isinstance(self._targets.get(name), str)
+
+    def __getitem__(self, name):
+        if name not in self._targets:
+            self._discover()
+        target = self._targets[name]
+        if isinstance(target, str):
+            module_name, _, attribute = target.partition(":")
+            __import__(module_name)
+            target = sys.modules[module_name]
+            for part in attribute.split("."):
+                target = getattr(target, part)
+            self._targets[name] = target
+        return target
+
+    def __contains__(self, name):
+        if name not in self._targets:
+            self._discover()
+        return name in self._targets
+
+    def __iter__(self):
+        self._discover()
+        return iter(list(self._targets))
+
+    def __len__(self):
+        self._discover()
+        return len(self._targets)
+
+    def get(self, name, default=None):
+        return self[name] if name in self else default
+
+    def keys(self):
+        return list(self)
+
+    def values(self):
+        return [self[name] for name in self]
+
+    def items(self):
+        return [(name, self[name]) for name in self]
+
+
+solvers = LazyRegistry(
+    {
+        "Backtracking Solver": "algos:solve_backtracking",
+        "Constraint Propagation + MRV": "algos:solver_mrv",
+        "Constraint Propagation + Random": "algos:solver_random",
+        "Constraint Propagation + MRV/LCV": "algos:solver_mrv_lcv",
+        "SAT (CDCL)": "algos:solve_sat",
+    },
+    group=SOLVER_ENTRY_POINTS,
+)
+
+steppers = LazyRegistry(
+    {
+        "Backtracking Solver": "stepping:step_backtracking",
+        "Constraint Propagation + MRV": "stepping:step_mrv",
+        "Constraint Propagation + Random": "stepping:step_random",
+        "Constraint Propagation + MRV/LCV": "stepping:step_mrv_lcv",
+        "SAT (CDCL)": "stepping:step_sat",
+    },
+    group=STEPPER_ENTRY_POINTS,
+)
@@ -0,0 +1,91 @@
+import copy
+import csv
+import time
+
+from aggregates import QUANTILES, QuantileSketch
+from algos import RESTART_POLICIES, RESTART_UNIT, solver_random
+from solver_stats import SolverStats
+
+RESTART_FIELDS = [
+    "policy",
+    "unit",
+    "solves",
+    "mean_ms",
+    "p50_ms",
+    "p90_ms",
+    "p99_ms",
+    "max_ms",
+    "mean_nodes",
+    "max_nodes",
+    "restarts",
+    "restarted_solves",
+    "mean_restarts",
+]
+
+
+def benchmark_restarts(corpus, seeds=5, policies=RESTART_POLICIES, unit=RESTART_UNIT):
+    """Time the random-branching solver on every puzzle under each restart policy.
+
+    Each puzzle is solved once per seed in ``range(seeds)``, so every policy
+    sees the same seeded runs. Returns one summary row per policy, with the
+    latency tail that restarts are meant to cut.
+    """
+    results = []
+    for policy in policies:
+        latencies = QuantileSketch()
+        total_ms = max_ms = 0.0
+        total_nodes = max_nodes = total_restarts = 0
+        solves = restarted = 0
+        for puzzle in corpus:
+            for seed in range(seeds):
+                grid = copy.deepcopy(puzzle)
+                stats = SolverStats()
+                start = time.perf_counter()
+                solver_random(grid, stats, seed=seed, restarts=policy, unit=unit)
+                elapsed_ms = 1000 * (time.perf_counter() - start)
+
+                latencies.add(elapsed_ms)
+                total_ms += elapsed_ms
+                max_ms = max(max_ms, elapsed_ms)
+                total_nodes += stats.recursive_calls
+                max_nodes = max(max_nodes, stats.recursive_calls)
+                total_restarts += stats.restarts
+                restarted += stats.restarts > 0
+                solves += 1
+
+        result = {
+            "policy": policy or "none",
+            "unit": unit if policy else None,
+            "solves": solves,
+            "mean_ms": total_ms / solves,
+            "max_ms": max_ms,
+            "mean_nodes": total_nodes / solves,
+            "max_nodes": max_nodes,
+            "restarts": total_restarts,
+            "restarted_solves": restarted,
+            "mean_restarts": total_restarts / solves,
+        }
+        for q in QUANTILES:
+            result[f"p{round(q * 100)}_ms"] = latencies.quantile(q)
+        results.append(result)
+        print(
+            f"{result['policy']}: p50 {result['p50_ms']:.1f}ms | "
+            f"p99 {result['p99_ms']:.1f}ms | max {max_ms:.1f}ms | "
+            f"nodes mean {result['mean_nodes']:.1f} max {max_nodes} | "
+            f"restarts {total_restarts} in {restarted} solves"
+        )
+        if policy and not total_restarts:
+            print(
+                f"  warning: no search reached {unit} nodes, so {policy} never "
+                "restarted; use a harder corpus or a smaller --restart-unit"
+            )
+    return results
+
+
+def write_restart_csv(results, filename="restart_results.csv"):
+    with open(filename, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=RESTART_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print(f"Restart results written to {filename}")
@@ -0,0 +1,279 @@
+import csv
+import os
+import re
+import sqlite3
+import subprocess
+import time
+import uuid
+
+RESULT_COLUMNS = [
+    "solver",
+    "puzzle_id",
+    "solved",
+    "avg_time",
+    "avg_calls",
+    "avg_checks",
+    "max_depth",
+    "peak_memory_kb",
+    "runs",
+    "avg_backtracks",
+    "avg_conflicts",
+    "avg_learned_clauses",
+    "avg_propagation_time",
+    "avg_naked_singles",
+    "avg_hidden_singles",
+    "avg_unit_propagations",
+    "depth_profile",
+]
+
+STORE_COLUMNS = ["run_id", "git_rev", "timestamp", "difficulty"] + RESULT_COLUMNS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    run_id TEXT NOT NULL,
+    git_rev TEXT,
+    timestamp REAL NOT NULL,
+    difficulty INTEGER,
+    solver TEXT NOT NULL,
+    puzzle_id TEXT NOT NULL,
+    solved INTEGER NOT NULL,
+    avg_time REAL,
+    avg_calls INTEGER,
+    avg_checks INTEGER,
+    max_depth INTEGER,
+    peak_memory_kb INTEGER,
+    runs INTEGER,
+    avg_backtracks INTEGER,
+    avg_conflicts INTEGER,
+    avg_learned_clauses INTEGER,
+    avg_propagation_time REAL,
+    avg_naked_singles INTEGER,
+    avg_hidden_singles INTEGER,
+    avg_unit_propagations INTEGER,
+    depth_profile TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_results_solver ON results (solver, difficulty);
+CREATE INDEX IF NOT EXISTS idx_results_difficulty ON results (difficulty);
+CREATE INDEX IF NOT EXISTS idx_results_run ON results (run_id);
+CREATE INDEX IF NOT EXISTS idx_results_rev ON results (git_rev);
+CREATE INDEX IF NOT EXISTS idx_results_time ON results (timestamp);
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+"""
+
+# Columns added after the first release, as (name, type) for older databases
+_ADDED_COLUMNS = [
+    ("avg_backtracks", "INTEGER"),
+    ("avg_propagation_time", "REAL"),
+    ("avg_naked_singles", "INTEGER"),
+    ("avg_hidden_singles", "INTEGER"),
+    ("avg_unit_propagations", "INTEGER"),
+    ("depth_profile", "TEXT"),
+    ("avg_conflicts", "INTEGER"),
+    ("avg_learned_clauses", "INTEGER"),
+]
+
+_AGGREGATES = {"mean": "AVG", "min": "MIN", "max": "MAX", "sum": "SUM", "count": "COUNT"}
+
+
+def current_git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        )
+    except OSError:
+        return None
+    return out.stdout.strip() or None
+
+
+def new_run_id():
+    return time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+
+
+def ensure_schema(conn):
+    """Create the results table, adding any columns an older database lacks."""
+    conn.executescript(_SCHEMA)
+    existing = {row[1] for row in conn.execute("PRAGMA table_info(results)")}
+    with conn:
+        for name, sql_type in _ADDED_COLUMNS:
+            if name not in existing:
+                conn.execute(f"ALTER TABLE results ADD COLUMN {name} {sql_type}")
+
+
+def deleted_rows(conn):
+    """Rows ever deleted from the store.
+
+    Rowids are not AUTOINCREMENT, so SQLite reuses a deleted row's id; a
+    reader that tracks the last rowid it saw must start over when this
+    count changes.
+    """
+    row = conn.execute("SELECT value FROM store_meta WHERE key = 'deleted'").fetchone()
+    return row[0] if row else 0
+
+
+def difficulty_from_puzzle_id(puzzle_id):
+    match = re.match(r"puzzle_d(\d+)_\d+", puzzle_id)
+    return int(match.group(1)) if match else None
+
+
+class ResultsStore:
+    """SQLite-backed benchmark results with indexed run/solver/difficulty columns.
+
+    Rows are inserted in bulk per batch, and aggregates are computed by SQLite
+    so callers never need to load the full history into memory.
+    """
+
+    def __init__(self, path="benchmark_results.db", run_id=None, git_rev=None):
+        self.path = path
+        self.run_id = run_id or new_run_id()
+        self.git_rev = git_rev if git_rev is not None else current_git_revision()
+        self.conn = sqlite3.connect(path)
+        ensure_schema(self.conn)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def insert_results(self, results, difficulty=None, timestamp=None, replace=False):
+        """Insert one batch of ``benchmark_single_puzzle`` results.
+
+        With ``replace``, rows already stored for the batch's (run id, puzzle
+        id) pairs are deleted in the same transaction, so flushing a puzzle
+        again after a crash does not duplicate it.
+        """
+        timestamp = timestamp or time.time()
+        rows = [
+            (
+                result.get("run_id", self.run_id),
+                result.get("git_rev", self.git_rev),
+                result.get("timestamp", timestamp),
+                difficulty
+                if difficulty is not None
+                else difficulty_from_puzzle_id(result["puzzle_id"]),
+                *(result.get(column) for column in RESULT_COLUMNS),
+            )
+            for result in results
+        ]
+        placeholders = ", ".join("?" for _ in STORE_COLUMNS)
+        keys = {(row[0], result["puzzle_id"]) for row, result in zip(rows, results)}
+        with self.conn:
+            if replace:
+                deleted = self.conn.executemany(
+                    "DELETE FROM results WHERE run_id = ? AND puzzle_id = ?", keys
+                ).rowcount
+                if deleted > 0:
+                    self.conn.execute(
+                        "INSERT INTO store_meta VALUES ('deleted', ?) "
+                        "ON CONFLICT (key) DO UPDATE SET value = value + excluded.value",
+                        (deleted,),
+                    )
+            self.conn.executemany(
+                f"INSERT INTO results ({', '.join(STORE_COLUMNS)}) "
+                f"VALUES ({placeholders})",
+                rows,
+            )
+        return len(rows)
+
+    def import_csv(self, filename="benchmark_results.csv", batch_size=10000):
+        """Load a legacy CSV into the store as its own run."""
+        imported = 0
+        run_id = new_run_id()
+        with open(filename, newline="") as csvfile:
+            batch = []
+            for row in csv.DictReader(csvfile):
+                row = {key: value if value != "" else None for key, value in row.items()}
+                row["solved"] = row["solved"] == "True"
+                row["run_id"] = run_id
+                batch.append(row)
+                if len(batch) >= batch_size:
+                    imported += self.insert_results(batch)
+                    batch = []
+            if batch:
+                imported += self.insert_results(batch)
+        return imported
+
+    @staticmethod
+    def _check_columns(columns):
+        for column in columns:
+            if column not in STORE_COLUMNS:
+                raise ValueError(f"Unknown column: {column}")
+
+    def _where(self, filters):
+        clauses = []
+        params = []
+        for column, value in (filters or {}).items():
+            self._check_columns([column])
+            clauses.append(f"{column} = ?")
+            params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def iter_rows(self, columns=None, batch_size=10000, **filters):
+        """Yield result rows as dicts, streamed from a cursor."""
+        columns = columns or STORE_COLUMNS
+        self._check_columns(columns)
+        where, params = self._where(filters)
+        cursor = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM results{where} ORDER BY rowid", params
+        )
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(zip(columns, row))
+
+    def aggregate(self, group_by=("solver", "difficulty"), metrics=None, **filters):
+        """Aggregate metrics per group in SQL.
+
+        ``metrics`` maps a column to a list of ``mean``/``min``/``max``/``sum``/
+        ``count``; results are returned as dicts keyed ``<column>_<agg>``.
+        """
+        metrics = metrics or {
+            "avg_time": ["mean"],
+            "avg_calls": ["mean"],
+            "avg_checks": ["mean"],
+            "max_depth": ["mean"],
+            "peak_memory_kb": ["mean"],
+        }
+        group_by = list(group_by)
+        self._check_columns(group_by)
+        self._check_columns(metrics)
+        selects = list(group_by)
+        names = list(group_by)
+        for column, aggs in metrics.items():
+            for agg in aggs:
+                if agg not in _AGGREGATES:
+                    raise ValueError(f"Unknown aggregate: {agg}")
+                selects.append(f"{_AGGREGATES[agg]}({column})")
+                names.append(f"{column}_{agg}")
+        where, params = self._where(filters)
+        query = f"SELECT {', '.join(selects)} FROM results{where}"
+        if group_by:
+            query += f" GROUP BY {', '.join(group_by)} ORDER BY {', '.join(group_by)}"
+        return [dict(zip(names, row)) for row in self.conn.execute(query, params)]
+
+    def runs(self):
+        """Return ``(run_id, git_rev, started, rows)`` for every stored run."""
+        return self.conn.execute(
+            "SELECT run_id, git_rev, MIN(timestamp), COUNT(*) FROM results "
+            "GROUP BY run_id ORDER BY MIN(timestamp)"
+        ).fetchall()
+
+    def export_csv(self, filename="benchmark_results.csv", columns=None, **filters):
+        """Write stored rows to CSV; defaults to the legacy benchmark columns."""
+        columns = columns or RESULT_COLUMNS
+        with open(filename, "w", newline="") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=columns)
+            writer.writeheader()
+            for row in self.iter_rows(columns=columns, **filters):
+                if "solved" in row:
+                    row["solved"] = bool(row["solved"])
+                writer.writerow(row)
+        return filename
@@ -0,0 +1,336 @@
+import heapq
+import time
+
+from solver_stats import UNIT_PROPAGATION
+
+LUBY_UNIT = 64  # Conflicts per unit of the Luby restart sequence
+VAR_DECAY = 0.95
+RESCALE_LIMIT = 1e100
+
+
+def luby(i):
+    """The ``i``-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    while True:
+        k = 1
+        while (1 << k) - 1 < i:
+            k += 1
+        if i == (1 << k) - 1:
+            return 1 << (k - 1)
+        i -= (1 << (k - 1)) - 1
+
+
+class CDCLSolver:
+    """Conflict-driven clause learning SAT solver in pure Python.
+
+    Literals are non-zero ints (``-v`` is the negation of variable ``v``).
+    Per-literal tables have ``2 * num_vars + 1`` slots and are indexed by
+    the literal itself, so negative literals land in the upper half through
+    Python's negative indexing.
+
+    Propagation uses two watched literals, conflicts are analysed to the
+    first UIP with local minimisation of the learned clause, branching is
+    VSIDS over a lazily updated heap, and the search restarts on a Luby
+    schedule. Decisions always set the chosen variable true.
+
+    ``stats`` (a ``SolverStats``) counts decisions as calls, decision levels
+    as depth, visited watched clauses as constraint checks, undone decisions
+    as backtracks, implied literals as unit propagations, time in
+    propagation, conflicts, learned clauses and restarts. ``listener``, when set, gets ``decided(lit)``,
+    ``assigned(lit)`` and ``undone(decision_lit)`` as the search runs.
+    """
+
+    def __init__(self, num_vars, stats=None):
+        self.num_vars = num_vars
+        self.stats = stats
+        self.listener = None
+        size = 2 * num_vars + 1
+        self.lit_value = [0] * size  # 1 true, -1 false, 0 unassigned
+        self.watches = [[] for _ in range(size)]
+        self.level = [0] * (num_vars + 1)
+        self.reason = [None] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.seen = [False] * (num_vars + 1)
+        self.var_inc = 1.0
+        self.heap = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.trail = []
+        self.trail_lim = []
+        self.qhead = 0
+        self.ok = True
+        self.conflicts = 0
+        self.learned = 0
+        self.decisions = 0
+
+    def value(self, lit):
+        return self.lit_value[lit]
+
+    def add_clause(self, lits):
+        """Add a clause before solving; returns False once the formula is unsat."""
+        if not self.ok:
+            return False
+        clause = []
+        for lit in lits:
+            value = self.lit_value[lit]
+            if value == 1 or -lit in clause:
+                return True  # Already satisfied, or a tautology
+            if value == 0 and lit not in clause:
+                clause.append(lit)
+        if not clause:
+            self.ok = False
+        elif len(clause) == 1:
+            self._enqueue(clause[0], None)
+            self.ok = self._propagate() is None
+        else:
+            self.watches[clause[0]].append(clause)
+            self.watches[clause[1]].append(clause)
+        return self.ok
+
+    def _enqueue(self, lit, reason):
+        var = abs(lit)
+        self.lit_value[lit] = 1
+        self.lit_value[-lit] = -1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+        if self.listener:
+            self.listener.assigned(lit)
+
+    def _propagate(self):
+        """Unit-propagate the trail; returns a conflicting clause or None."""
+        lit_value = self.lit_value
+        watches = self.watches
+        trail = self.trail
+        stats = self.stats
+        checks = units = 0
+        while self.qhead < len(trail):
+            false_lit = -trail[self.qhead]
+            self.qhead += 1
+            watch_list = watches[false_lit]
+            i = j = 0
+            end = len(watch_list)
+            while i < end:
+                clause = watch_list[i]
+                i += 1
+                checks += 1
+                # Keep the falsified watch in slot 1
+                if clause[0] == false_lit:
+                    clause[0] = clause[1]
+                    clause[1] = false_lit
+                first = clause[0]
+                if lit_value[first] == 1:
+                    watch_list[j] = clause
+                    j += 1
+                    continue
+                for k in range(2, len(clause)):
+                    lit = clause[k]
+                    if lit_value[lit] != -1:
+                        clause[1] = lit
+                        clause[k] = false_lit
+                        watches[lit].append(clause)
+                        break
+                else:
+                    watch_list[j] = clause
+                    j += 1
+                    if lit_value[first] == -1:
+                        while i < end:
+                            watch_list[j] = watch_list[i]
+                            j += 1
+                            i += 1
+                        del watch_list[j:]
+                        self.qhead = len(trail)
+                        if stats:
+                            stats.constraint_checks += checks
+                            stats.propagations[UNIT_PROPAGATION] += units
+                        return clause
+                    self._enqueue(first, clause)
+                    units += 1
+            del watch_list[j:]
+        if stats:
+            stats.constraint_checks += checks
+            stats.propagations[UNIT_PROPAGATION] += units
+        return None
+
+    def _bump(self, var):
+        activity = self.activity
+        activity[var] += self.var_inc
+        if activity[var] > RESCALE_LIMIT:
+            for v in range(1, self.num_vars + 1):
+                activity[v] *= 1 / RESCALE_LIMIT
+            self.var_inc *= 1 / RESCALE_LIMIT
+            self._rebuild_heap()
+        elif self.lit_value[var] == 0:
+            heapq.heappush(self.heap, (-activity[var], var))
+
+    def _rebuild_heap(self):
+        self.heap = [
+            (-self.activity[v], v)
+            for v in range(1, self.num_vars + 1)
+            if self.lit_value[v] == 0
+        ]
+        heapq.heapify(self.heap)
+
+    def _analyze(self, conflict):
+        """First-UIP analysis; returns ``(learned clause, backjump level)``.
+
+        The asserting literal is ``learned[0]`` and the literal with the
+        highest remaining level is ``learned[1]``, ready to be watched.
+        """
+        seen = self.seen
+        level = self.level
+        reason = self.reason
+        trail = self.trail
+        current = len(self.trail_lim)
+        learned = [0]
+        pending = 0
+        index = len(trail) - 1
+        clause = conflict
+        start = 0
+        while True:
+            for k in range(start, len(clause)):
+                lit = clause[k]
+                var = abs(lit)
+                if not seen[var] and level[var] > 0:
+                    seen[var] = True
+                    self._bump(var)
+                    if level[var] >= current:
+                        pending += 1
+                    else:
+                        learned.append(lit)
+            while not seen[abs(trail[index])]:
+                index -= 1
+            lit = trail[index]
+            index -= 1
+            var = abs(lit)
+            seen[var] = False
+            pending -= 1
+            if pending == 0:
+                break
+            clause = reason[var]
+            start = 1  # Skip the literal this clause implied
+        learned[0] = -lit
+
+        # Drop literals implied by the rest of the clause
+        kept = [learned[0]]
+        for lit in learned[1:]:
+            implied_by = reason[abs(lit)]
+            if implied_by is None or any(
+                not seen[abs(other)] and level[abs(other)] > 0
+                for other in implied_by[1:]
+            ):
+                kept.append(lit)
+        for lit in learned[1:]:
+            seen[abs(lit)] = False
+
+        if len(kept) == 1:
+            return kept, 0
+        best = max(range(1, len(kept)), key=lambda k: level[abs(kept[k])])
+        kept[1], kept[best] = kept[best], kept[1]
+        return kept, level[abs(kept[1])]
+
+    def _cancel_until(self, target):
+        trail_lim = self.trail_lim
+        if len(trail_lim) <= target:
+            return
+        trail = self.trail
+        if self.listener:
+            for lim in reversed(trail_lim[target:]):
+                self.listener.undone(trail[lim])
+        if self.stats:
+            self.stats.backtracks += len(trail_lim) - target
+            for _ in range(len(trail_lim) - target):
+                self.stats.exit_call()
+        lit_value = self.lit_value
+        activity = self.activity
+        heap = self.heap
+        for k in range(len(trail) - 1, trail_lim[target] - 1, -1):
+            lit = trail[k]
+            var = abs(lit)
+            lit_value[lit] = lit_value[-lit] = 0
+            self.reason[var] = None
+            heapq.heappush(heap, (-activity[var], var))
+        del trail[trail_lim[target] :]
+        del trail_lim[target:]
+        self.qhead = len(trail)
+        if len(heap) > 4 * self.num_vars:
+            self._rebuild_heap()
+
+    def _pick_branch(self):
+        heap = self.heap
+        lit_value = self.lit_value
+        activity = self.activity
+        while heap:
+            neg_activity, var = heapq.heappop(heap)
+            if lit_value[var] == 0 and -neg_activity == activity[var]:
+                return var
+        return 0
+
+    def steps(self, every=1):
+        """Run the search, yielding the decision count every ``every`` decisions.
+
+        Returns whether the formula is satisfiable; ``every=0`` never yields.
+        """
+        if not self.ok:
+            return False
+        stats = self.stats
+        restarts = 1
+        budget = luby(restarts) * LUBY_UNIT
+        while True:
+            if stats:
+                start = time.perf_counter()
+                conflict = self._propagate()
+                stats.propagation_time += time.perf_counter() - start
+            else:
+                conflict = self._propagate()
+            if conflict is not None:
+                self.conflicts += 1
+                if stats:
+                    stats.conflicts += 1
+                if not self.trail_lim:
+                    self.ok = False
+                    return False
+                learned, back_level = self._analyze(conflict)
+                self._cancel_until(back_level)
+                if len(learned) == 1:
+                    self._enqueue(learned[0], None)
+                else:
+                    self.watches[learned[0]].append(learned)
+                    self.watches[learned[1]].append(learned)
+                    self._enqueue(learned[0], learned)
+                self.learned += 1
+                if stats:
+                    stats.learned_clauses += 1
+                self.var_inc /= VAR_DECAY
+                budget -= 1
+                continue
+
+            if budget <= 0:
+                restarts += 1
+                budget = luby(restarts) * LUBY_UNIT
+                self._cancel_until(0)
+                if stats:
+                    stats.restarts += 1
+                continue
+
+            var = self._pick_branch()
+            if not var:
+                # Every variable assigned without conflict
+                if stats:
+                    for _ in self.trail_lim:
+                        stats.exit_call()
+                return True
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            if stats:
+                stats.enter_call()
+            if self.listener:
+                self.listener.decided(var)
+            self._enqueue(var, None)
+            if every and self.decisions % every == 0:
+                yield self.decisions
+
+    def solve(self):
+        search = self.steps(every=0)
+        try:
+            while True:
+                next(search)
+        except StopIteration as done:
+            return done.value
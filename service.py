@@ -0,0 +1,381 @@
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from aggregates import QUANTILES, QuantileSketch
+from registry import steppers
+from throughput import _warm_up
+from utils import isValidSudoku
+
+DEFAULT_SOLVER = "Constraint Propagation + MRV"
+BUDGET_CHECK_STEPS = 64  # Search steps between budget checks in a worker
+LATENCY_BUCKETS_MS = [1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000]
+
+
+def solve_with_budget(name, puzzle, budget_s=None, max_steps=None, deadline=None):
+    """Solve one puzzle, giving up once the time or step budget is spent.
+
+    Runs the stepping form of the solver so the budget is checked every
+    ``BUDGET_CHECK_STEPS`` steps without a watchdog thread. ``deadline``, a
+    ``time.perf_counter()`` reading (one clock for every process on the
+    host), overrides ``budget_s`` so time spent queued counts against it; a
+    puzzle whose deadline has already passed is not started.
+    """
+    grid = [list(row) for row in puzzle]
+    start = time.perf_counter()
+    if deadline is None and budget_s:
+        deadline = start + budget_s
+    if deadline is not None and start >= deadline:
+        return {"status": "budget_exceeded", "solver": name, "solve_ms": 0.0}
+    search = steppers[name](grid, every=BUDGET_CHECK_STEPS)
+    try:
+        while True:
+            steps, _ = next(search)
+            if (deadline is not None and time.perf_counter() > deadline) or (
+                max_steps is not None and steps >= max_steps
+            ):
+                status = "budget_exceeded"
+                break
+    except StopIteration as done:
+        status = "solved" if done.value else "unsolvable"
+    finally:
+        search.close()
+
+    result = {
+        "status": status,
+        "solver": name,
+        "solve_ms": round(1000 * (time.perf_counter() - start), 3),
+    }
+    if status == "solved":
+        result["solution"] = grid
+    return result
+
+
+def solve_batch(jobs):
+    """Worker entry point: solve ``solve_with_budget`` argument tuples."""
+    return [solve_with_budget(*job) for job in jobs]
+
+
+class LatencyHistogram:
+    """Cumulative latency buckets plus a quantile sketch, in milliseconds."""
+
+    def __init__(self):
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.sketch = QuantileSketch()
+        self.total_ms = 0.0
+
+    def add(self, latency_ms):
+        index = 0
+        bounds = LATENCY_BUCKETS_MS
+        while index < len(bounds) and latency_ms > bounds[index]:
+            index += 1
+        self.counts[index] += 1
+        self.sketch.add(latency_ms)
+        self.total_ms += latency_ms
+
+    def to_dict(self):
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(LATENCY_BUCKETS_MS + ["+Inf"], self.counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        quantiles = {f"p{round(q * 100)}": self.sketch.quantile(q) for q in QUANTILES}
+        return {
+            "count": cumulative,
+            "sum_ms": round(self.total_ms, 3),
+            "buckets_le_ms": buckets,
+            **{k: round(v, 3) if v is not None else None for k, v in quantiles.items()},
+        }
+
+
+class SolveService:
+    """Micro-batch solve requests onto a pre-forked process pool.
+
+    Requests queue up while every worker slot is busy; the batcher then
+    drains a batch of them, waiting at most ``batch_window`` seconds for
+    stragglers, and sends it to one worker as a single task. A batch takes
+    the queue's share for one idle worker (capped at ``max_batch``) so the
+    rest is left for the others rather than solved in series. Budgets run
+    from when a request is queued, so waiting counts against them.
+    """
+
+    def __init__(
+        self, workers=None, batch_window=0.002, max_batch=32, default_budget=5.0
+    ):
+        self.workers = workers or os.cpu_count() or 1
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.default_budget = default_budget
+        self.pool = ProcessPoolExecutor(max_workers=self.workers)
+        # Fork every worker now so no request pays for process start-up
+        list(self.pool.map(_warm_up, range(self.workers * 2)))
+
+        self.pending = queue.Queue()
+        self.slots = threading.Semaphore(self.workers * 2)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.busy = 0  # Batches submitted and not yet completed
+        self.requests = 0
+        self.batches = 0
+        self.batched = 0
+        self.statuses = {}
+        self.latency = {}
+        self.batch_sizes = QuantileSketch()
+        self.started = time.time()
+
+        self.batcher = threading.Thread(target=self._run_batcher, daemon=True)
+        self.batcher.start()
+
+    def submit(self, puzzle, solver=DEFAULT_SOLVER, budget_ms=None, max_steps=None):
+        """Queue one puzzle; returns a Future resolving to its result dict."""
+        budget_s = budget_ms / 1000 if budget_ms is not None else self.default_budget
+        future = Future()
+        enqueued = time.perf_counter()
+        job = (solver, puzzle, budget_s, max_steps, enqueued + budget_s)
+        self.pending.put((job, future, enqueued))
+        return future
+
+    def _batch_limit(self):
+        """Queued requests divided over the idle workers, at most ``max_batch``."""
+        with self.lock:
+            idle = max(1, self.workers - self.busy)
+        queued = 1 + self.pending.qsize()
+        return max(1, min(self.max_batch, -(-queued // idle)))
+
+    def _run_batcher(self):
+        while True:
+            item = self.pending.get()
+            if item is None:
+                return
+            self.slots.acquire()
+            batch = [item]
+            limit = self._batch_limit()
+            deadline = time.perf_counter() + self.batch_window
+            while len(batch) < limit:
+                try:
+                    item = self.pending.get(
+                        timeout=max(0.0, deadline - time.perf_counter())
+                    )
+                except queue.Empty:
+                    break
+                if item is None:
+                    self.pending.put(None)
+                    break
+                batch.append(item)
+            self._dispatch(batch)
+
+    def _dispatch(self, batch):
+        with self.lock:
+            self.in_flight += len(batch)
+            self.busy += 1
+            self.batches += 1
+            self.batched += len(batch)
+            self.batch_sizes.add(len(batch))
+        try:
+            task = self.pool.submit(solve_batch, [job for job, _, _ in batch])
+        except RuntimeError as exc:
+            # Pool already shut down
+            task = Future()
+            task.set_exception(exc)
+        task.add_done_callback(lambda task: self._complete(batch, task))
+
+    def _complete(self, batch, task):
+        self.slots.release()
+        try:
+            results = task.result()
+        except Exception as exc:
+            results = [{"status": "error", "error": str(exc)} for _ in batch]
+
+        now = time.perf_counter()
+        with self.lock:
+            self.in_flight -= len(batch)
+            self.busy -= 1
+            for (job, _, enqueued), result in zip(batch, results):
+                latency_ms = 1000 * (now - enqueued)
+                result["latency_ms"] = round(latency_ms, 3)
+                self.requests += 1
+                status = result["status"]
+                self.statuses[status] = self.statuses.get(status, 0) + 1
+                if job[0] not in self.latency:
+                    self.latency[job[0]] = LatencyHistogram()
+                self.latency[job[0]].add(latency_ms)
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def metrics(self):
+        with self.lock:
+            return {
+                "uptime_s": round(time.time() - self.started, 1),
+                "workers": self.workers,
+                "queue_depth": self.pending.qsize(),
+                "in_flight": self.in_flight,
+                "puzzles_total": self.requests,
+                "batches_total": self.batches,
+                "mean_batch_size": (
+                    round(self.batched / self.batches, 2) if self.batches else None
+                ),
+                "p99_batch_size": self.batch_sizes.quantile(0.99),
+                "statuses": dict(self.statuses),
+                "latency_ms": {
+                    name: histogram.to_dict()
+                    for name, histogram in self.latency.items()
+                },
+            }
+
+    def close(self):
+        self.pending.put(None)
+        self.batcher.join()
+        self.pool.shutdown()
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def parse_puzzle(puzzle):
+    if (
+        not isinstance(puzzle, list)
+        or len(puzzle) != 9
+        or any(not isinstance(row, list) or len(row) != 9 for row in puzzle)
+        or any(type(v) is not int or not 0 <= v <= 9 for row in puzzle for v in row)
+    ):
+        raise BadRequest("puzzle must be 9 lists of 9 integers 0-9")
+    if not isValidSudoku(puzzle):
+        raise BadRequest("puzzle breaks a row, column or box constraint")
+    return puzzle
+
+
+class SolveHandler(BaseHTTPRequestHandler):
+    """``POST /solve`` for puzzles, ``GET /metrics`` and ``GET /solvers``."""
+
+    protocol_version = "HTTP/1.1"
+    service = None
+
+    def log_message(self, format, *args):
+        pass  # One line per request would dominate a load test
+
+    def send_json(self, status, body):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/metrics":
+            self.send_json(200, self.service.metrics())
+        elif self.path == "/solvers":
+            self.send_json(200, sorted(steppers))
+        else:
+            self.send_json(404, {"error": f"no route {self.path}"})
+
+    def do_POST(self):
+        if self.path != "/solve":
+            self.send_json(404, {"error": f"no route {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            if not isinstance(request, dict):
+                raise BadRequest("request body must be a JSON object")
+            solver = request.get("solver", DEFAULT_SOLVER)
+            if solver not in steppers:
+                raise BadRequest(f"unknown solver {solver!r}")
+            budget_ms = request.get("budget_ms")
+            if budget_ms is not None and (
+                type(budget_ms) not in (int, float) or budget_ms <= 0
+            ):
+                raise BadRequest("budget_ms must be a positive number")
+            max_steps = request.get("max_steps")
+            if max_steps is not None and (type(max_steps) is not int or max_steps <= 0):
+                raise BadRequest("max_steps must be a positive integer")
+            options = {"solver": solver, "budget_ms": budget_ms, "max_steps": max_steps}
+            if "puzzles" in request:
+                puzzles = [parse_puzzle(p) for p in request["puzzles"]]
+            else:
+                puzzle = parse_puzzle(request.get("puzzle"))
+        except (ValueError, TypeError) as exc:
+            self.send_json(400, {"error": str(exc)})
+            return
+
+        if "puzzles" not in request:
+            result = self.service.submit(puzzle, **options).result()
+            self.send_json(200, result)
+            return
+
+        # Batched request: stream one JSON line per puzzle as each finishes
+        futures = {
+            self.service.submit(puzzle, **options): index
+            for index, puzzle in enumerate(puzzles)
+        }
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for future in as_completed(futures):
+            line = json.dumps({"index": futures[future], **future.result()}) + "\n"
+            data = line.encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class SolveServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # The default of 5 resets connections under load
+
+
+def serve(host="127.0.0.1", port=8080, **service_options):
+    service = SolveService(**service_options)
+    SolveHandler.service = service
+    server = SolveServer((host, port), SolveHandler)
+    print(
+        f"Serving {len(steppers)} solvers on http://{host}:{server.server_port} "
+        f"with {service.workers} workers"
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON solve service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--workers", type=int, help="worker processes (default: CPUs)")
+    parser.add_argument(
+        "--batch-window-ms",
+        type=float,
+        default=2.0,
+        help="how long a micro-batch waits for more requests",
+    )
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=5000,
+        help="per-puzzle solve budget when a request sets none",
+    )
+    args = parser.parse_args()
+    serve(
+        args.host,
+        args.port,
+        workers=args.workers,
+        batch_window=args.batch_window_ms / 1000,
+        max_batch=args.max_batch,
+        default_budget=args.budget_ms / 1000,
+    )
+
+
+if __name__ == "__main__":
+    main()
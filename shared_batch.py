@@ -0,0 +1,145 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+
+from registry import solvers
+
+RECORD_SIZE = 81  # One byte per cell, 0 for blank
+PENDING, SOLVED, UNSOLVABLE = 0, 1, 2
+
+
+class SharedBatch:
+    """Puzzles as 81-byte records in one shared memory block, solved in place.
+
+    The block holds ``count`` records of cell values (raw bytes 0-9, row
+    major) followed by one status byte per record. Workers attach to it by
+    ``name`` and overwrite each record with its solution, so dispatching a
+    batch sends only the name and an index range, never a grid.
+    """
+
+    def __init__(self, count, name=None):
+        self.count = count
+        size = max(count * (RECORD_SIZE + 1), 1)
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name = self.shm.name
+        self.buf = self.shm.buf
+
+    @classmethod
+    def from_puzzles(cls, puzzles):
+        batch = cls(len(puzzles))
+        for index, puzzle in enumerate(puzzles):
+            batch.write(index, puzzle)
+        return batch
+
+    def __len__(self):
+        return self.count
+
+    def read(self, index):
+        """Record ``index`` as a new 9x9 grid: the puzzle, or its solution."""
+        start = index * RECORD_SIZE
+        record = bytes(self.buf[start : start + RECORD_SIZE])
+        return [list(record[r : r + 9]) for r in range(0, RECORD_SIZE, 9)]
+
+    def write(self, index, grid):
+        start = index * RECORD_SIZE
+        self.buf[start : start + RECORD_SIZE] = bytes(v for row in grid for v in row)
+
+    def status(self, index):
+        return self.buf[self.count * RECORD_SIZE + index]
+
+    def set_status(self, index, status):
+        self.buf[self.count * RECORD_SIZE + index] = status
+
+    def solutions(self):
+        """Solved grids in record order, None where a puzzle had no solution."""
+        return [
+            self.read(i) if self.status(i) == SOLVED else None
+            for i in range(self.count)
+        ]
+
+    def close(self):
+        self.buf.release()
+        self.shm.close()
+
+    def unlink(self):
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        self.unlink()
+
+
+_attached = None  # The batch this worker process last attached to
+
+
+def _attach(name, count):
+    global _attached
+    if _attached is None or _attached.name != name:
+        if _attached is not None:
+            _attached.close()
+        _attached = SharedBatch(count, name)
+    return _attached
+
+
+def solve_range(batch_name, count, solver_name, start, stop):
+    """Worker entry point: solve records ``[start, stop)`` in place.
+
+    Returns ``(solved, cpu_seconds)``; the grids themselves never leave
+    shared memory.
+    """
+    batch = _attach(batch_name, count)
+    solver = solvers[solver_name]
+    cpu_start = time.process_time()
+    solved = 0
+    for index in range(start, stop):
+        grid = batch.read(index)
+        if solver(grid):
+            batch.write(index, grid)
+            batch.set_status(index, SOLVED)
+            solved += 1
+        else:
+            batch.set_status(index, UNSOLVABLE)
+    return solved, time.process_time() - cpu_start
+
+
+def start_pool(workers=None):
+    """A process pool whose workers can attach to shared batches.
+
+    Attaching registers a block with the process's resource tracker, which
+    unlinks what is still registered when it exits. Started first, the
+    parent's tracker is inherited by every worker, so the block is tracked
+    once and unlinked by its creator; a worker forked without one would
+    start its own and unlink the batch under the parent when it exits.
+    """
+    resource_tracker.ensure_running()
+    return ProcessPoolExecutor(max_workers=workers)
+
+
+def index_ranges(count, chunk_size):
+    return [(lo, min(lo + chunk_size, count)) for lo in range(0, count, chunk_size)]
+
+
+def submit_batch(pool, batch, solver_name, chunk_size):
+    """Queue ``batch`` on ``pool`` as index ranges; returns the futures."""
+    return [
+        pool.submit(solve_range, batch.name, len(batch), solver_name, lo, hi)
+        for lo, hi in index_ranges(len(batch), chunk_size)
+    ]
+
+
+def solve_shared(puzzles, solver_name, pool, chunk_size=64):
+    """Solve ``puzzles`` through one shared batch on a ``start_pool`` pool.
+
+    Returns the solutions in order (None for unsolvable puzzles);
+    ``puzzles`` are left untouched.
+    """
+    with SharedBatch.from_puzzles(puzzles) as batch:
+        for future in submit_batch(pool, batch, solver_name, chunk_size):
+            future.result()
+        return batch.solutions()
@@ -0,0 +1,144 @@
+from algos import cells, initialize_domains, select_cell, timed_assign
+
+
+def _domains_solution(domains):
+    grid = [[0] * 9 for _ in range(9)]
+    for (r, c), valset in domains.items():
+        grid[r][c] = next(iter(valset))
+    return grid
+
+
+def _search(domains, rng=None, stats=None, observer=None):
+    """Yield every solution below ``domains`` depth first.
+
+    The open branches live on an explicit stack of propagated domains, so
+    after a solution the search resumes at its deepest open branch and the
+    next one costs only the work between the two. ``rng`` shuffles each
+    cell's values; ``domains`` itself is never modified.
+    """
+    frames = []  # domains, cell, values left to try, value being tried
+
+    def open_frame(domains):
+        """Enter a search node; returns True if it is a solution."""
+        if stats:
+            stats.enter_call()
+        cell = select_cell(domains, use_mrv=True)
+        if cell is None:
+            return True
+        if observer:
+            observer.on_select(*cell)
+        values = sorted(domains[cell])
+        if rng is not None:
+            rng.shuffle(values)
+        frames.append([domains, cell, iter(values), None])
+        return False
+
+    try:
+        if open_frame(domains):
+            if stats:
+                stats.exit_call()
+            yield _domains_solution(domains)
+            return
+
+        while frames:
+            frame = frames[-1]
+            domains, cell, values, _ = frame
+            val = next(values, None)
+            if val is None:
+                # Every value tried: return to the parent's current try
+                frames.pop()
+                if stats:
+                    stats.exit_call()
+                if frames:
+                    if stats:
+                        stats.backtracks += 1
+                    if observer:
+                        _, parent_cell, _, parent_val = frames[-1]
+                        observer.on_backtrack(*parent_cell, parent_val)
+                continue
+
+            frame[3] = val
+            if observer:
+                observer.on_try(*cell, val)
+            new_domains = {c: set(domains[c]) for c in cells}
+            if timed_assign(new_domains, cell, val, stats, observer) and open_frame(
+                new_domains
+            ):
+                if stats:
+                    stats.exit_call()
+                yield _domains_solution(new_domains)
+            if frames[-1] is frame:
+                if stats:
+                    stats.backtracks += 1
+                if observer:
+                    observer.on_backtrack(*cell, val)
+    finally:
+        if stats:
+            for _ in frames:
+                stats.exit_call()
+
+
+def iter_solutions(grid, limit=None, seed=None, stats=None, observer=None):
+    """Lazily yield the solutions of ``grid``, each as a new 9x9 grid.
+
+    Solutions come out depth first, each exactly once, in MRV and ascending
+    value order, or in a shuffled order for a given ``seed``. Memory stays at
+    one propagated domain set per search level however many are produced.
+    Stops after ``limit`` solutions; ``grid`` is left untouched.
+    """
+    if limit is not None and limit <= 0:
+        return
+    domains = initialize_domains(grid, stats, observer)
+    if not domains:
+        return
+    rng = None
+    if seed is not None:
+        import random
+
+        rng = random.Random(seed)
+
+    search = _search(domains, rng, stats, observer)
+    try:
+        for found, solution in enumerate(search, 1):
+            yield solution
+            if found == limit:
+                return
+    finally:
+        search.close()
+
+
+def sample_solutions(grid, count, seed=None, unique=True, max_attempts=None):
+    """Yield up to ``count`` solutions of ``grid`` from independent random dives.
+
+    Each dive is a shuffled depth-first search from the propagated givens
+    that stops at its first solution, so samples are spread over the
+    solution space rather than clustered like consecutive ``iter_solutions``
+    results; they are not uniformly distributed. With ``unique`` a repeat is
+    dropped, and ``max_attempts`` (default ``10 * count``) bounds the dives
+    when the puzzle has fewer distinct solutions than asked for.
+    """
+    import random
+
+    domains = initialize_domains(grid)
+    if not domains:
+        return
+    rng = random.Random(seed)
+    if max_attempts is None:
+        max_attempts = 10 * count
+    seen = set()
+    produced = 0
+    for _ in range(max_attempts):
+        if produced == count:
+            return
+        dive = _search(domains, rng)
+        solution = next(dive, None)
+        dive.close()
+        if solution is None:
+            return  # No solutions at all
+        if unique:
+            key = bytes(v for row in solution for v in row)
+            if key in seen:
+                continue
+            seen.add(key)
+        produced += 1
+        yield solution
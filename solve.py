@@ -0,0 +1,153 @@
+import argparse
+import io
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from registry import solvers
+
+DEFAULT_SOLVER = "Constraint Propagation + MRV"
+IO_BUFFER_SIZE = 1 << 20
+BLANKS = b".0"
+
+
+def parse_line(line):
+    """Parse an 81-character puzzle line (``.`` or ``0`` for blanks), or None."""
+    line = line.strip()
+    if len(line) != 81:
+        return None
+    grid = []
+    for r in range(9):
+        row = []
+        for ch in line[r * 9 : r * 9 + 9]:
+            if ch in BLANKS:
+                row.append(0)
+            elif 49 <= ch <= 57:
+                row.append(ch - 48)
+            else:
+                return None
+        grid.append(row)
+    return grid
+
+
+def format_grid(grid):
+    return "".join(str(v) for row in grid for v in row).encode()
+
+
+def solve_lines(name, lines):
+    """Solve a chunk of puzzle lines; returns the output block and counts.
+
+    Each input line yields exactly one output line: the solution, the
+    puzzle unchanged (with ``0`` blanks) if it has none, or an empty line if
+    it could not be parsed.
+    """
+    solver = solvers[name]
+    out = []
+    solved = unsolved = invalid = 0
+    for line in lines:
+        grid = parse_line(line)
+        if grid is None:
+            invalid += 1
+            out.append(b"")
+        elif solver(grid):
+            solved += 1
+            out.append(format_grid(grid))
+        else:
+            unsolved += 1
+            out.append(format_grid(grid))
+    out.append(b"")
+    return b"\n".join(out), solved, unsolved, invalid
+
+
+def read_chunks(stream, chunk_size):
+    chunk = []
+    for line in stream:
+        chunk.append(line)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def solve_stream(source, sink, name, workers=1, chunk_size=256):
+    """Solve every line of ``source`` into ``sink`` in input order.
+
+    With several workers, at most ``2 * workers`` chunks are in flight, so
+    memory stays bounded however long the input is. Returns the totals.
+    """
+    totals = {"puzzles": 0, "solved": 0, "unsolved": 0, "invalid": 0}
+
+    def write(result):
+        block, solved, unsolved, invalid = result
+        sink.write(block)
+        totals["solved"] += solved
+        totals["unsolved"] += unsolved
+        totals["invalid"] += invalid
+        totals["puzzles"] += solved + unsolved + invalid
+
+    if workers <= 1:
+        for chunk in read_chunks(source, chunk_size):
+            write(solve_lines(name, chunk))
+        return totals
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in read_chunks(source, chunk_size):
+            if len(in_flight) >= 2 * workers:
+                write(in_flight.popleft().result())
+            in_flight.append(pool.submit(solve_lines, name, chunk))
+        while in_flight:
+            write(in_flight.popleft().result())
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Solve puzzles line by line: 81 characters each, . or 0 blank."
+    )
+    parser.add_argument("input", nargs="?", help="puzzle file (default: stdin)")
+    parser.add_argument("-o", "--output", help="solution file (default: stdout)")
+    parser.add_argument("--solver", default=DEFAULT_SOLVER)
+    parser.add_argument("--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=256, help="lines per task")
+    args = parser.parse_args()
+    if args.solver not in solvers:
+        parser.error(f"unknown solver {args.solver!r} (choose from {sorted(solvers)})")
+
+    if args.input and args.input != "-":
+        source = open(args.input, "rb", buffering=IO_BUFFER_SIZE)
+    else:
+        source = io.open(sys.stdin.fileno(), "rb", IO_BUFFER_SIZE, closefd=False)
+    if args.output:
+        sink = open(args.output, "wb", buffering=IO_BUFFER_SIZE)
+    else:
+        sink = io.open(sys.stdout.fileno(), "wb", IO_BUFFER_SIZE, closefd=False)
+
+    start = time.perf_counter()
+    try:
+        totals = solve_stream(source, sink, args.solver, args.workers, args.chunk_size)
+        sink.flush()
+    except BrokenPipeError:
+        # Downstream closed early (e.g. ``| head``): stop quietly
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sink.fileno())
+        sys.exit(1)
+    finally:
+        source.close()
+    sink.close()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"{totals['puzzles']} puzzles in {elapsed:.2f}s "
+        f"({totals['puzzles'] / max(elapsed, 1e-9):.1f} puzzles/s) | "
+        f"solved {totals['solved']} | unsolved {totals['unsolved']} | "
+        f"invalid {totals['invalid']} | {args.solver} x{args.workers}",
+        file=sys.stderr,
+    )
+
+
+if __name__ == "__main__":
+    main()
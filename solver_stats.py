@@ -0,0 +1,72 @@
+RULES = ("naked_single", "hidden_single", "unit_propagation")
+NAKED_SINGLE, HIDDEN_SINGLE, UNIT_PROPAGATION = range(len(RULES))
+
+
+class SolverStats:
+    """Counters for one solve, cheap enough to leave on while timing.
+
+    Events are bumped in place by the solvers (``stats.backtracks += 1``,
+    ``stats.propagations[NAKED_SINGLE] += 1``) rather than through a method
+    call each; only depth changes go through ``enter_call``/``exit_call``,
+    which subclasses such as ``DepthMemoryStats`` hook. ``nodes_by_depth``
+    is indexed by depth (1 is the root; 0 stays empty) and ``propagations``
+    by rule; both are plain lists, whose items update in place faster than
+    ``array.array`` ones, which box on every access. ``propagation_time`` is
+    the time spent assigning and propagating; the rest of a solve is search.
+    """
+
+    __slots__ = (
+        "recursive_calls",
+        "constraint_checks",
+        "max_depth",
+        "current_depth",
+        "conflicts",
+        "learned_clauses",
+        "restarts",
+        "backtracks",
+        "nodes_by_depth",
+        "propagations",
+        "propagation_time",
+    )
+
+    def __init__(self):
+        self.recursive_calls = 0
+        self.constraint_checks = 0
+        self.max_depth = 0
+        self.current_depth = 0
+        self.conflicts = 0
+        self.learned_clauses = 0
+        self.restarts = 0
+        self.backtracks = 0
+        self.nodes_by_depth = [0]
+        self.propagations = [0] * len(RULES)
+        self.propagation_time = 0.0
+
+    def enter_call(self):
+        self.recursive_calls += 1
+        depth = self.current_depth = self.current_depth + 1
+        if depth > self.max_depth:
+            self.max_depth = depth
+            self.nodes_by_depth.append(0)
+        self.nodes_by_depth[depth] += 1
+
+    def exit_call(self):
+        self.current_depth -= 1
+
+    def merge(self, other):
+        """Add another solve's counts into this one; depth keeps the maximum."""
+        self.recursive_calls += other.recursive_calls
+        self.constraint_checks += other.constraint_checks
+        self.conflicts += other.conflicts
+        self.learned_clauses += other.learned_clauses
+        self.restarts += other.restarts
+        self.backtracks += other.backtracks
+        self.propagation_time += other.propagation_time
+        if other.max_depth > self.max_depth:
+            self.nodes_by_depth += [0] * (other.max_depth - self.max_depth)
+            self.max_depth = other.max_depth
+        for depth, count in enumerate(other.nodes_by_depth):
+            self.nodes_by_depth[depth] += count
+        for rule, count in enumerate(other.propagations):
+            self.propagations[rule] += count
+        return self
@@ -0,0 +1,239 @@
+import struct
+import sys
+from array import array
+
+from algos import PEERS, SolverObserver
+
+# Step kinds: (kind, row, col[, arg])
+STEP_SELECT = 0
+STEP_SET = 1  # arg: new value, 0 clears the cell
+STEP_CONFLICT = 2
+STEP_CANDIDATES = 3  # arg: bitmask with bit v set for each candidate v
+
+KEYFRAME_INTERVAL = 4096  # Steps between full-state keyframes
+ALL_CANDIDATES = 0b1111111110  # Bits 1-9
+
+TRACE_MAGIC = b"SDKT"
+TRACE_VERSION = 1
+# magic, version, finished, solved, step count, solver name length
+TRACE_HEADER = struct.Struct("<4sBBBIH")
+
+
+def encode_step(kind, row, col, arg=0):
+    """Pack a step into one word: 2 bits kind, 7 bits cell, 10 bits arg."""
+    return kind | (row * 9 + col) << 2 | arg << 9
+
+
+class TraceState:
+    """Grid, candidates and highlights after some prefix of a trace."""
+
+    __slots__ = ("grid", "candidates", "selected", "conflicts")
+
+    def __init__(self, grid, candidates=None, selected=None, conflicts=()):
+        self.grid = [list(row) for row in grid]
+        if candidates is None:
+            candidates = [[0] * 9 for _ in range(9)]
+        self.candidates = [list(row) for row in candidates]
+        self.selected = selected
+        self.conflicts = list(conflicts)
+
+    def copy(self):
+        return TraceState(self.grid, self.candidates, self.selected, self.conflicts)
+
+    def apply(self, word):
+        kind = word & 3
+        row, col = divmod(word >> 2 & 127, 9)
+        if kind == STEP_SELECT:
+            self.selected = (row, col)
+            self.conflicts = []
+        elif kind == STEP_SET:
+            self.grid[row][col] = word >> 9
+        elif kind == STEP_CONFLICT:
+            self.conflicts.append((row, col))
+        else:
+            self.candidates[row][col] = word >> 9
+
+
+class SolverTrace:
+    """Append-only binary trace of solver steps with periodic keyframes.
+
+    Steps are stored one 32-bit word each. Every ``KEYFRAME_INTERVAL`` steps
+    the full state is kept, so any position is reconstructed from the nearest
+    keyframe by replaying at most one interval. One thread may record while
+    another replays; readers only look at steps already appended.
+    """
+
+    def __init__(self, puzzle, solver_name=""):
+        self.puzzle = [list(row) for row in puzzle]
+        self.solver_name = solver_name
+        self.steps = array("I")
+        self.keyframes = [TraceState(puzzle)]
+        self.finished = False
+        self.solved = False
+        self._tail = TraceState(puzzle)
+
+    def __len__(self):
+        return len(self.steps)
+
+    def record(self, kind, row, col, arg=0):
+        word = encode_step(kind, row, col, arg)
+        self._tail.apply(word)
+        self.steps.append(word)
+        if len(self.steps) % KEYFRAME_INTERVAL == 0:
+            self.keyframes.append(self._tail.copy())
+
+    def finish(self, solved):
+        self.solved = solved
+        self.finished = True
+
+    def state_at(self, position):
+        """Return a fresh state after the first ``position`` steps."""
+        index = min(position // KEYFRAME_INTERVAL, len(self.keyframes) - 1)
+        state = self.keyframes[index].copy()
+        steps = self.steps
+        for i in range(index * KEYFRAME_INTERVAL, position):
+            state.apply(steps[i])
+        return state
+
+    def save(self, path):
+        name = self.solver_name.encode()
+        with open(path, "wb") as f:
+            f.write(
+                TRACE_HEADER.pack(
+                    TRACE_MAGIC,
+                    TRACE_VERSION,
+                    self.finished,
+                    self.solved,
+                    len(self.steps),
+                    len(name),
+                )
+            )
+            f.write(name)
+            f.write(bytes(v for row in self.puzzle for v in row))
+            steps = self.steps
+            if sys.byteorder == "big":
+                steps = array("I", steps)
+                steps.byteswap()
+            f.write(steps.tobytes())
+
+    @classmethod
+    def load(cls, path):
+        """Read a saved trace; keyframes are rebuilt while loading."""
+        with open(path, "rb") as f:
+            magic, version, finished, solved, count, name_length = TRACE_HEADER.unpack(
+                f.read(TRACE_HEADER.size)
+            )
+            if magic != TRACE_MAGIC or version != TRACE_VERSION:
+                raise ValueError(f"{path} is not a version {TRACE_VERSION} trace")
+            solver_name = f.read(name_length).decode()
+            cells = f.read(81)
+            puzzle = [list(cells[r * 9 : r * 9 + 9]) for r in range(9)]
+            words = array("I")
+            words.frombytes(f.read(4 * count))
+            if sys.byteorder == "big":
+                words.byteswap()
+
+        trace = cls(puzzle, solver_name)
+        for word in words:
+            trace._tail.apply(word)
+            trace.steps.append(word)
+            if len(trace.steps) % KEYFRAME_INTERVAL == 0:
+                trace.keyframes.append(trace._tail.copy())
+        if finished:
+            trace.finish(bool(solved))
+        return trace
+
+
+class TraceObserver(SolverObserver):
+    """Record a solver's events into a trace as grid and candidate steps.
+
+    The observer mirrors the grid and every cell's candidates as bitmasks,
+    and snapshots both on each try so a backtrack can be recorded as the
+    cells it restores. Cells that still allow every digit show no
+    candidates.
+    """
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.grid = [v for row in trace.puzzle for v in row]
+        self.domains = [ALL_CANDIDATES] * 81
+        self.shown = [0] * 81
+        self.saved = []
+
+    def record(self, kind, row, col, arg=0):
+        self.trace.record(kind, row, col, arg)
+
+    def set_value(self, index, value):
+        if self.grid[index] != value:
+            self.grid[index] = value
+            self.record(STEP_SET, *divmod(index, 9), value)
+
+    def show_candidates(self, index):
+        domain = self.domains[index]
+        mask = domain if domain & (domain - 1) and domain != ALL_CANDIDATES else 0
+        if self.shown[index] != mask:
+            self.shown[index] = mask
+            self.record(STEP_CANDIDATES, *divmod(index, 9), mask)
+
+    def on_select(self, row, col):
+        self.record(STEP_SELECT, row, col)
+
+    def on_try(self, row, col, value):
+        self.saved.append((self.grid[:], self.domains[:]))
+        self.record(STEP_SELECT, row, col)
+        for r, c in PEERS[(row, col)]:
+            if self.grid[r * 9 + c] == value:
+                self.record(STEP_CONFLICT, r, c)
+                break
+
+    def on_assign(self, row, col, value):
+        index = row * 9 + col
+        self.domains[index] = 1 << value
+        self.set_value(index, value)
+        self.show_candidates(index)
+
+    def on_eliminate(self, row, col, value):
+        index = row * 9 + col
+        self.domains[index] &= ~(1 << value)
+        self.show_candidates(index)
+
+    def on_backtrack(self, row, col, value):
+        grid, domains = self.saved.pop()
+        if grid != self.grid:
+            for index in range(81):
+                self.set_value(index, grid[index])
+        if domains != self.domains:
+            self.domains = domains
+            for index in range(81):
+                self.show_candidates(index)
+
+
+class TracePlayer:
+    """A cursor over a trace that plays forward step by step or seeks."""
+
+    def __init__(self, trace):
+        self.trace = trace
+        self.position = 0
+        self.state = trace.state_at(0)
+
+    def at_end(self):
+        return self.trace.finished and self.position >= len(self.trace)
+
+    def advance(self, count):
+        """Apply up to ``count`` recorded steps; returns how many were applied."""
+        end = min(self.position + count, len(self.trace))
+        steps = self.trace.steps
+        state = self.state
+        for i in range(self.position, end):
+            state.apply(steps[i])
+        applied = end - self.position
+        self.position = end
+        return applied
+
+    def seek(self, position):
+        position = max(0, min(position, len(self.trace)))
+        if self.position <= position < self.position + KEYFRAME_INTERVAL:
+            self.advance(position - self.position)
+        else:
+            self.state = self.trace.state_at(position)
+            self.position = position
@@ -0,0 +1,72 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+STARTUP_BUDGET_MS = 5.0  # Median cost of loading a solver in a fresh worker
+
+# Runs in the fresh interpreter: time from first import to a finished first
+# solve, which pulls in what engines load lazily (the SAT module, the clause
+# table), then the same solve again warm. The puzzle has one blank cell.
+LOAD_SOLVER = """
+import sys, time
+puzzle = [[(3 * r + r // 3 + c) % 9 + 1 for c in range(9)] for r in range(9)]
+puzzle[0][0] = 0
+start = time.perf_counter()
+from registry import solvers
+solver = solvers[sys.argv[1]]
+solver([row[:] for row in puzzle])
+first = time.perf_counter()
+solver([row[:] for row in puzzle])
+print(1000 * (first - start), 1000 * (time.perf_counter() - first))
+"""
+
+
+def measure_startup(name, runs=20):
+    """Spawn ``runs`` fresh interpreters that load solver ``name``.
+
+    Returns ``(spawn_ms, load_ms, solve_ms)`` lists: the wall time of each
+    whole process, the part of it spent importing the solver and its engine
+    and running a first trivial solve, and the same solve repeated warm.
+    ``load_ms - solve_ms`` is the one-off cost the solver modules control.
+    One unmeasured spawn first fills the bytecode and table caches.
+    """
+    command = [sys.executable, "-c", LOAD_SOLVER, name]
+    cwd = os.path.dirname(os.path.abspath(__file__))
+    subprocess.run(command, cwd=cwd, check=True, capture_output=True)
+
+    spawn_ms, load_ms, solve_ms = [], [], []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run(
+            command, cwd=cwd, check=True, capture_output=True, text=True
+        )
+        spawn_ms.append(1000 * (time.perf_counter() - start))
+        load, solve = map(float, result.stdout.split())
+        load_ms.append(load)
+        solve_ms.append(solve)
+    return spawn_ms, load_ms, solve_ms
+
+
+def check_startup(names, runs=20, budget_ms=STARTUP_BUDGET_MS):
+    """Print startup costs per solver; returns False if any median is over budget.
+
+    The budget covers loading, so the warm solve time is taken off first.
+    """
+    within = True
+    for name in names:
+        spawn_ms, load_ms, solve_ms = measure_startup(name, runs)
+        median = statistics.median(
+            load - solve for load, solve in zip(load_ms, solve_ms)
+        )
+        ok = median <= budget_ms
+        within = within and ok
+        print(
+            f"{name}: load median {median:.1f}ms "
+            f"(first solve {statistics.median(load_ms):.1f}ms, "
+            f"warm {statistics.median(solve_ms):.1f}ms) | "
+            f"process median {statistics.median(spawn_ms):.1f}ms | "
+            f"{'ok' if ok else 'OVER'} (budget {budget_ms:.0f}ms)"
+        )
+    return within
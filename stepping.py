@@ -0,0 +1,307 @@
+import time
+from collections import deque
+
+from algos import (
+    _RESTART,
+    RESTART_UNIT,
+    DomainBuckets,
+    build_sat_solver,
+    cells,
+    find_empty_cell,
+    initialize_domains,
+    is_valid,
+    lcv_order,
+    read_sat_solution,
+    restart_limits,
+    select_cell,
+    timed_assign,
+)
+from registry import steppers
+
+
+def register_stepper(name):
+    def wrapper(func):
+        steppers.register(name, func)
+        return func
+
+    return wrapper
+
+
+def _domains_grid(domains):
+    return [
+        [
+            next(iter(domains[(r, c)])) if len(domains[(r, c)]) == 1 else 0
+            for c in range(9)
+        ]
+        for r in range(9)
+    ]
+
+
+@register_stepper("Backtracking Solver")
+def step_backtracking(grid, every=1, stats=None, observer=None):
+    """Backtracking search as a generator.
+
+    Yields ``(steps, partial_grid)`` after every ``every`` values tried
+    (never for ``every=0``) and returns whether the puzzle was solved;
+    ``grid`` is filled in place like the registered solver. The search uses
+    an explicit stack, so closing the generator simply abandons it.
+    """
+    steps = 0
+    if stats:
+        stats.enter_call()
+    empty = find_empty_cell(grid)
+    if not empty:
+        if stats:
+            stats.exit_call()
+        return True  # Puzzle solved
+    if observer:
+        observer.on_select(*empty)
+    frames = [[*empty, 1]]  # row, col, next value to try
+
+    while frames:
+        frame = frames[-1]
+        row, col, num = frame
+        if num > 9:
+            # Every value failed: return to the parent's current try
+            frames.pop()
+            if stats:
+                stats.exit_call()
+            if frames:
+                row, col, num = frames[-1]
+                grid[row][col] = 0  # Backtrack
+                if stats:
+                    stats.backtracks += 1
+                if observer:
+                    observer.on_backtrack(row, col, num - 1)
+            continue
+
+        frame[2] = num + 1
+        steps += 1
+        if observer:
+            observer.on_try(row, col, num)
+        if is_valid(grid, row, col, num, stats):
+            grid[row][col] = num
+            if observer:
+                observer.on_assign(row, col, num)
+            if stats:
+                stats.enter_call()
+            empty = find_empty_cell(grid)
+            if not empty:
+                if stats:
+                    for _ in range(len(frames) + 1):
+                        stats.exit_call()
+                return True  # Puzzle solved
+            if observer:
+                observer.on_select(*empty)
+            frames.append([*empty, 1])
+        else:
+            if stats:
+                stats.backtracks += 1
+            if observer:
+                observer.on_backtrack(row, col, num)
+
+        if every and steps % every == 0:
+            yield steps, [list(r) for r in grid]
+    return False
+
+
+def step_constraint_propagation(
+    grid,
+    every=1,
+    stats=None,
+    observer=None,
+    use_mrv=False,
+    use_buckets=False,
+    rng=None,
+    restarts=None,
+    restart_unit=RESTART_UNIT,
+):
+    """Constraint propagation search as a generator.
+
+    A step is one branch value tried; the propagation it triggers runs
+    within the step. Yields ``(steps, partial_grid)`` every ``every`` steps
+    (never for ``every=0``), with undecided cells as 0, and returns whether
+    the puzzle was solved. ``use_buckets`` selects through ``DomainBuckets``
+    with LCV value order and searches one set of domains, undoing failed
+    tries through the buckets' trail, as the MRV/LCV solver does; ``rng``
+    and ``restarts`` act as in ``solve_constraint_propagation``.
+    """
+    domains = initialize_domains(grid, stats, observer)
+    if not domains:
+        return False
+
+    steps = 0
+    nodes = 0
+    # domains, buckets, cell, values left to try, value being tried, trail mark
+    frames = []
+    limits = restart_limits(restarts, restart_unit)
+    limit = next(limits)
+
+    def open_frame(domains, buckets):
+        """Enter a search node; returns the solved domains, _RESTART or None."""
+        nonlocal nodes
+        if stats:
+            stats.enter_call()
+        if limit is not None:
+            nodes += 1
+            if nodes > limit:
+                if stats:
+                    stats.exit_call()
+                return _RESTART
+        if buckets is not None:
+            cell = None if buckets.solved() else buckets.select()
+        else:
+            cell = select_cell(domains, use_mrv, rng)
+        if cell is None:
+            return domains
+        if observer:
+            observer.on_select(*cell)
+        if buckets is not None:
+            values = iter(lcv_order(domains, cell))
+        else:
+            values = iter(sorted(domains[cell]))
+        mark = len(buckets.trail) if buckets is not None else None
+        frames.append([domains, buckets, cell, values, None, mark])
+        return None
+
+    root = (domains, DomainBuckets(domains) if use_buckets else None)
+    result = open_frame(*root)
+    while frames and result is None:
+        frame = frames[-1]
+        domains, buckets, cell, values, _, mark = frame
+        val = next(values, None)
+        if val is None:
+            # Every value failed: return to the parent's current try
+            frames.pop()
+            if stats:
+                stats.exit_call()
+            if frames:
+                parent = frames[-1]
+                if buckets is not None:
+                    buckets.undo(domains, parent[5])
+                if stats:
+                    stats.backtracks += 1
+                if observer:
+                    observer.on_backtrack(*parent[2], parent[4])
+            continue
+
+        frame[4] = val
+        steps += 1
+        if observer:
+            observer.on_try(*cell, val)
+        if buckets is not None:
+            new_domains = domains  # Undone through the trail if the try fails
+        else:
+            new_domains = {c: set(domains[c]) for c in cells}
+        if timed_assign(new_domains, cell, val, stats, observer, buckets):
+            result = open_frame(new_domains, buckets)
+            if result is _RESTART:
+                # Close every open try, then search again from the root
+                while frames:
+                    _, _, open_cell, _, open_val, _ = frames.pop()
+                    if observer:
+                        observer.on_backtrack(*open_cell, open_val)
+                    if stats:
+                        stats.backtracks += 1
+                        stats.exit_call()
+                if root[1] is not None:
+                    root[1].undo(root[0], 0)
+                if stats:
+                    stats.restarts += 1
+                limit = next(limits)
+                nodes = 0
+                result = open_frame(*root)
+        else:
+            if buckets is not None:
+                buckets.undo(domains, mark)
+            if stats:
+                stats.backtracks += 1
+            if observer:
+                observer.on_backtrack(*cell, val)
+
+        if result is None and every and steps % every == 0:
+            yield steps, _domains_grid(frames[-1][0])
+
+    if result is None:
+        return False
+    if stats:
+        for _ in range(len(frames) + 1):
+            stats.exit_call()
+
+    # Fill grid with solution
+    for (r, c), valset in result.items():
+        grid[r][c] = next(iter(valset))
+    return True
+
+
+@register_stepper("Constraint Propagation + MRV")
+def step_mrv(grid, every=1, stats=None, observer=None):
+    return step_constraint_propagation(grid, every, stats, observer, use_mrv=True)
+
+
+@register_stepper("Constraint Propagation + Random")
+def step_random(
+    grid,
+    every=1,
+    stats=None,
+    observer=None,
+    seed=None,
+    restarts="luby",
+    unit=RESTART_UNIT,
+):
+    import random
+
+    return step_constraint_propagation(
+        grid,
+        every,
+        stats,
+        observer,
+        use_mrv=False,
+        rng=random.Random(seed),
+        restarts=restarts,
+        restart_unit=unit,
+    )
+
+
+@register_stepper("Constraint Propagation + MRV/LCV")
+def step_mrv_lcv(grid, every=1, stats=None, observer=None):
+    return step_constraint_propagation(grid, every, stats, observer, use_buckets=True)
+
+
+@register_stepper("SAT (CDCL)")
+def step_sat(grid, every=1, stats=None, observer=None):
+    """CDCL search as a generator; a step is one decision."""
+    engine = build_sat_solver(grid, stats, observer)
+    search = engine.steps(every)
+    try:
+        while True:
+            decisions = next(search)
+            partial = [[0] * 9 for _ in range(9)]
+            read_sat_solution(engine, partial)
+            yield decisions, partial
+    except StopIteration as done:
+        if not done.value:
+            return False
+    read_sat_solution(engine, grid)
+    return True
+
+
+def run_interleaved(solves, time_slice=0.005):
+    """Run several stepping solves cooperatively in the calling thread.
+
+    ``solves`` maps a key to a stepper generator. Turns go round robin and
+    each lasts up to ``time_slice`` seconds, so one hard puzzle cannot starve
+    the rest. Yields ``(key, solved)`` as each solve finishes; closing this
+    generator abandons the ones still pending.
+    """
+    pending = deque(solves.items())
+    while pending:
+        key, steps = pending.popleft()
+        deadline = time.perf_counter() + time_slice
+        try:
+            while time.perf_counter() < deadline:
+                next(steps)
+        except StopIteration as done:
+            yield key, bool(done.value)
+            continue
+        pending.append((key, steps))
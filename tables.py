@@ -0,0 +1,42 @@
+import marshal
+import os
+import sys
+
+TABLES_VERSION = 1  # Bump when a table's builder changes
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "__pycache__")
+if sys.pycache_prefix:  # Bytecode is redirected, so keep the tables with it
+    CACHE_DIR = os.path.join(sys.pycache_prefix, CACHE_DIR.lstrip(os.sep))
+
+
+def cached_table(name, build):
+    """Return table ``name``, loading it from its marshal cache when present.
+
+    On a miss the table is built with ``build()`` and written next to the
+    bytecode cache, so later processes skip the build. Nothing is written
+    when bytecode writing is off, and a cache that cannot be read or written
+    (say, a read-only install) just means building every time.
+    """
+    path = os.path.join(
+        CACHE_DIR, f"{name}.{sys.implementation.cache_tag}.v{TABLES_VERSION}.marshal"
+    )
+    try:
+        with open(path, "rb") as f:
+            return marshal.loads(f.read())
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    table = build()
+    if sys.dont_write_bytecode:
+        return table
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        with open(temp_path, "wb") as f:
+            marshal.dump(table, f)
+        os.replace(temp_path, path)  # Atomic, so concurrent workers never see half
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+    return table
@@ -0,0 +1,67 @@
+import json
+import sys
+import time
+from collections import deque
+
+
+class Telemetry:
+    """Emit benchmark progress as JSON lines.
+
+    Each line carries an ``event`` name, a wall-clock ``ts`` and, for job
+    events, jobs done/total, the rolling mean job latency over the last
+    ``window`` jobs and the resulting ETA.
+    """
+
+    def __init__(self, stream=None, total_jobs=0, window=20):
+        self.stream = stream or sys.stdout
+        self.total_jobs = total_jobs
+        self.jobs_done = 0
+        self.jobs_skipped = 0
+        self.latencies = deque(maxlen=window)
+        self.started = time.time()
+
+    @classmethod
+    def open(cls, path, **kwargs):
+        """Open telemetry on a file path, or stdout for ``-``."""
+        stream = sys.stdout if path == "-" else open(path, "a", buffering=1)
+        return cls(stream, **kwargs)
+
+    def close(self):
+        if self.stream not in (sys.stdout, sys.stderr):
+            self.stream.close()
+
+    def emit(self, event, **fields):
+        record = {"event": event, "ts": round(time.time(), 3), **fields}
+        self.stream.write(json.dumps(record) + "\n")
+        self.stream.flush()
+
+    def progress(self):
+        remaining = self.total_jobs - self.jobs_done
+        rolling = sum(self.latencies) / len(self.latencies) if self.latencies else None
+        return {
+            "jobs_done": self.jobs_done,
+            "jobs_total": self.total_jobs,
+            "rolling_latency_s": round(rolling, 6) if rolling is not None else None,
+            "eta_s": round(remaining * rolling, 1) if rolling is not None else None,
+            "elapsed_s": round(time.time() - self.started, 1),
+        }
+
+    def job_skipped(self, solver, puzzle_id):
+        self.jobs_done += 1
+        self.jobs_skipped += 1
+        self.emit("job_skipped", solver=solver, puzzle_id=puzzle_id, **self.progress())
+
+    def job_done(self, solver, puzzle_id, latency, result):
+        self.jobs_done += 1
+        self.latencies.append(latency)
+        self.emit(
+            "job_done",
+            solver=solver,
+            puzzle_id=puzzle_id,
+            latency_s=round(latency, 6),
+            solved=result["solved"],
+            avg_time=result["avg_time"],
+            avg_calls=result["avg_calls"],
+            peak_memory_kb=result["peak_memory_kb"],
+            **self.progress(),
+        )
@@ -0,0 +1,140 @@
+import copy
+import csv
+import os
+import time
+
+from registry import solvers
+from shared_batch import SharedBatch, start_pool, submit_batch
+
+DISPATCHES = ("pickle", "shared")
+
+THROUGHPUT_FIELDS = [
+    "solver",
+    "dispatch",
+    "workers",
+    "batch_size",
+    "puzzles",
+    "solved",
+    "wall_time",
+    "puzzles_per_sec",
+    "cpu_time",
+    "cpu_utilization",
+    "speedup",
+    "efficiency",
+]
+
+
+def solve_batch(name, puzzles):
+    """Solve a batch in a worker; returns ``(solutions, cpu_seconds)``.
+
+    Solutions (None when unsolvable) are pickled back like the puzzles came
+    in, the cost the ``shared`` dispatch avoids.
+    """
+    solver = solvers[name]
+    start = time.process_time()
+    solutions = []
+    for puzzle in puzzles:
+        grid = copy.deepcopy(puzzle)
+        solutions.append(grid if solver(grid) else None)
+    return solutions, time.process_time() - start
+
+
+def _warm_up(_):
+    return os.getpid()
+
+
+def measure_throughput(name, corpus, workers, batch_size, dispatch="pickle"):
+    """Solve ``corpus`` with a pool of ``workers`` in batches of ``batch_size``.
+
+    ``pickle`` sends each batch's grids to the workers and their solutions
+    back; ``shared`` writes the corpus into one ``SharedBatch`` and sends
+    index ranges, with the solutions read back out of shared memory. Pool
+    start-up is excluded from the timing so the numbers reflect a
+    long-running batch service. Throughput counts every puzzle processed;
+    ``solved`` says how many had a solution.
+    """
+    with start_pool(workers) as pool:
+        list(pool.map(_warm_up, range(workers * 2)))
+        start = time.perf_counter()
+        if dispatch == "shared":
+            with SharedBatch.from_puzzles(corpus) as batch:
+                futures = submit_batch(pool, batch, name, batch_size)
+                outcomes = [future.result() for future in futures]
+                solved = sum(count for count, _ in outcomes)
+                batch.solutions()
+        else:
+            futures = [
+                pool.submit(solve_batch, name, corpus[i : i + batch_size])
+                for i in range(0, len(corpus), batch_size)
+            ]
+            outcomes = [future.result() for future in futures]
+            solved = sum(
+                solution is not None
+                for solutions, _ in outcomes
+                for solution in solutions
+            )
+        wall_time = time.perf_counter() - start
+
+    cpu_time = sum(cpu for _, cpu in outcomes)
+    return {
+        "solver": name,
+        "dispatch": dispatch,
+        "workers": workers,
+        "batch_size": batch_size,
+        "puzzles": len(corpus),
+        "solved": solved,
+        "wall_time": wall_time,
+        "puzzles_per_sec": len(corpus) / wall_time,
+        "cpu_time": cpu_time,
+        "cpu_utilization": cpu_time / (wall_time * workers),
+    }
+
+
+def benchmark_throughput(
+    corpus, worker_counts=None, batch_sizes=None, names=None, dispatches=DISPATCHES
+):
+    """Measure puzzles/sec for each solver across a worker x batch-size grid.
+
+    Every point is run once per dispatch in ``dispatches``. Speedup and
+    parallel efficiency are relative to one worker at the same batch size
+    and dispatch, so a one-worker run is added to ``worker_counts`` when it
+    is missing.
+    """
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, cpus} & set(range(1, cpus + 1)))
+    if batch_sizes is None:
+        batch_sizes = [1, 8, 32]
+    worker_counts = sorted(set(worker_counts) | {1})
+    names = names or list(solvers)
+
+    results = []
+    grid = [(dispatch, size) for dispatch in dispatches for size in batch_sizes]
+    for name in names:
+        for dispatch, batch_size in grid:
+            baseline = None
+            for workers in worker_counts:
+                result = measure_throughput(name, corpus, workers, batch_size, dispatch)
+                if baseline is None:
+                    baseline = result["puzzles_per_sec"]  # One worker
+                result["speedup"] = result["puzzles_per_sec"] / baseline
+                result["efficiency"] = result["speedup"] / workers
+                results.append(result)
+                print(
+                    f"{name} | {dispatch} workers={workers} batch={batch_size}: "
+                    f"{result['puzzles_per_sec']:.1f} puzzles/s "
+                    f"({result['solved']}/{result['puzzles']} solved) | "
+                    f"CPU {100 * result['cpu_utilization']:.0f}% | "
+                    f"Speedup {result['speedup']:.2f}x | "
+                    f"Efficiency {100 * result['efficiency']:.0f}%"
+                )
+    return results
+
+
+def write_throughput_csv(results, filename="throughput_results.csv"):
+    with open(filename, "w", newline="") as csvfile:
+        writer = csv.DictWriter(csvfile, fieldnames=THROUGHPUT_FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+
+    print(f"Throughput results written to {filename}")
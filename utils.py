@@ -59,6 +59,16 @@ def generate_partial_sudoku(empty_cells=40):
     return puzzle
 
 
+def generate_corpus(count, empty_cells=40, seed=None):
+    """Generate ``count`` puzzles; the same seed always yields the same corpus."""
+    state = random.getstate()
+    random.seed(seed)
+    try:
+        return [generate_partial_sudoku(empty_cells=empty_cells) for _ in range(count)]
+    finally:
+        random.setstate(state)
+
+
 def isValidSudoku(board):
     def is_valid_row(board):
         for row in board:
@@ -1,210 +1,487 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-
-data = pd.read_csv("benchmark_results.csv")
-# Extract difficulty level from puzzle_id
-data["difficulty"] = data["puzzle_id"].str.extract(r"puzzle_d(\d+)_\d+")[0]
-data["puzzle_num"] = data["puzzle_id"].str.extract(r"puzzle_d\d+_(\d+)")[0]
-
-summary = (
-    data.groupby(["solver", "difficulty"])
-    .agg(
-        {
-            "avg_time": "mean",
-            "avg_calls": "mean",
-            "avg_checks": "mean",
-            "max_depth": "mean",
-            "peak_memory_kb": "mean",
-        }
-    )
-    .reset_index()
-)
-
-summary_pivot = summary.pivot_table(
-    index="solver", columns="difficulty", values=["avg_time", "avg_calls"]
-)
-
-print("Summary Table:")
-print(summary_pivot.round(6))
-
-sns.set_theme(style="whitegrid")
-
-plt.figure(figsize=(12, 6))
-ax = sns.barplot(x="difficulty", y="avg_time", hue="solver", data=summary)
-plt.title("Average Solve Time by Difficulty Level")
-plt.ylabel("Time (seconds)")
-plt.xlabel("Difficulty Level")
-plt.yscale("log")
-plt.legend(title="Solver")
-plt.tight_layout()
-plt.savefig("solve_time_by_difficulty.png", dpi=300)
-plt.show()
-
-plt.figure(figsize=(12, 6))
-ax = sns.barplot(x="difficulty", y="avg_calls", hue="solver", data=summary)
-plt.title("Average Number of Calls by Difficulty Level")
-plt.ylabel("Number of Calls")
-plt.xlabel("Difficulty Level")
-plt.yscale("log")  #
-plt.legend(title="Solver")
-plt.tight_layout()
-plt.savefig("calls_by_difficulty.png", dpi=300)
-plt.show()
-
-
-agg_data = (
-    data.groupby(["solver", "difficulty"])
-    .agg({"avg_time": ["mean", "std"]})
-    .reset_index()
-)
-agg_data.columns = ["solver", "difficulty", "mean_time", "std_time"]
-
-agg_data["difficulty"] = pd.to_numeric(agg_data["difficulty"])
-
-for solver in agg_data["solver"].unique():
-    solver_data = agg_data[agg_data["solver"] == solver]
-    plt.errorbar(
-        solver_data["difficulty"],
-        solver_data["mean_time"],
-        yerr=solver_data["std_time"],
-        marker="o",
-        label=solver,
-    )
-
-plt.title("Solving Time vs. Difficulty Level")
-plt.xlabel("Difficulty Level")
-plt.ylabel("Average Time (seconds)")
-plt.yscale("log")
-plt.grid(True, which="both", ls="--", alpha=0.5)
-plt.legend(title="Solver")
-plt.tight_layout()
-plt.savefig("solve_time_trend.png", dpi=300)
-plt.show()
-
-backtracking_data = data[data["solver"] == "Backtracking Solver"]
-mrv_data = data[data["solver"] == "Constraint Propagation + MRV"]
-
-bt_times = backtracking_data.groupby("difficulty")["avg_time"].mean()
-mrv_times = mrv_data.groupby("difficulty")["avg_time"].mean()
-
-improvement_ratio = bt_times / mrv_times
-
-improvement_df = pd.DataFrame(
-    {
-        "Difficulty": improvement_ratio.index,
-        "Backtracking Time (s)": bt_times.values,
-        "MRV Time (s)": mrv_times.values,
-        "Improvement Ratio": improvement_ratio.values,
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from aggregates import METRICS, QUANTILES, ReportCache
+
+
+def _quantile_columns(sketch, prefix):
+    return {
+        f"p{int(q * 100)}_{prefix}": sketch.quantile(q) for q in QUANTILES
     }
-)
-
-print("\nPerformance Improvement (Backtracking vs MRV):")
-print(improvement_df.round(6))
-
-hardest_puzzles = data[data["difficulty"].isin(["50", "60"])]
-if not hardest_puzzles.empty:
-    hardest_comparison = hardest_puzzles.pivot_table(
-        index=["puzzle_id"],
-        columns="solver",
-        values=["avg_time", "avg_calls"],
-        aggfunc="mean",
-    ).round(4)
-
-    print("\nHardest Puzzles Comparison:")
-    print(hardest_comparison)
-
-plt.figure(figsize=(12, 6))
-
-plt.subplot(1, 2, 1)
-sns.scatterplot(
-    data=data,
-    x="avg_calls",
-    y="peak_memory_kb",
-    hue="solver",
-    style="difficulty",
-    s=100,
-)
-plt.xscale("log")
-plt.title("Memory Usage vs Number of Calls")
-plt.xlabel("Number of Calls (log scale)")
-plt.ylabel("Peak Memory (KB)")
-plt.legend(title="Solver", bbox_to_anchor=(1.05, 1), loc="upper left")
-
-plt.figure(figsize=(14, 6))
-memory_heatmap = data.pivot_table(
-    index="solver", columns="difficulty", values="peak_memory_kb"
-)
-
-sns.heatmap(
-    memory_heatmap,
-    annot=True,
-    fmt=".1f",
-    cmap="YlGnBu",
-    cbar_kws={"label": "Peak Memory (KB)"},
-)
-plt.title("Memory Usage Across Difficulty Levels", fontsize=16)
-plt.tight_layout()
-plt.savefig("memory_usage_heatmap.png", dpi=300, bbox_inches="tight")
-plt.show()
-
-print("Memory Usage Statistics:")
-memory_stats = (
-    data.groupby("solver")["peak_memory_kb"].agg(["mean", "min", "max", "std"]).round(2)
-)
-print(memory_stats)
-
-memory_efficiency = (
-    data.groupby("solver")
-    .agg({"peak_memory_kb": "mean", "avg_calls": "mean", "avg_time": "mean"})
-    .reset_index()
-)
-
-memory_efficiency["memory_per_call"] = (
-    memory_efficiency["peak_memory_kb"] / memory_efficiency["avg_calls"]
-)
-memory_efficiency["memory_time_ratio"] = (
-    memory_efficiency["peak_memory_kb"] / memory_efficiency["avg_time"]
-)
-
-print("\nMemory Efficiency Metrics:")
-print(memory_efficiency[["solver", "memory_per_call", "memory_time_ratio"]].round(4))
-
-print("\nKey Performance Metrics Summary:")
-solver_summary = (
-    data.groupby("solver")
-    .agg(
+
+
+def build_tables(cache):
+    """Flatten the cached statistics into the small tables the charts use."""
+    aggregate = cache.aggregate
+    summary = []
+    for (solver, difficulty), (stats, sketches) in sorted(
+        aggregate.grouped(("solver", "difficulty")).items(),
+        key=lambda item: (item[0][0], item[0][1] or 0),
+    ):
+        row = {"solver": solver, "difficulty": difficulty}
+        row.update({metric: stats[metric].mean for metric in METRICS})
+        row["std_time"] = stats["avg_time"].std
+        row.update(_quantile_columns(sketches["avg_time"], "time"))
+        summary.append(row)
+
+    solver_summary = []
+    for (solver,), (stats, sketches) in sorted(
+        aggregate.grouped(("solver",)).items()
+    ):
+        row = {"solver": solver}
+        row.update({metric: stats[metric].mean for metric in METRICS})
+        memory = stats["peak_memory_kb"]
+        row.update(
+            {"memory_min": memory.min, "memory_max": memory.max, "memory_std": memory.std}
+        )
+        row.update(_quantile_columns(sketches["avg_time"], "time"))
+        row.update(_quantile_columns(sketches["peak_memory_kb"], "memory"))
+        solver_summary.append(row)
+
+    puzzles = []
+    for (solver, difficulty, puzzle_id), stats in sorted(
+        aggregate.puzzles.items(),
+        key=lambda item: (item[0][0], item[0][1] or 0, item[0][2]),
+    ):
+        row = {"solver": solver, "difficulty": difficulty, "puzzle_id": puzzle_id}
+        row.update({metric: stats[metric].mean for metric in METRICS})
+        puzzles.append(row)
+
+    depth_profiles = []
+    for solver in sorted(aggregate.profiles):
+        nodes = aggregate.depth_profile(solver)
+        for depth, count in enumerate(nodes, 1):
+            following = nodes[depth] if depth < len(nodes) else None
+            depth_profiles.append(
+                {
+                    "solver": solver,
+                    "depth": depth,
+                    "nodes": count,
+                    "branching": following / count if following is not None else None,
+                }
+            )
+
+    return {
+        "summary": summary,
+        "solver_summary": solver_summary,
+        "puzzles": puzzles,
+        "depth_profiles": depth_profiles,
+    }
+
+
+def print_tables(tables):
+    import pandas as pd
+
+    summary = pd.DataFrame(tables["summary"])
+    solver_summary = pd.DataFrame(tables["solver_summary"])
+    puzzles = pd.DataFrame(tables["puzzles"])
+
+    summary_pivot = summary.pivot_table(
+        index="solver", columns="difficulty", values=["avg_time", "avg_calls"]
+    )
+    print("Summary Table:")
+    print(summary_pivot.round(6))
+
+    bt_times = summary[summary["solver"] == "Backtracking Solver"].set_index(
+        "difficulty"
+    )["avg_time"]
+    mrv_times = summary[summary["solver"] == "Constraint Propagation + MRV"].set_index(
+        "difficulty"
+    )["avg_time"]
+    improvement_ratio = bt_times / mrv_times
+    improvement_df = pd.DataFrame(
         {
-            "avg_time": "mean",
-            "avg_calls": "mean",
-            "avg_checks": "mean",
-            "max_depth": "mean",
-            "peak_memory_kb": "mean",
+            "Difficulty": improvement_ratio.index,
+            "Backtracking Time (s)": bt_times.reindex(improvement_ratio.index).values,
+            "MRV Time (s)": mrv_times.reindex(improvement_ratio.index).values,
+            "Improvement Ratio": improvement_ratio.values,
         }
     )
-    .reset_index()
-)
-
-solver_summary["time_per_call"] = (
-    solver_summary["avg_time"] / solver_summary["avg_calls"]
-)
-solver_summary["checks_per_call"] = (
-    solver_summary["avg_checks"] / solver_summary["avg_calls"]
-)
-
-print(solver_summary.round(6).to_string(index=False))
-
-plt.figure(figsize=(14, 8))
-heatmap_data = data.pivot_table(index="solver", columns="difficulty", values="avg_time")
-
-sns.heatmap(
-    heatmap_data,
-    annot=True,
-    fmt=".5f",
-    cmap="YlGnBu",
-    cbar_kws={"label": "Average Time (s)"},
-)
-plt.title("Solver Performance Across Difficulty Levels")
-plt.tight_layout()
-plt.savefig("solver_performance_heatmap.png", dpi=300)
-plt.show()
+    print("\nPerformance Improvement (Backtracking vs MRV):")
+    print(improvement_df.round(6))
+
+    hardest_puzzles = puzzles[puzzles["difficulty"].isin([50, 60])]
+    if not hardest_puzzles.empty:
+        hardest_comparison = hardest_puzzles.pivot_table(
+            index=["puzzle_id"],
+            columns="solver",
+            values=["avg_time", "avg_calls"],
+            aggfunc="mean",
+        ).round(4)
+        print("\nHardest Puzzles Comparison:")
+        print(hardest_comparison)
+
+    quantile_columns = [f"p{int(q * 100)}_time" for q in QUANTILES]
+    print("\nSolve Time Quantiles (s):")
+    print(
+        summary.pivot_table(index="solver", columns="difficulty", values="p99_time")
+        .round(6)
+        .rename_axis(columns="p99 by difficulty")
+    )
+    print(solver_summary.set_index("solver")[quantile_columns].round(6))
+
+    print("Memory Usage Statistics:")
+    memory_stats = solver_summary.set_index("solver")[
+        ["peak_memory_kb", "memory_min", "memory_max", "memory_std"]
+    ]
+    memory_stats.columns = ["mean", "min", "max", "std"]
+    print(memory_stats.round(2))
+
+    memory_efficiency = solver_summary[["solver"]].copy()
+    memory_efficiency["memory_per_call"] = (
+        solver_summary["peak_memory_kb"] / solver_summary["avg_calls"]
+    )
+    memory_efficiency["memory_time_ratio"] = (
+        solver_summary["peak_memory_kb"] / solver_summary["avg_time"]
+    )
+    print("\nMemory Efficiency Metrics:")
+    print(memory_efficiency.round(4))
+
+    print("\nSearch Profile (mean per solve):")
+    search = solver_summary.set_index("solver")[
+        [
+            "avg_backtracks",
+            "avg_conflicts",
+            "avg_learned_clauses",
+            "avg_naked_singles",
+            "avg_hidden_singles",
+            "avg_unit_propagations",
+        ]
+    ].copy()
+    search.columns = [
+        "backtracks",
+        "conflicts",
+        "learned",
+        "naked singles",
+        "hidden singles",
+        "unit props",
+    ]
+    search["propagation share"] = (
+        solver_summary["avg_propagation_time"] / solver_summary["avg_time"]
+    ).values
+    print(search.round(3).to_string())
+
+    depth_profiles = pd.DataFrame(tables["depth_profiles"])
+    if not depth_profiles.empty:
+        print("\nBranching Factor by Depth (first 10 levels):")
+        print(
+            depth_profiles[depth_profiles["depth"] <= 10]
+            .pivot_table(index="depth", columns="solver", values="branching")
+            .round(3)
+        )
+
+    print("\nKey Performance Metrics Summary:")
+    key_metrics = solver_summary[["solver"] + METRICS].copy()
+    key_metrics["time_per_call"] = key_metrics["avg_time"] / key_metrics["avg_calls"]
+    key_metrics["checks_per_call"] = (
+        key_metrics["avg_checks"] / key_metrics["avg_calls"]
+    )
+    print(key_metrics.round(6).to_string(index=False))
+
+
+def plot_solve_time_by_difficulty(tables, plt, sns, pd):
+    summary = pd.DataFrame(tables["summary"])
+    plt.figure(figsize=(12, 6))
+    sns.barplot(x="difficulty", y="avg_time", hue="solver", data=summary)
+    plt.title("Average Solve Time by Difficulty Level")
+    plt.ylabel("Time (seconds)")
+    plt.xlabel("Difficulty Level")
+    plt.yscale("log")
+    plt.legend(title="Solver")
+    plt.tight_layout()
+
+
+def plot_calls_by_difficulty(tables, plt, sns, pd):
+    summary = pd.DataFrame(tables["summary"])
+    plt.figure(figsize=(12, 6))
+    sns.barplot(x="difficulty", y="avg_calls", hue="solver", data=summary)
+    plt.title("Average Number of Calls by Difficulty Level")
+    plt.ylabel("Number of Calls")
+    plt.xlabel("Difficulty Level")
+    plt.yscale("log")
+    plt.legend(title="Solver")
+    plt.tight_layout()
+
+
+def plot_solve_time_trend(tables, plt, sns, pd):
+    summary = pd.DataFrame(tables["summary"])
+    plt.figure()
+    for solver in summary["solver"].unique():
+        solver_data = summary[summary["solver"] == solver]
+        plt.errorbar(
+            solver_data["difficulty"],
+            solver_data["avg_time"],
+            yerr=solver_data["std_time"],
+            marker="o",
+            label=solver,
+        )
+    plt.title("Solving Time vs. Difficulty Level")
+    plt.xlabel("Difficulty Level")
+    plt.ylabel("Average Time (seconds)")
+    plt.yscale("log")
+    plt.grid(True, which="both", ls="--", alpha=0.5)
+    plt.legend(title="Solver")
+    plt.tight_layout()
+
+
+def plot_memory_vs_calls(tables, plt, sns, pd):
+    puzzles = pd.DataFrame(tables["puzzles"])
+    plt.figure(figsize=(12, 6))
+    sns.scatterplot(
+        data=puzzles,
+        x="avg_calls",
+        y="peak_memory_kb",
+        hue="solver",
+        style="difficulty",
+        s=100,
+    )
+    plt.xscale("log")
+    plt.title("Memory Usage vs Number of Calls")
+    plt.xlabel("Number of Calls (log scale)")
+    plt.ylabel("Peak Memory (KB)")
+    plt.legend(title="Solver", bbox_to_anchor=(1.05, 1), loc="upper left")
+    plt.tight_layout()
+
+
+def plot_memory_usage_heatmap(tables, plt, sns, pd):
+    summary = pd.DataFrame(tables["summary"])
+    plt.figure(figsize=(14, 6))
+    memory_heatmap = summary.pivot_table(
+        index="solver", columns="difficulty", values="peak_memory_kb"
+    )
+    sns.heatmap(
+        memory_heatmap,
+        annot=True,
+        fmt=".1f",
+        cmap="YlGnBu",
+        cbar_kws={"label": "Peak Memory (KB)"},
+    )
+    plt.title("Memory Usage Across Difficulty Levels", fontsize=16)
+    plt.tight_layout()
+
+
+def plot_solver_performance_heatmap(tables, plt, sns, pd):
+    summary = pd.DataFrame(tables["summary"])
+    plt.figure(figsize=(14, 8))
+    heatmap_data = summary.pivot_table(
+        index="solver", columns="difficulty", values="avg_time"
+    )
+    sns.heatmap(
+        heatmap_data,
+        annot=True,
+        fmt=".5f",
+        cmap="YlGnBu",
+        cbar_kws={"label": "Average Time (s)"},
+    )
+    plt.title("Solver Performance Across Difficulty Levels")
+    plt.tight_layout()
+
+
+def plot_throughput_speedup(tables, plt, sns, pd):
+    throughput = pd.read_csv(tables["throughput_csv"])
+    if "dispatch" not in throughput:
+        throughput["dispatch"] = "pickle"  # Written before shared-memory dispatch
+    batch_sizes = sorted(throughput["batch_size"].unique())
+
+    fig, axes = plt.subplots(
+        1, len(batch_sizes), figsize=(6 * len(batch_sizes), 5), squeeze=False
+    )
+    for ax, batch_size in zip(axes[0], batch_sizes):
+        batch_data = throughput[throughput["batch_size"] == batch_size]
+        for (solver, dispatch), solver_data in batch_data.groupby(
+            ["solver", "dispatch"]
+        ):
+            ax.plot(
+                solver_data["workers"],
+                solver_data["speedup"],
+                marker="o",
+                ls="-" if dispatch == "shared" else ":",
+                label=f"{solver} ({dispatch})",
+            )
+        workers = sorted(batch_data["workers"].unique())
+        ax.plot(workers, workers, ls="--", color="gray", label="Linear")
+        ax.set_title(f"Speedup (batch size {batch_size})")
+        ax.set_xlabel("Workers")
+        ax.set_ylabel("Speedup vs 1 worker")
+        ax.legend(title="Solver")
+    plt.tight_layout()
+
+
+def plot_search_profile(tables, plt, sns, pd):
+    profiles = pd.DataFrame(tables["depth_profiles"])
+    fig, (nodes_ax, branching_ax) = plt.subplots(1, 2, figsize=(14, 5))
+    if not profiles.empty:
+        sns.lineplot(data=profiles, x="depth", y="nodes", hue="solver", ax=nodes_ax)
+        sns.lineplot(
+            data=profiles.dropna(subset=["branching"]),
+            x="depth",
+            y="branching",
+            hue="solver",
+            ax=branching_ax,
+        )
+    nodes_ax.set_yscale("log")
+    nodes_ax.set_title("Search Nodes per Depth")
+    nodes_ax.set_xlabel("Search Depth")
+    nodes_ax.set_ylabel("Mean Nodes per Solve")
+    branching_ax.set_title("Branching Factor by Depth")
+    branching_ax.set_xlabel("Search Depth")
+    branching_ax.set_ylabel("Nodes at Next Depth per Node")
+    plt.tight_layout()
+
+
+def plot_clause_learning(tables, plt, sns, pd):
+    summary = pd.DataFrame(tables["summary"])
+    learning = summary[
+        (summary["avg_conflicts"].fillna(0) > 0)
+        | (summary["avg_learned_clauses"].fillna(0) > 0)
+    ]
+    fig, (conflicts_ax, learned_ax) = plt.subplots(1, 2, figsize=(14, 5))
+    if not learning.empty:
+        sns.barplot(
+            data=learning,
+            x="difficulty",
+            y="avg_conflicts",
+            hue="solver",
+            ax=conflicts_ax,
+        )
+        sns.barplot(
+            data=learning,
+            x="difficulty",
+            y="avg_learned_clauses",
+            hue="solver",
+            ax=learned_ax,
+        )
+    conflicts_ax.set_title("Conflicts per Solve by Difficulty")
+    conflicts_ax.set_xlabel("Difficulty Level")
+    conflicts_ax.set_ylabel("Mean Conflicts")
+    learned_ax.set_title("Learned Clauses per Solve by Difficulty")
+    learned_ax.set_xlabel("Difficulty Level")
+    learned_ax.set_ylabel("Mean Learned Clauses")
+    plt.tight_layout()
+
+
+CHARTS = {
+    "solve_time_by_difficulty.png": plot_solve_time_by_difficulty,
+    "calls_by_difficulty.png": plot_calls_by_difficulty,
+    "solve_time_trend.png": plot_solve_time_trend,
+    "memory_vs_calls.png": plot_memory_vs_calls,
+    "memory_usage_heatmap.png": plot_memory_usage_heatmap,
+    "solver_performance_heatmap.png": plot_solver_performance_heatmap,
+    "search_profile.png": plot_search_profile,
+    "clause_learning.png": plot_clause_learning,
+    "throughput_speedup.png": plot_throughput_speedup,
+}
+
+RESULT_CHARTS = [name for name in CHARTS if name != "throughput_speedup.png"]
+
+# Charts with legends or labels outside the axes
+TIGHT_CHARTS = {"memory_usage_heatmap.png", "memory_vs_calls.png"}
+
+
+def render_chart(filename, tables, out_dir, show=False):
+    """Render one chart; runs in a worker process when rendering in parallel."""
+    import matplotlib
+
+    if not show:
+        matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import pandas as pd
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid")
+    CHARTS[filename](tables, plt, sns, pd)
+    path = os.path.join(out_dir, filename)
+    bbox = "tight" if filename in TIGHT_CHARTS else None
+    plt.savefig(path, dpi=300, bbox_inches=bbox)
+    if show:
+        plt.show()
+    plt.close("all")
+    return path
+
+
+def render_all(tables, charts, out_dir=".", jobs=None, show=False):
+    if show:
+        # Interactive windows need the main process and a GUI backend
+        return [render_chart(name, tables, out_dir, show=True) for name in charts]
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [
+            pool.submit(render_chart, name, tables, out_dir) for name in charts
+        ]
+        return [future.result() for future in futures]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Summarize benchmark results and render the report charts."
+    )
+    parser.add_argument(
+        "--source",
+        help="results store (.db) or CSV; defaults to benchmark_results.db if present",
+    )
+    parser.add_argument("--cache", default="report_cache.json")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument(
+        "--jobs", type=int, help="parallel processes for aggregation and rendering"
+    )
+    parser.add_argument(
+        "--chunk-rows",
+        type=int,
+        default=50000,
+        help="rows folded into the aggregate per chunk",
+    )
+    parser.add_argument(
+        "--force", action="store_true", help="re-render charts even if up to date"
+    )
+    parser.add_argument(
+        "--show", action="store_true", help="open interactive chart windows"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+    source = args.source or (
+        "benchmark_results.db"
+        if os.path.exists("benchmark_results.db")
+        else "benchmark_results.csv"
+    )
+
+    cache = ReportCache.load(args.cache, chunk_rows=args.chunk_rows, jobs=args.jobs)
+    new_rows = cache.update(source)
+    print(f"{new_rows} new rows from {source} ({cache.rows} aggregated)")
+
+    tables = build_tables(cache)
+    print_tables(tables)
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    charts = list(RESULT_CHARTS)
+    up_to_date = cache.rendered_rows == cache.rows and all(
+        os.path.exists(os.path.join(args.out_dir, name)) for name in charts
+    )
+    if up_to_date and not (args.force or args.show):
+        charts = []
+
+    throughput_csv = "throughput_results.csv"
+    speedup_png = os.path.join(args.out_dir, "throughput_speedup.png")
+    if os.path.exists(throughput_csv) and (
+        args.force
+        or args.show
+        or not os.path.exists(speedup_png)
+        or os.path.getmtime(speedup_png) < os.path.getmtime(throughput_csv)
+    ):
+        tables["throughput_csv"] = throughput_csv
+        charts.append("throughput_speedup.png")
+
+    if charts:
+        for path in render_all(tables, charts, args.out_dir, args.jobs, args.show):
+            print(f"Wrote {path}")
+    else:
+        print("Charts are up to date")
+
+    cache.rendered_rows = cache.rows
+    cache.save(args.cache)
+
+
+if __name__ == "__main__":
+    main()